@@ -4,6 +4,8 @@ from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 from apps.news_aggregator.models import Article, AIAnalysis
+from apps.news_aggregator.usage_stats import get_prompt_cache_stats
+from apps.news_aggregator.queues import queue_depths
 from django.utils import timezone
 from datetime import timedelta
 
@@ -36,11 +38,24 @@ def admin_stats(request):
             'timestamp': article.created_at.isoformat()
         })
     
+    # Prompt-prefix cache effectiveness per agent
+    prompt_cache = get_prompt_cache_stats(
+        analysis_type for analysis_type, _ in AIAnalysis.ANALYSIS_TYPES
+    )
+    
+    # Waiting tasks per Celery queue and priority class
+    try:
+        task_queues = queue_depths()
+    except Exception as e:
+        task_queues = {'error': str(e)}
+    
     return Response({
         'total_users': total_users,
         'total_articles': total_articles,
         'total_analyses': total_analyses,
-        'recent_activity': recent_activity
+        'recent_activity': recent_activity,
+        'prompt_cache': prompt_cache,
+        'task_queues': task_queues
     })
 
 
@@ -5,7 +5,6 @@ import json
 import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
-from django.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
@@ -148,7 +147,8 @@ class ProcessingProgressConsumer(AsyncWebsocketConsumer):
     
     def get_task_status_from_cache(self):
         """Get task status from cache"""
-        return cache.get(f'task_status:{self.task_id}')
+        from apps.news_aggregator.progress import get_task_status
+        return get_task_status(self.task_id)
     
     async def send_task_status(self):
         """Send current task status to client"""
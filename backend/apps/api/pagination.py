@@ -0,0 +1,166 @@
+"""
+Keyset (cursor) pagination for feed-style listings
+
+Pages are read with a row comparison against the last row of the previous page,
+`(a, b, id) < (%s, %s, %s)`, which PostgreSQL answers with a range scan on a matching
+composite index. Unlike OFFSET pagination, the cost per page does not grow with depth
+and no COUNT(*) is issued.
+"""
+import base64
+import json
+from collections import OrderedDict
+
+from django.db import connection
+from django.db.models import BooleanField, F
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only cursor pagination over a descending composite key
+
+    The viewset's ordering is replaced by the key ordering. `nullable_field`, if set,
+    is a leading key field that may be NULL: rows with a value come first (descending),
+    followed by the NULL rows ordered by the remaining fields, each segment read with
+    its own range scan.
+    """
+
+    key_fields = ('created_at', 'id')
+    nullable_field = None
+    page_size = api_settings.PAGE_SIZE or 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+        model = queryset.model
+
+        fields = list(self.key_fields)
+        if self.nullable_field:
+            fields.insert(0, self.nullable_field)
+            queryset = queryset.order_by(
+                F(self.nullable_field).desc(nulls_last=True), *[f'-{name}' for name in self.key_fields]
+            )
+        else:
+            queryset = queryset.order_by(*[f'-{name}' for name in self.key_fields])
+
+        if self.nullable_field is None:
+            rows = list(self._after(queryset, model, fields, position)[:page_size + 1])
+        else:
+            rows = []
+            # Values segment, unless the cursor is already inside the NULL segment
+            if position is None or position[0] is not None:
+                rows = list(self._after(
+                    queryset.filter(**{f'{self.nullable_field}__isnull': False}), model, fields, position
+                )[:page_size + 1])
+            if len(rows) <= page_size:
+                in_null_segment = position is not None and position[0] is None
+                rows += list(self._after(
+                    queryset.filter(**{f'{self.nullable_field}__isnull': True}),
+                    model, list(self.key_fields), position[1:] if in_null_segment else None
+                )[:page_size + 1 - len(rows)])
+
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_position = (
+            [self._serialize(getattr(rows[-1], name)) for name in fields] if self.has_next else None
+        )
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(requested, self.max_page_size))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def encode_cursor(self, position) -> str:
+        raw = json.dumps(position, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        expected = len(self.key_fields) + (1 if self.nullable_field else 0)
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            position = json.loads(raw)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != expected:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def _after(self, queryset, model, fields, position):
+        """Rows strictly after position in descending key order"""
+        if position is None:
+            return queryset
+
+        columns = []
+        params = []
+        try:
+            for name, value in zip(fields, position):
+                field = model._meta.get_field(name)
+                if value is None:
+                    raise ValueError(f"{name} is null")
+                columns.append(f'{connection.ops.quote_name(model._meta.db_table)}.'
+                               f'{connection.ops.quote_name(field.column)}')
+                params.append(field.to_python(value))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+        placeholders = ', '.join(['%s'] * len(params))
+        condition = RawSQL(
+            f"({', '.join(columns)}) < ({placeholders})", params, output_field=BooleanField()
+        )
+        return queryset.filter(condition)
+
+    def _serialize(self, value):
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        if value is None or isinstance(value, (int, float, str)):
+            return value
+        return str(value)
+
+
+class ArticleKeysetPagination(KeysetPagination):
+    """Newest published first, undated articles last"""
+    nullable_field = 'published_at'
+    key_fields = ('created_at', 'id')
+
+
+class AnalysisKeysetPagination(KeysetPagination):
+    key_fields = ('created_at', 'id')
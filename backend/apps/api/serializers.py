@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from apps.news_aggregator.models import Article, NewsSource, AIAnalysis, ProcessingJob
+from apps.news_aggregator.content_store import ContentNotFound
 
 
 class NewsSourceSerializer(serializers.ModelSerializer):
@@ -14,6 +15,9 @@ class NewsSourceSerializer(serializers.ModelSerializer):
         ]
     
     def get_article_count(self, obj):
+        # Annotated by NewsSourceViewSet; counting per row is the fallback
+        if hasattr(obj, 'article_count'):
+            return obj.article_count
         return obj.articles.count()
 
 
@@ -37,7 +41,7 @@ class ArticleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Article
         fields = [
-            'id', 'url', 'title', 'content', 'author',
+            'id', 'url', 'title', 'summary', 'content', 'author',
             'published_at', 'source', 'source_name',
             'language', 'word_count', 'reading_time',
             'is_processed', 'is_enriched', 'processing_error',
@@ -45,13 +49,24 @@ class ArticleSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'word_count', 'reading_time',
+            'id', 'summary', 'word_count', 'reading_time',
             'is_processed', 'is_enriched',
             'created_at', 'updated_at'
         ]
     
     def get_analysis_count(self, obj):
-        return obj.analyses.count()
+        # Uses the prefetched analyses when the queryset loaded them
+        return len(obj.analyses.all())
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if instance.content_ref and not data.get('content'):
+            try:
+                data['content'] = instance.full_text
+            except ContentNotFound:
+                # Logged by the content store; the summary is still served
+                pass
+        return data
 
 
 class ArticleListSerializer(serializers.ModelSerializer):
@@ -59,14 +74,32 @@ class ArticleListSerializer(serializers.ModelSerializer):
     Lightweight serializer for article lists
     """
     source_name = serializers.CharField(source='source.name', read_only=True)
+    analysis_count = serializers.IntegerField(read_only=True)  # annotated by the viewset
     
     class Meta:
         model = Article
         fields = [
-            'id', 'url', 'title', 'author',
-            'published_at', 'source_name',
+            'id', 'url', 'title', 'summary', 'author',
+            'published_at', 'source', 'source_name',
+            'word_count', 'reading_time',
             'is_processed', 'is_enriched',
-            'created_at'
+            'analysis_count', 'created_at'
+        ]
+
+
+class ArticleSearchResultSerializer(ArticleListSerializer):
+    """
+    Search hit with its relevance and a highlighted content snippet
+    """
+    analysis_count = None
+    rank = serializers.FloatField(read_only=True)
+    headline = serializers.CharField(read_only=True)
+    
+    class Meta(ArticleListSerializer.Meta):
+        fields = [
+            'id', 'url', 'title', 'author',
+            'published_at', 'source', 'source_name',
+            'rank', 'headline'
         ]
 
 
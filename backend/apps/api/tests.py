@@ -0,0 +1,61 @@
+"""
+Query counts of the list endpoints
+
+Each list must take the same number of queries however many rows and related
+objects a page holds.
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.news_aggregator.models import AIAnalysis, Article, NewsSource
+
+
+class ListQueryCountTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader', password='reader-pass')
+        now = timezone.now()
+        sources = [
+            NewsSource.objects.create(name=f"Source {i}", domain=f"source{i}.example.com")
+            for i in range(3)
+        ]
+        for i in range(24):
+            article = Article.objects.create(
+                source=sources[i % len(sources)],
+                url=f"https://source{i % len(sources)}.example.com/articles/{i}",
+                title=f"Article {i}",
+                content="Article body " * 20,
+                published_at=now - timedelta(hours=i)
+            )
+            for analysis_type in ('bias', 'jargon'):
+                AIAnalysis.objects.create(
+                    article=article,
+                    analysis_type=analysis_type,
+                    result={'score': i},
+                    processing_time=0.1
+                )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_article_list(self):
+        # One keyset page query; sources are joined and analyses counted in it
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/v1/articles/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertEqual(response.data['results'][0]['analysis_count'], 2)
+
+    def test_source_list(self):
+        # Page count and page; article counts are annotated
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/sources/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(response.data['results'][0]['article_count'], 8)
@@ -16,7 +16,9 @@ urlpatterns = [
     
     # Custom endpoints
     path('process/', views.process_article, name='process_article'),
+    path('process/batch/', views.process_articles_batch, name='process_articles_batch'),
     path('analyze/', views.analyze_article, name='analyze_article'),
+    path('search/', views.search, name='search'),
     path('health/', views.health_check, name='health_check'),
     path('testing-info/', views.testing_info, name='testing_info'),
     
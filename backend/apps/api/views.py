@@ -1,14 +1,37 @@
 import os
+import uuid
+from celery.result import AsyncResult
 from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
 from apps.news_aggregator.models import Article, NewsSource, AIAnalysis
-from .serializers import ArticleSerializer, NewsSourceSerializer, AIAnalysisSerializer
+from .serializers import (
+    ArticleSerializer,
+    ArticleListSerializer,
+    ArticleSearchResultSerializer,
+    NewsSourceSerializer,
+    AIAnalysisSerializer,
+)
 from .permissions import IsAuthenticatedOrOptional, NoAuthRequiredPermission
-from apps.news_aggregator.tasks import process_article_task, analyze_article_task
+from .pagination import ArticleKeysetPagination, AnalysisKeysetPagination
+from apps.news_aggregator.tasks import (
+    process_article_task,
+    process_articles_batch_task,
+    analyze_article_task,
+    analysis_task_key,
+    ANALYSIS_TASK_SLOT_TIMEOUT,
+)
+from apps.news_aggregator.singleflight import claim_task_slot, replace_task_slot
+from apps.news_aggregator.ingest import get_ingest_settings, unique_urls
+from apps.news_aggregator.search import search_articles
+from apps.news_aggregator.queues import BACKFILL, INTERACTIVE, PRIORITY_CLASSES, plan_schedule
 
 
 class ArticleViewSet(viewsets.ModelViewSet):
@@ -17,9 +40,27 @@ class ArticleViewSet(viewsets.ModelViewSet):
     """
     serializer_class = ArticleSerializer
     permission_classes = [IsAuthenticatedOrOptional]
+    pagination_class = ArticleKeysetPagination
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ArticleListSerializer
+        return ArticleSerializer
     
     def get_queryset(self):
-        queryset = Article.objects.all()
+        queryset = Article.objects.select_related('source')
+        
+        if self.action == 'list':
+            # Lists don't show content. Analyses are counted per returned row (a correlated
+            # subquery), so the page is not aggregated over the whole table before LIMIT
+            analysis_count = AIAnalysis.objects.filter(article=OuterRef('pk')).order_by().values(
+                'article'
+            ).annotate(count=Count('id')).values('count')
+            queryset = queryset.defer('content').annotate(
+                analysis_count=Coalesce(Subquery(analysis_count, output_field=IntegerField()), Value(0))
+            )
+        else:
+            queryset = queryset.prefetch_related('analyses')
         
         # Filter by source
         source_id = self.request.query_params.get('source')
@@ -51,7 +92,7 @@ class NewsSourceViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing news sources
     """
-    queryset = NewsSource.objects.all()
+    queryset = NewsSource.objects.annotate(article_count=Count('articles'))
     serializer_class = NewsSourceSerializer
     permission_classes = [IsAuthenticatedOrOptional]
 
@@ -63,6 +104,7 @@ class AIAnalysisViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = AIAnalysis.objects.all()
     serializer_class = AIAnalysisSerializer
     permission_classes = [IsAuthenticatedOrOptional]
+    pagination_class = AnalysisKeysetPagination
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -80,6 +122,85 @@ class AIAnalysisViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticatedOrOptional])
+def search(request):
+    """
+    Full-text search over article titles and content
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response(
+            {'error': 'q is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        limit = int(request.query_params.get('limit', 20))
+        offset = max(0, int(request.query_params.get('offset', 0)))
+        source_id = request.query_params.get('source')
+        source_id = int(source_id) if source_id else None
+    except ValueError:
+        return Response(
+            {'error': 'limit, offset and source must be integers'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    articles = search_articles(query, limit=limit, offset=offset, source_id=source_id)
+    serializer = ArticleSearchResultSerializer(articles, many=True)
+    
+    return Response({
+        'query': query,
+        'offset': offset,
+        'results': serializer.data
+    })
+
+
+def _schedule_args(request, default_class: str):
+    """
+    Validated plan_schedule() arguments from a request's optional `priority` and `deadline` fields
+    
+    Returns:
+        (kwargs, None) or (None, error response)
+    """
+    priority_class = request.data.get('priority', default_class)
+    if priority_class not in PRIORITY_CLASSES:
+        return None, Response(
+            {'error': f"priority must be one of: {', '.join(PRIORITY_CLASSES)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    deadline = request.data.get('deadline')
+    if deadline is not None:
+        try:
+            deadline = float(deadline)
+        except (TypeError, ValueError):
+            deadline = -1
+        if deadline <= 0:
+            return None, Response(
+                {'error': 'deadline must be a positive number of seconds'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    return {'priority_class': priority_class, 'deadline_seconds': deadline}, None
+
+
+def _request_schedule(request, user_id, default_class: str, cost: int = 1):
+    """
+    Schedule for a task-queueing request from its optional `priority` and `deadline` fields
+    
+    Args:
+        cost: Units of work charged to the user's interactive fair share
+    
+    Returns:
+        (schedule, None) or (None, error response)
+    """
+    schedule_args, error = _schedule_args(request, default_class)
+    if error:
+        return None, error
+    return plan_schedule(user_id=user_id, cost=cost, **schedule_args), None
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticatedOrOptional])
 def process_article(request):
@@ -113,16 +234,91 @@ def process_article(request):
         # When auth is not required, we can proceed without a user
         user_id = None
     
+    schedule, error = _request_schedule(request, user_id, INTERACTIVE)
+    if error:
+        return error
+    
     # Queue processing task
-    task = process_article_task.delay(url, user_id)
+    task = process_article_task.apply_async(args=[url, user_id], **schedule.options())
     
     return Response({
         'task_id': task.id,
+        'priority': schedule.priority_class,
         'message': 'Article processing started',
         'status_url': f'/api/v1/tasks/{task.id}/status/'
     }, status=status.HTTP_202_ACCEPTED)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticatedOrOptional])
+def process_articles_batch(request):
+    """
+    Process many articles from a list of URLs
+    """
+    urls = request.data.get('urls')
+    if not isinstance(urls, list) or not urls:
+        return Response(
+            {'error': 'urls must be a non-empty list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    config = get_ingest_settings()
+    urls = unique_urls([url for url in urls if isinstance(url, str)])
+    if len(urls) > config['max_urls']:
+        return Response(
+            {'error': f"At most {config['max_urls']} URLs per request"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    validate_url = URLValidator(schemes=['http', 'https'])
+    invalid = []
+    for url in urls:
+        try:
+            validate_url(url)
+        except ValidationError:
+            invalid.append(url)
+    if invalid:
+        return Response(
+            {'error': 'Invalid URLs', 'invalid_urls': invalid[:100]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # One query for the whole request instead of one per URL
+    existing = set(Article.objects.filter(url__in=urls).values_list('url', flat=True))
+    new_urls = [url for url in urls if url not in existing]
+    
+    # Get user ID (or use None if auth is not required)
+    user_id = None
+    auth_required = os.getenv('AUTH_REQUIRED', 'true').lower() == 'true'
+    
+    if auth_required and hasattr(request, 'user') and request.user.is_authenticated:
+        user_id = request.user.id
+    
+    # Bulk requests are backfill work unless the caller asks otherwise; interactive
+    # ones are charged per URL, so a large list uses up the user's share
+    schedule, error = _request_schedule(request, user_id, BACKFILL, cost=max(1, len(new_urls)))
+    if error:
+        return error
+    
+    # Split into tasks so large requests are extracted by several workers
+    task_ids = []
+    for start in range(0, len(new_urls), config['task_size']):
+        task = process_articles_batch_task.apply_async(
+            args=[new_urls[start:start + config['task_size']], user_id],
+            **schedule.options()
+        )
+        task_ids.append(task.id)
+    
+    return Response({
+        'task_ids': task_ids,
+        'priority': schedule.priority_class,
+        'queued': len(new_urls),
+        'existing': len(existing),
+        'message': 'Batch processing started' if task_ids else 'All articles already exist',
+        'status_urls': [f'/api/v1/tasks/{task_id}/status/' for task_id in task_ids]
+    }, status=status.HTTP_202_ACCEPTED if task_ids else status.HTTP_200_OK)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticatedOrOptional])
 def analyze_article(request):
@@ -150,15 +346,47 @@ def analyze_article(request):
         # When auth is not required, we can proceed without a user
         user_id = None
     
+    schedule_args, error = _schedule_args(request, INTERACTIVE)
+    if error:
+        return error
+    
+    # Attach to an identical analysis that is already queued or running
+    task_key = analysis_task_key(str(article.id), analysis_types)
+    task_id = str(uuid.uuid4())
+    existing_task_id = claim_task_slot(task_key, task_id, ANALYSIS_TASK_SLOT_TIMEOUT)
+    
+    if existing_task_id and not AsyncResult(existing_task_id).ready():
+        return Response({
+            'task_id': existing_task_id,
+            'message': 'Analysis already in progress',
+            'status_url': f'/api/v1/tasks/{existing_task_id}/status/'
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    if existing_task_id:
+        # Previous task finished without releasing its slot; of concurrent requests
+        # taking it over only one enqueues, the others attach to it
+        winner_task_id = replace_task_slot(task_key, existing_task_id, task_id, ANALYSIS_TASK_SLOT_TIMEOUT)
+        if winner_task_id:
+            return Response({
+                'task_id': winner_task_id,
+                'message': 'Analysis already in progress',
+                'status_url': f'/api/v1/tasks/{winner_task_id}/status/'
+            }, status=status.HTTP_202_ACCEPTED)
+    
+    # Only requests that enqueue a task are charged to the user's fair share
+    schedule = plan_schedule(user_id=user_id, **schedule_args)
+    
     # Queue analysis task
-    task = analyze_article_task.delay(
-        str(article.id),
-        analysis_types,
-        user_id
+    task = analyze_article_task.apply_async(
+        args=[str(article.id), analysis_types, user_id],
+        kwargs={'schedule': schedule.to_dict()},
+        task_id=task_id,
+        **schedule.options()
     )
     
     return Response({
         'task_id': task.id,
+        'priority': schedule.priority_class,
         'message': 'Analysis started',
         'status_url': f'/api/v1/tasks/{task.id}/status/'
     }, status=status.HTTP_202_ACCEPTED)
@@ -191,7 +419,9 @@ def testing_info(request):
         'message': 'Authentication is disabled - API endpoints are open for testing',
         'available_endpoints': [
             'POST /api/process/ - Process article',
+            'POST /api/process/batch/ - Process many articles',
             'POST /api/analyze/ - Analyze article',
+            'GET /api/search/?q= - Search articles',
             'GET /api/articles/ - List articles',
             'GET /api/articles/{id}/ - Get article details',
             'GET /api/articles/{id}/analyses/ - Get article analyses',
@@ -1,12 +1,13 @@
 from django.contrib import admin
-from .models import NewsSource, Article, AIAnalysis, ProcessingJob
+from .models import NewsSource, Article, AIAnalysis, ProcessingJob, AnalysisBatch
 
 
 @admin.register(NewsSource)
 class NewsSourceAdmin(admin.ModelAdmin):
-    list_display = ['name', 'domain', 'language', 'is_active', 'requires_javascript']
+    list_display = ['name', 'domain', 'language', 'is_active', 'requires_javascript', 'last_polled_at']
     list_filter = ['is_active', 'requires_javascript', 'language']
     search_fields = ['name', 'domain']
+    readonly_fields = ['last_polled_at', 'feed_state']
     ordering = ['name']
 
 
@@ -15,7 +16,8 @@ class ArticleAdmin(admin.ModelAdmin):
     list_display = ['title', 'source', 'published_at', 'is_processed', 'is_enriched']
     list_filter = ['is_processed', 'is_enriched', 'source', 'published_at']
     search_fields = ['title', 'url', 'content']
-    readonly_fields = ['id', 'created_at', 'updated_at', 'word_count', 'reading_time']
+    readonly_fields = ['id', 'created_at', 'updated_at', 'word_count', 'reading_time', 'simhash', 'simhash_bands']
+    raw_id_fields = ['canonical_article']
     date_hierarchy = 'published_at'
     ordering = ['-published_at']
 
@@ -35,4 +37,13 @@ class ProcessingJobAdmin(admin.ModelAdmin):
     list_filter = ['status', 'job_type', 'created_at']
     search_fields = ['article__title', 'celery_task_id']
     readonly_fields = ['id', 'created_at', 'updated_at']
+    ordering = ['-created_at']
+
+
+@admin.register(AnalysisBatch)
+class AnalysisBatchAdmin(admin.ModelAdmin):
+    list_display = ['provider_batch_id', 'status', 'request_count', 'succeeded_count', 'errored_count', 'created_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['provider_batch_id']
+    readonly_fields = ['id', 'created_at', 'updated_at', 'ended_at', 'collected_at']
     ordering = ['-created_at']
\ No newline at end of file
@@ -10,7 +10,11 @@ from datetime import datetime
 import json
 
 from django.conf import settings
-from django.core.cache import cache
+
+from ..analysis_cache import get_analysis_cache
+from ..claude_client import build_system_blocks
+from ..json_stream import PartialJSON
+from ..singleflight import agent_singleflight, CacheLease, wait_for_lease_result
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +52,9 @@ class AgentConfig:
     supports_streaming: bool = True
     max_retries: int = 3
     timeout_seconds: int = 120
+    prompt_version: str = "1"  # Bump when prompts/schema change to invalidate cached results
+    cache_ttl_seconds: int = 24 * 3600
+    partial_cache_ttl_seconds: int = 300  # Truncated results, so a rerun can soon complete them
 
 
 @dataclass
@@ -62,6 +69,7 @@ class AgentResult:
     agent_name: Optional[str] = None
     api_calls_count: Optional[int] = None
     refinement_calls_count: Optional[int] = None
+    partial: bool = False  # Recovered from a truncated response
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -74,8 +82,25 @@ class AgentResult:
             'execution_time_ms': self.execution_time_ms,
             'agent_name': self.agent_name,
             'api_calls_count': self.api_calls_count,
-            'refinement_calls_count': self.refinement_calls_count
+            'refinement_calls_count': self.refinement_calls_count,
+            'partial': self.partial
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AgentResult':
+        """Rebuild a result from its to_dict() form"""
+        return cls(
+            success=data.get('success', False),
+            data=data.get('data'),
+            error=data.get('error'),
+            model_used=ModelType(data['model_used']) if data.get('model_used') else None,
+            tokens_used=data.get('tokens_used'),
+            execution_time_ms=data.get('execution_time_ms'),
+            agent_name=data.get('agent_name'),
+            api_calls_count=data.get('api_calls_count'),
+            refinement_calls_count=data.get('refinement_calls_count'),
+            partial=data.get('partial', False)
+        )
 
 
 class AsyncCommunicationMixin:
@@ -135,7 +160,6 @@ class BaseAgent(ABC, AsyncCommunicationMixin):
     def __init__(self, config: AgentConfig):
         self.config = config
         self.logger = logging.getLogger(f"{__name__}.{config.name}")
-        self._semaphore = asyncio.Semaphore(3)  # Limit concurrent API calls
         
     @abstractmethod
     async def process(self, article_content: str, **kwargs) -> AgentResult:
@@ -155,46 +179,82 @@ class BaseAgent(ABC, AsyncCommunicationMixin):
             # Use the most capable model for final attempts
             return ModelType.GROK_3
     
-    def get_cache_key(self, article_id: str) -> str:
-        """Generate cache key for this agent and article"""
-        return f"agent:{self.config.name}:article:{article_id}"
+    def get_cache_key(self, article_content: str) -> str:
+        """Generate content-addressed cache key for this agent and article text"""
+        return get_analysis_cache().make_key(
+            self.config.name,
+            self.config.prompt_version,
+            self.config.default_model.value,
+            article_content
+        )
     
-    def cache_result(self, article_id: str, result: AgentResult, timeout: int = 3600):
-        """Cache the agent result"""
-        cache_key = self.get_cache_key(article_id)
-        cache.set(cache_key, result.to_dict(), timeout)
+    def cache_result(self, article_content: str, result: AgentResult, timeout: Optional[int] = None):
+        """Cache the agent result in the shared analysis cache"""
+        analysis_cache = get_analysis_cache()
+        if timeout is None:
+            timeout = analysis_cache.get_ttl(self.config.name, self.config.cache_ttl_seconds)
+        analysis_cache.set(self.get_cache_key(article_content), result.to_dict(), timeout)
     
-    def get_cached_result(self, article_id: str) -> Optional[AgentResult]:
+    def get_cached_result(self, article_content: str) -> Optional[AgentResult]:
         """Get cached result if available"""
-        cache_key = self.get_cache_key(article_id)
-        cached_data = cache.get(cache_key)
+        cached_data = get_analysis_cache().get(self.get_cache_key(article_content))
         
         if cached_data:
-            return AgentResult(
-                success=cached_data.get('success', False),
-                data=cached_data.get('data'),
-                error=cached_data.get('error'),
-                model_used=ModelType(cached_data['model_used']) if cached_data.get('model_used') else None,
-                tokens_used=cached_data.get('tokens_used'),
-                execution_time_ms=cached_data.get('execution_time_ms'),
-                agent_name=cached_data.get('agent_name'),
-                api_calls_count=cached_data.get('api_calls_count'),
-                refinement_calls_count=cached_data.get('refinement_calls_count')
-            )
+            return AgentResult.from_dict(cached_data)
         
         return None
     
     async def execute_with_monitoring(self, article_content: str, **kwargs) -> AgentResult:
-        """Execute agent with monitoring and caching"""
-        start_time = datetime.now()
+        """Execute agent with monitoring, caching and coalescing of duplicate requests"""
         article_id = kwargs.get('article_id')
         
-        # Check cache if article_id provided
-        if article_id:
-            cached_result = self.get_cached_result(article_id)
+        # Check the shared cache - identical content analyzed before is reused
+        cached_result = self.get_cached_result(article_content)
+        if cached_result:
+            self.logger.info(f"Cache hit for article {article_id or 'unknown'}")
+            return cached_result
+        
+        # Concurrent requests for the same analysis share one computation
+        cache_key = self.get_cache_key(article_content)
+        return await agent_singleflight.do(
+            cache_key,
+            lambda: self._execute_with_lease(cache_key, article_content, **kwargs)
+        )
+    
+    async def _execute_with_lease(self, cache_key: str, article_content: str, **kwargs) -> AgentResult:
+        """Run the agent unless another worker already is, in which case wait for its result"""
+        lease_timeout = self.config.timeout_seconds + 30
+        lease = CacheLease(cache_key, timeout=lease_timeout)
+        
+        # Wait as long as the holder's lease lives: by then it has published a result,
+        # released the lease after failing, or its lease expired. Only the worker that
+        # takes the lease runs the agent.
+        for _ in range(2):
+            if lease.acquire():
+                break
+            self.logger.info(f"Analysis already running on another worker, waiting for {cache_key}")
+            cached_result = await wait_for_lease_result(
+                lease,
+                lambda: self.get_cached_result(article_content),
+                timeout=lease_timeout
+            )
             if cached_result:
-                self.logger.info(f"Cache hit for article {article_id}")
                 return cached_result
+        else:
+            return AgentResult(
+                success=False,
+                error="Analysis is still running on another worker",
+                agent_name=self.config.name
+            )
+        
+        try:
+            return await self._execute(article_content, **kwargs)
+        finally:
+            lease.release()
+    
+    async def _execute(self, article_content: str, **kwargs) -> AgentResult:
+        """Run the agent with timeout and cache successful results"""
+        start_time = datetime.now()
         
         try:
             # Execute the actual processing
@@ -208,10 +268,16 @@ class BaseAgent(ABC, AsyncCommunicationMixin):
             execution_time = (datetime.now() - start_time).total_seconds() * 1000
             result.execution_time_ms = int(execution_time)
             result.agent_name = self.config.name
+            if isinstance(result.data, PartialJSON):
+                result.partial = True
             
-            # Cache successful results
-            if result.success and article_id:
-                self.cache_result(article_id, result)
+            # Cache successful results, truncated ones only briefly
+            if result.success:
+                self.cache_result(
+                    article_content,
+                    result,
+                    self.config.partial_cache_ttl_seconds if result.partial else None
+                )
             
             return result
             
@@ -230,9 +296,33 @@ class BaseAgent(ABC, AsyncCommunicationMixin):
 class AnalysisAgent(BaseAgent):
     """Base class for analysis agents with structured output"""
     
+    # Request settings, overridden per agent
+    use_websearch = False
+    temperature = 0.7
+    
     def __init__(self, config: AgentConfig, schema: Dict[str, Any]):
         super().__init__(config)
         self.schema = schema
+        self._system_blocks = None
+    
+    def get_system_blocks(self) -> List[Dict[str, Any]]:
+        """Cacheable system prompt + schema prefix, built once per agent"""
+        if self._system_blocks is None:
+            self._system_blocks = build_system_blocks(self.get_system_prompt(), self.schema)
+        return self._system_blocks
+    
+    def get_completion_kwargs(self, article_content: str) -> Dict[str, Any]:
+        """Arguments for ClaudeClient.create_structured_completion / build_structured_request"""
+        return {
+            'system_prompt': self.get_system_prompt(),
+            'user_prompt': self.get_user_prompt(article_content),
+            'schema': self.schema,
+            'system_blocks': self.get_system_blocks(),
+            'model': self.config.default_model.value,
+            'use_websearch': self.use_websearch,
+            'temperature': self.temperature,
+            'usage_label': self.config.name,
+        }
     
     @abstractmethod
     def get_system_prompt(self) -> str:
@@ -4,7 +4,7 @@ Orchestrates all analysis agents
 """
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
 from .base import AgentResult, BaseAgent
@@ -12,6 +12,8 @@ from .jargon_agent import JargonAgent
 from .viewpoints_agent import ViewpointsAgent
 from .fact_check_agent import FactCheckAgent
 from .timeline_agent import TimelineAgent
+from ..streaming import get_stream_publisher
+from ..json_stream import array_paths_from_schema
 
 logger = logging.getLogger(__name__)
 
@@ -19,10 +21,9 @@ logger = logging.getLogger(__name__)
 class AgentCoordinator:
     """Coordinates multiple analysis agents"""
     
-    def __init__(self, max_concurrent: int = 3):
+    def __init__(self, max_concurrent: int = 4):
         self.max_concurrent = max_concurrent
         self.agents = self._initialize_agents()
-        self.semaphore = asyncio.Semaphore(max_concurrent)
     
     def _initialize_agents(self) -> Dict[str, BaseAgent]:
         """Initialize all available agents"""
@@ -37,7 +38,8 @@ class AgentCoordinator:
         self,
         article_content: str,
         article_id: Optional[str] = None,
-        analysis_types: List[str] = None
+        analysis_types: List[str] = None,
+        stream_group: Optional[str] = None
     ) -> Dict[str, AgentResult]:
         """
         Run analysis agents on article content
@@ -46,6 +48,7 @@ class AgentCoordinator:
             article_content: The article text to analyze
             article_id: Optional article ID for caching
             analysis_types: List of analysis types to run (default: all)
+            stream_group: Optional channel-layer group that receives streamed agent output
             
         Returns:
             Dictionary mapping agent names to their results
@@ -64,35 +67,48 @@ class AgentCoordinator:
         
         logger.info(f"Running {len(agents_to_run)} agents on article {article_id or 'unknown'}")
         
-        # Create tasks for each agent
-        tasks = []
-        for name, agent in agents_to_run.items():
-            task = self._run_agent_with_semaphore(
-                agent, 
-                article_content, 
-                article_id=article_id
+        # Start every agent as its own task; the semaphore bounds how many
+        # of them talk to the LLM providers at the same time
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        tasks = [
+            asyncio.ensure_future(
+                self._run_agent_with_semaphore(
+                    semaphore,
+                    name,
+                    agent,
+                    article_content,
+                    article_id=article_id,
+                    on_text=get_stream_publisher(
+                        stream_group,
+                        name,
+                        item_paths=array_paths_from_schema(getattr(agent, 'schema', {}))
+                    )
+                )
             )
-            tasks.append((name, task))
+            for name, agent in agents_to_run.items()
+        ]
         
-        # Run all agents concurrently
+        # Collect results as agents finish, so total latency tracks the
+        # slowest agent instead of the sum of all of them
         results = {}
-        for name, task in tasks:
-            try:
-                result = await task
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                name, result = await next_done
                 results[name] = result
                 
                 if result.success:
                     logger.info(f"Agent {name} completed successfully")
                 else:
                     logger.error(f"Agent {name} failed: {result.error}")
-                    
-            except Exception as e:
-                logger.error(f"Unexpected error running agent {name}: {str(e)}")
-                results[name] = AgentResult(
-                    success=False,
-                    error=str(e),
-                    agent_name=name
-                )
+        except asyncio.CancelledError:
+            # Caller gave up on the article - stop any agents still running
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        
+        # Keep results in the order the agents were requested
+        results = {name: results[name] for name in agents_to_run if name in results}
         
         # Log summary
         total_time = (datetime.now() - start_time).total_seconds()
@@ -106,13 +122,26 @@ class AgentCoordinator:
     
     async def _run_agent_with_semaphore(
         self,
+        semaphore: asyncio.Semaphore,
+        name: str,
         agent: BaseAgent,
         article_content: str,
         **kwargs
-    ) -> AgentResult:
-        """Run a single agent with semaphore control"""
-        async with self.semaphore:
-            return await agent.execute_with_monitoring(article_content, **kwargs)
+    ) -> Tuple[str, AgentResult]:
+        """Run a single agent with semaphore control, never raising"""
+        try:
+            async with semaphore:
+                result = await agent.execute_with_monitoring(article_content, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error running agent {name}: {str(e)}")
+            result = AgentResult(
+                success=False,
+                error=str(e),
+                agent_name=name
+            )
+        return name, result
     
     def get_available_agents(self) -> List[str]:
         """Get list of available agent names"""
@@ -123,4 +152,15 @@ class AgentCoordinator:
         return {
             name: agent.config.description
             for name, agent in self.agents.items()
-        }
\ No newline at end of file
+        }
+
+
+# Singleton instance, reused across tasks running on the worker async runtime
+_agent_coordinator = None
+
+def get_agent_coordinator() -> AgentCoordinator:
+    """Get or create the shared agent coordinator"""
+    global _agent_coordinator
+    if _agent_coordinator is None:
+        _agent_coordinator = AgentCoordinator()
+    return _agent_coordinator
@@ -14,13 +14,17 @@ logger = logging.getLogger(__name__)
 class FactCheckAgent(AnalysisAgent):
     """Agent for fact-checking claims and verifying statements"""
     
+    use_websearch = True  # Essential for fact-checking and verification
+    temperature = 0.3  # Lower temperature for factual accuracy
+    
     def __init__(self):
         config = AgentConfig(
             name="fact_check",
             description="Verifies claims and checks facts in articles",
             default_model=ModelType.CLAUDE_SONNET_4,
             complexity=ComplexityLevel.HIGH,
-            timeout_seconds=120
+            timeout_seconds=120,
+            cache_ttl_seconds=6 * 3600  # Web search evidence goes stale quickly
         )
         schema = get_fact_check_response_schema()
         super().__init__(config, schema)
@@ -66,12 +70,8 @@ class FactCheckAgent(AnalysisAgent):
         try:
             # Create the analysis request using Claude with websearch for fact verification
             response = await self.claude_client.create_structured_completion(
-                system_prompt=self.get_system_prompt(),
-                user_prompt=self.get_user_prompt(article_content),
-                schema=self.schema,
-                model=self.config.default_model.value,
-                use_websearch=True,  # Essential for fact-checking and verification
-                temperature=0.3  # Lower temperature for factual accuracy
+                **self.get_completion_kwargs(article_content),
+                on_text=kwargs.get('on_text')  # Stream deltas to progress listeners
             )
             
             # Validate the response
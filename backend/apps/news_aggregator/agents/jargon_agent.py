@@ -14,13 +14,17 @@ logger = logging.getLogger(__name__)
 class JargonAgent(AnalysisAgent):
     """Agent for identifying and explaining technical jargon"""
     
+    use_websearch = False  # No websearch needed for jargon explanation
+    temperature = 0.3  # Lower temperature for more consistent results
+    
     def __init__(self):
         config = AgentConfig(
             name="jargon",
             description="Identifies and explains technical terms and jargon",
             default_model=ModelType.CLAUDE_HAIKU_3_5,
             complexity=ComplexityLevel.SIMPLE,
-            timeout_seconds=60
+            timeout_seconds=60,
+            cache_ttl_seconds=30 * 24 * 3600  # Term explanations rarely change
         )
         schema = get_jargon_response_schema()
         super().__init__(config, schema)
@@ -54,12 +58,8 @@ class JargonAgent(AnalysisAgent):
         try:
             # Create the analysis request using Claude (no websearch needed for jargon)
             response = await self.claude_client.create_structured_completion(
-                system_prompt=self.get_system_prompt(),
-                user_prompt=self.get_user_prompt(article_content),
-                schema=self.schema,
-                model=self.config.default_model.value,
-                use_websearch=False,  # No websearch needed for jargon explanation
-                temperature=0.3  # Lower temperature for more consistent results
+                **self.get_completion_kwargs(article_content),
+                on_text=kwargs.get('on_text')  # Stream deltas to progress listeners
             )
             
             # Validate the response
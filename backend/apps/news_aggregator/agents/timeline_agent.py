@@ -14,6 +14,9 @@ logger = logging.getLogger(__name__)
 class TimelineAgent(AnalysisAgent):
     """Agent for extracting and organizing chronological events"""
     
+    use_websearch = True  # Use websearch to find additional chronological context
+    temperature = 0.3  # Lower temperature for accurate extraction
+    
     def __init__(self):
         config = AgentConfig(
             name="timeline",
@@ -66,12 +69,8 @@ class TimelineAgent(AnalysisAgent):
         try:
             # Create the analysis request using Claude (with websearch for additional context)
             response = await self.claude_client.create_structured_completion(
-                system_prompt=self.get_system_prompt(),
-                user_prompt=self.get_user_prompt(article_content),
-                schema=self.schema,
-                model=self.config.default_model.value,
-                use_websearch=True,  # Use websearch to find additional chronological context
-                temperature=0.3  # Lower temperature for accurate extraction
+                **self.get_completion_kwargs(article_content),
+                on_text=kwargs.get('on_text')  # Stream deltas to progress listeners
             )
             
             # Validate the response
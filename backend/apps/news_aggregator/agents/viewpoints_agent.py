@@ -14,13 +14,17 @@ logger = logging.getLogger(__name__)
 class ViewpointsAgent(AnalysisAgent):
     """Agent for finding alternative viewpoints and perspectives"""
     
+    use_websearch = True  # Essential for finding alternative perspectives
+    temperature = 0.7  # Higher temperature for diverse viewpoints
+    
     def __init__(self):
         config = AgentConfig(
             name="viewpoints",
             description="Discovers alternative perspectives and viewpoints on the topic",
             default_model=ModelType.CLAUDE_SONNET_4,
             complexity=ComplexityLevel.HIGH,
-            timeout_seconds=120
+            timeout_seconds=120,
+            cache_ttl_seconds=12 * 3600  # Web search perspectives go stale
         )
         schema = get_viewpoints_response_schema()
         super().__init__(config, schema)
@@ -48,12 +52,8 @@ class ViewpointsAgent(AnalysisAgent):
         try:
             # Create the analysis request using Claude with websearch for alternative viewpoints
             response = await self.claude_client.create_structured_completion(
-                system_prompt=self.get_system_prompt(),
-                user_prompt=self.get_user_prompt(article_content),
-                schema=self.schema,
-                model=self.config.default_model.value,
-                use_websearch=True,  # Essential for finding alternative perspectives
-                temperature=0.7  # Higher temperature for diverse viewpoints
+                **self.get_completion_kwargs(article_content),
+                on_text=kwargs.get('on_text')  # Stream deltas to progress listeners
             )
             
             return AgentResult(
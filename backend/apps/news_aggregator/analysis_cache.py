@@ -0,0 +1,129 @@
+"""
+Content-addressed cache for agent analysis results
+Results are keyed on (agent, prompt version, model, normalized article text), so the same
+syndicated story posted under different URLs is only analyzed once.
+"""
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import logging
+import re
+import unicodedata
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_ANALYSIS_CACHE_CONFIG = {
+    'ALIAS': 'analysis',
+    'DEFAULT_TTL': 24 * 3600,
+    'TTL': {},
+    'COMPRESS_MIN_BYTES': 1024,
+    'COMPRESSION_LEVEL': 6,
+}
+
+# One-byte payload markers so compressed and plain entries can coexist
+_RAW_MARKER = b'j'
+_ZLIB_MARKER = b'z'
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def get_analysis_cache_config() -> Dict[str, Any]:
+    """Get the analysis cache configuration merged with defaults"""
+    return {**DEFAULT_ANALYSIS_CACHE_CONFIG, **getattr(settings, 'ANALYSIS_CACHE', {})}
+
+
+def normalize_content(article_content: str) -> str:
+    """Normalize article text so trivially different copies hash the same"""
+    text = unicodedata.normalize('NFKC', article_content or '')
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+class AnalysisCache:
+    """Shared, compressed cache for agent results"""
+
+    def __init__(self):
+        self.config = get_analysis_cache_config()
+
+    @property
+    def backend(self):
+        """Dedicated cache alias if configured, otherwise the default cache"""
+        try:
+            return caches[self.config['ALIAS']]
+        except InvalidCacheBackendError:
+            return caches['default']
+
+    def make_key(self, agent_name: str, prompt_version: str, model: str, article_content: str) -> str:
+        """
+        Build the content-addressed cache key
+
+        Args:
+            agent_name: Name of the agent producing the result
+            prompt_version: Version of the agent prompt/schema, bump to invalidate
+            model: Model identifier used for the analysis
+            article_content: Raw article text
+
+        Returns:
+            Cache key string
+        """
+        digest = hashlib.sha256()
+        for part in (agent_name, prompt_version, model, normalize_content(article_content)):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\x00')
+        return f"analysis:{agent_name}:{digest.hexdigest()}"
+
+    def get_ttl(self, agent_name: str, default: Optional[int] = None) -> int:
+        """TTL for an agent: settings override, then the agent default, then the global default"""
+        ttl = self.config['TTL'].get(agent_name)
+        if ttl is not None:
+            return ttl
+        return default if default is not None else self.config['DEFAULT_TTL']
+
+    def encode(self, payload: Dict[str, Any]) -> bytes:
+        """Serialize a payload, compressing it when large enough to be worth it"""
+        raw = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if len(raw) >= self.config['COMPRESS_MIN_BYTES']:
+            return _ZLIB_MARKER + zlib.compress(raw, self.config['COMPRESSION_LEVEL'])
+        return _RAW_MARKER + raw
+
+    @staticmethod
+    def decode(value: bytes) -> Dict[str, Any]:
+        """Deserialize a payload written by encode()"""
+        marker, body = value[:1], value[1:]
+        if marker == _ZLIB_MARKER:
+            body = zlib.decompress(body)
+        elif marker != _RAW_MARKER:
+            raise ValueError(f"Unknown analysis cache payload marker: {marker!r}")
+        return json.loads(body.decode('utf-8'))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached payload; cache outages are treated as misses"""
+        try:
+            value = self.backend.get(key)
+            return self.decode(value) if value is not None else None
+        except Exception as e:
+            logger.warning(f"Analysis cache read failed for {key}: {e}")
+            return None
+
+    def set(self, key: str, payload: Dict[str, Any], ttl: int):
+        """Store a payload; cache outages are logged and ignored"""
+        try:
+            self.backend.set(key, self.encode(payload), ttl)
+        except Exception as e:
+            logger.warning(f"Analysis cache write failed for {key}: {e}")
+
+
+# Singleton instance
+_analysis_cache = None
+
+def get_analysis_cache() -> AnalysisCache:
+    """Get or create the analysis cache instance"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = AnalysisCache()
+    return _analysis_cache
@@ -0,0 +1,312 @@
+"""
+Batch analysis through the Anthropic Message Batches API
+
+Pending (article, analysis type) pairs are packed into one batch submission using the
+same requests the interactive agents send, polled until the batch ends, and the results
+are written into AIAnalysis in bulk. Batches run at batch pricing and outside the
+interactive rate limits, which makes them the right tool for overnight backfills.
+"""
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import logging
+import uuid
+
+from django.conf import settings
+from django.utils import timezone
+from anthropic import Anthropic
+
+from .content_store import ContentNotFound, prefetch_full_text
+from .models import Article, AIAnalysis, AnalysisBatch
+from .usage_stats import record_prompt_cache_usage
+
+logger = logging.getLogger(__name__)
+
+
+# Batches that may still produce results; their analysis types are not resubmitted
+OPEN_BATCH_STATUSES = ['submitted', 'in_progress', 'ended']
+
+WRITE_CHUNK_SIZE = 500
+
+
+def get_batch_settings() -> Dict[str, Any]:
+    config = getattr(settings, 'NEWS_AGGREGATOR', {})
+    return {
+        'max_requests': config.get('BATCH_MAX_REQUESTS', 10000),
+        'poll_interval': config.get('BATCH_POLL_INTERVAL', 60),
+    }
+
+
+_batch_client = None
+
+
+def get_batch_client() -> Anthropic:
+    """Get or create the synchronous Anthropic client used for batch operations"""
+    global _batch_client
+    if _batch_client is None:
+        from .claude_client import get_claude_client
+        _batch_client = Anthropic(
+            api_key=get_claude_client().api_key,
+            base_url=getattr(settings, 'ANTHROPIC_BASE_URL', None)
+        )
+    return _batch_client
+
+
+def make_custom_id(article_id: uuid.UUID, analysis_type: str) -> str:
+    """Batch request id; the API allows only [a-zA-Z0-9_-] up to 64 characters"""
+    return f"{article_id.hex}-{analysis_type}"
+
+
+def parse_custom_id(custom_id: str) -> Tuple[uuid.UUID, str]:
+    article_hex, analysis_type = custom_id.split('-', 1)
+    return uuid.UUID(article_hex), analysis_type
+
+
+def find_pending_pairs(
+    analysis_types: List[str],
+    limit: int,
+    force: bool = False
+) -> Iterator[Tuple[Article, str]]:
+    """
+    Yield (article, analysis type) pairs that still need analysis
+
+    Args:
+        analysis_types: Analysis types to consider
+        limit: Maximum number of pairs
+        force: Re-analyze articles that already have a result
+    """
+    remaining = limit
+    for analysis_type in analysis_types:
+        if remaining <= 0:
+            return
+
+        # Near-duplicates reuse their canonical article's analyses instead
+        articles = Article.objects.filter(
+            is_processed=True, canonical_article__isnull=True
+        ).exclude(content='', content_ref='')
+        if not force:
+            articles = articles.exclude(analyses__analysis_type=analysis_type)
+        articles = articles.only('id', 'content', 'content_ref').order_by('-published_at', '-created_at')
+
+        for article in articles[:remaining].iterator(chunk_size=WRITE_CHUNK_SIZE):
+            remaining -= 1
+            yield article, analysis_type
+
+
+def submit_analysis_batch(
+    analysis_types: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    force: bool = False
+) -> Optional[AnalysisBatch]:
+    """
+    Submit pending analyses as one Message Batch
+
+    Analysis types that already have an open batch are skipped, so repeated runs do
+    not submit the same work twice.
+
+    Args:
+        analysis_types: Analysis types to run (default: all agents)
+        limit: Maximum number of requests (default: BATCH_MAX_REQUESTS)
+        force: Re-analyze articles that already have a result
+
+    Returns:
+        The created AnalysisBatch, or None if there was nothing to submit
+    """
+    from .agents.coordinator import get_agent_coordinator
+
+    agents = get_agent_coordinator().agents
+    if analysis_types is None or 'all' in analysis_types:
+        analysis_types = list(agents.keys())
+    analysis_types = [t for t in analysis_types if t in agents]
+
+    busy_types = set()
+    for batch in AnalysisBatch.objects.filter(
+        status__in=OPEN_BATCH_STATUSES,
+        analysis_types__overlap=analysis_types
+    ).only('analysis_types'):
+        busy_types.update(batch.analysis_types)
+    if busy_types:
+        logger.info(f"Skipping analysis types with open batches: {sorted(busy_types)}")
+    analysis_types = [t for t in analysis_types if t not in busy_types]
+
+    limit = min(limit or get_batch_settings()['max_requests'], get_batch_settings()['max_requests'])
+
+    pairs = list(find_pending_pairs(analysis_types, limit, force=force))
+    prefetch_full_text({article.id: article for article, _ in pairs}.values())
+
+    requests = []
+    for article, analysis_type in pairs:
+        agent = agents[analysis_type]
+        try:
+            article_content = article.full_text
+        except ContentNotFound:
+            # Logged by prefetch_full_text
+            continue
+        requests.append({
+            'custom_id': make_custom_id(article.id, analysis_type),
+            'params': agent.claude_client.build_structured_request(
+                **agent.get_completion_kwargs(article_content)
+            ),
+        })
+
+    if not requests:
+        logger.info("No pending analyses to submit")
+        return None
+
+    message_batch = get_batch_client().messages.batches.create(requests=requests)
+
+    batch = AnalysisBatch.objects.create(
+        provider_batch_id=message_batch.id,
+        status='submitted',
+        analysis_types=sorted({parse_custom_id(r['custom_id'])[1] for r in requests}),
+        request_count=len(requests)
+    )
+    logger.info(f"Submitted analysis batch {batch.provider_batch_id} with {len(requests)} requests")
+    return batch
+
+
+def poll_analysis_batch(batch: AnalysisBatch) -> AnalysisBatch:
+    """
+    Refresh a batch's status and collect its results once it has ended
+
+    Returns:
+        The updated batch
+    """
+    if batch.status not in OPEN_BATCH_STATUSES:
+        return batch
+
+    try:
+        message_batch = get_batch_client().messages.batches.retrieve(batch.provider_batch_id)
+    except Exception as e:
+        logger.error(f"Failed to poll analysis batch {batch.provider_batch_id}: {e}")
+        batch.error_message = str(e)
+        batch.save(update_fields=['error_message', 'updated_at'])
+        return batch
+
+    if message_batch.processing_status == 'ended':
+        if batch.status != 'ended':
+            batch.status = 'ended'
+            batch.ended_at = message_batch.ended_at or timezone.now()
+            batch.save(update_fields=['status', 'ended_at', 'updated_at'])
+        collect_analysis_batch(batch)
+    elif message_batch.processing_status == 'in_progress' and batch.status == 'submitted':
+        batch.status = 'in_progress'
+        batch.save(update_fields=['status', 'updated_at'])
+
+    return batch
+
+
+def collect_analysis_batch(batch: AnalysisBatch) -> int:
+    """
+    Write the results of an ended batch into AIAnalysis
+
+    Returns:
+        Number of analyses written
+    """
+    from .agents.base import AgentResult
+    from .agents.coordinator import get_agent_coordinator
+
+    agents = get_agent_coordinator().agents
+    processing_time = (
+        (batch.ended_at - batch.created_at).total_seconds() if batch.ended_at else 0
+    )
+
+    parsed: Dict[Tuple[uuid.UUID, str], Dict[str, Any]] = {}
+    counts = {'succeeded': 0, 'errored': 0, 'expired': 0, 'canceled': 0}
+
+    try:
+        for entry in get_batch_client().messages.batches.results(batch.provider_batch_id):
+            result_type = entry.result.type
+            counts[result_type] = counts.get(result_type, 0) + 1
+            article_id, analysis_type = parse_custom_id(entry.custom_id)
+            agent = agents.get(analysis_type)
+
+            if result_type != 'succeeded' or agent is None:
+                logger.warning(f"Batch request {entry.custom_id} {result_type}")
+                continue
+
+            message = entry.result.message
+            record_prompt_cache_usage(analysis_type, getattr(message, 'usage', None))
+            try:
+                data = agent.claude_client.parse_structured_response(message)
+            except ValueError as e:
+                counts['succeeded'] -= 1
+                counts['errored'] += 1
+                logger.warning(f"Batch request {entry.custom_id} returned invalid JSON: {e}")
+                continue
+            if not agent.validate_output(data):
+                counts['succeeded'] -= 1
+                counts['errored'] += 1
+                continue
+
+            parsed[(article_id, analysis_type)] = {'data': data, 'model': message.model}
+    except Exception as e:
+        logger.error(f"Failed to read results of batch {batch.provider_batch_id}: {e}")
+        batch.status = 'failed'
+        batch.error_message = str(e)
+        batch.save(update_fields=['status', 'error_message', 'updated_at'])
+        return 0
+
+    # Articles deleted since submission are skipped
+    keys = list(parsed.keys())
+    written = 0
+    for start in range(0, len(keys), WRITE_CHUNK_SIZE):
+        chunk = keys[start:start + WRITE_CHUNK_SIZE]
+        articles = Article.objects.in_bulk({article_id for article_id, _ in chunk})
+        prefetch_full_text(articles.values())
+
+        analyses = []
+        for article_id, analysis_type in chunk:
+            article = articles.get(article_id)
+            if article is None:
+                continue
+            entry = parsed[(article_id, analysis_type)]
+            analyses.append(AIAnalysis(
+                article=article,
+                analysis_type=analysis_type,
+                result=entry['data'],
+                model_used=entry['model'],
+                processing_time=processing_time
+            ))
+
+            # Warm the shared cache so interactive requests reuse the batch result
+            try:
+                article_content = article.full_text
+            except ContentNotFound:
+                continue
+            agents[analysis_type].cache_result(article_content, AgentResult(
+                success=True,
+                data=entry['data'],
+                agent_name=analysis_type,
+                model_used=agents[analysis_type].config.default_model
+            ))
+
+        AIAnalysis.objects.bulk_create(
+            analyses,
+            update_conflicts=True,
+            unique_fields=['article', 'analysis_type'],
+            update_fields=['result', 'model_used', 'processing_time', 'updated_at']
+        )
+        Article.objects.filter(
+            id__in=[analysis.article_id for analysis in analyses]
+        ).update(is_enriched=True)
+        written += len(analyses)
+
+    batch.status = 'collected'
+    batch.collected_at = timezone.now()
+    batch.succeeded_count = counts['succeeded']
+    batch.errored_count = counts['errored'] + counts['canceled']
+    batch.expired_count = counts['expired']
+    batch.save(update_fields=[
+        'status', 'collected_at', 'succeeded_count', 'errored_count', 'expired_count', 'updated_at'
+    ])
+
+    logger.info(f"Collected analysis batch {batch.provider_batch_id}: {written} analyses written, "
+                f"{batch.errored_count} errored, {batch.expired_count} expired")
+    return written
+
+
+def poll_open_batches() -> List[AnalysisBatch]:
+    """Poll every batch that may still produce results"""
+    return [
+        poll_analysis_batch(batch)
+        for batch in AnalysisBatch.objects.filter(status__in=OPEN_BATCH_STATUSES)
+    ]
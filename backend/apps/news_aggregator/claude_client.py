@@ -2,7 +2,7 @@
 Claude API client for Django integration
 Handles all interactions with the Claude AI API with websearch, caching and async support
 """
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Union, Callable, Awaitable
 import logging
 import asyncio
 import os
@@ -11,11 +11,47 @@ import json
 
 from django.conf import settings
 from django.core.cache import cache
-from anthropic import AsyncAnthropic
+from anthropic import AsyncAnthropic, APIConnectionError, APIStatusError, RateLimitError
+
+from .json_stream import parse_lenient
+from .usage_stats import record_prompt_cache_usage
+from .rate_limit import (
+    RateLimitExceeded, TransientAPIError, estimate_tokens, get_rate_limiter, parse_retry_after
+)
 
 logger = logging.getLogger(__name__)
 
 
+def build_system_blocks(system_prompt: str, schema: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Build the system prompt + JSON schema instructions as a cacheable prefix
+    
+    The block is identical for every article an agent analyzes, so it is marked with
+    cache_control and billed at the cache-read rate after the first request. Prefixes
+    shorter than the model's minimum cacheable length are simply not cached.
+    
+    Args:
+        system_prompt: Agent system prompt
+        schema: JSON schema the response must follow
+        
+    Returns:
+        System content blocks for the Messages API
+    """
+    enhanced_system_prompt = f"""{system_prompt}
+
+Πρέπει να απαντήσεις σε έγκυρο JSON format που να ακολουθεί αυστηρά αυτό το schema:
+
+{json.dumps(schema, ensure_ascii=False, indent=2)}
+
+Σημαντικό: Η απάντησή σου πρέπει να είναι μόνο το JSON object, χωρίς επιπλέον κείμενο πριν ή μετά."""
+
+    return [{
+        "type": "text",
+        "text": enhanced_system_prompt,
+        "cache_control": {"type": "ephemeral"}
+    }]
+
+
 class ClaudeClient:
     """Async wrapper for Claude API interactions with websearch and caching"""
     
@@ -25,7 +61,12 @@ class ClaudeClient:
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in settings or environment variables")
         
-        self.client = AsyncAnthropic(api_key=self.api_key)
+        # Retries happen in the shared rate limiter, which also adapts concurrency on 429s
+        self.client = AsyncAnthropic(
+            api_key=self.api_key,
+            base_url=getattr(settings, 'ANTHROPIC_BASE_URL', None),
+            max_retries=0
+        )
         self.timeout = 120.0
         
     async def create_completion(
@@ -84,7 +125,7 @@ class ClaudeClient:
         
         # Make the API call
         try:
-            response = await self.client.messages.create(**request_params)
+            response = await self._send(request_params)
             
             # Log token usage if available
             if hasattr(response, 'usage'):
@@ -160,7 +201,7 @@ class ClaudeClient:
             request_params["tools"] = tools
         
         # Use the client directly for proper system message handling
-        response = await self.client.messages.create(**request_params)
+        response = await self._send(request_params)
         
         # DEBUG: Log full response structure
         logger.info(f"Full Claude response: {response}")
@@ -186,6 +227,9 @@ class ClaudeClient:
         model: str = "claude-3-7-sonnet-20250219",
         use_websearch: bool = False,
         use_caching: bool = False,
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None,
+        system_blocks: Optional[List[Dict[str, Any]]] = None,
+        usage_label: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -198,21 +242,54 @@ class ClaudeClient:
             model: Claude model to use
             use_websearch: Whether to enable web search
             use_caching: Whether to enable prompt caching
+            on_text: Optional async callback; when given the response is streamed and
+                every text delta is passed to it as it arrives
+            system_blocks: Precomputed build_system_blocks() output for this prompt and schema
+            usage_label: Name under which prompt-cache usage is recorded (e.g. the agent)
             **kwargs: Additional parameters
             
         Returns:
             The parsed JSON response
         """
         
-        # Enhance system prompt with JSON schema requirements
-        enhanced_system_prompt = f"""{system_prompt}
-
-Πρέπει να απαντήσεις σε έγκυρο JSON format που να ακολουθεί αυστηρά αυτό το schema:
-
-{json.dumps(schema, ensure_ascii=False, indent=2)}
-
-Σημαντικό: Η απάντησή σου πρέπει να είναι μόνο το JSON object, χωρίς επιπλέον κείμενο πριν ή μετά."""
-
+        request_params = self.build_structured_request(
+            system_prompt,
+            user_prompt,
+            schema,
+            model=model,
+            use_websearch=use_websearch,
+            use_caching=use_caching,
+            system_blocks=system_blocks,
+            **kwargs
+        )
+        response = await self._send(request_params, on_text=on_text)
+        
+        if usage_label:
+            record_prompt_cache_usage(usage_label, getattr(response, 'usage', None))
+        
+        return self.parse_structured_response(response)
+    
+    def build_structured_request(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: Dict[str, Any],
+        model: str = "claude-3-7-sonnet-20250219",
+        use_websearch: bool = False,
+        use_caching: bool = False,
+        system_blocks: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Build Messages API parameters for a structured JSON completion
+        
+        Shared by interactive calls and Message Batches submissions, so both send
+        exactly the same request for the same agent and article. The system prompt
+        and schema form a cached prefix; pass system_blocks to reuse a precomputed one.
+        
+        Returns:
+            Parameters for messages.create
+        """
         messages = [
             {"role": "user", "content": user_prompt}
         ]
@@ -245,27 +322,127 @@ class ClaudeClient:
             "max_tokens": kwargs.get("max_tokens", 4000),
             "messages": messages,
             "temperature": kwargs.get("temperature", 0.7),
-            "system": enhanced_system_prompt
+            "system": system_blocks or build_system_blocks(system_prompt, schema)
         }
         
         if tools:
             request_params["tools"] = tools
         
-        # Use the client directly for proper system message handling
-        response = await self.client.messages.create(**request_params)
+        return request_params
+    
+    def parse_structured_response(self, response) -> Dict[str, Any]:
+        """
+        Parse the JSON object out of a Messages API response
         
-        # Extract and parse the JSON response
+        Raises:
+            ValueError: If the response holds no recoverable JSON object
+        """
+        # Web search responses interleave tool blocks with text, so use all text blocks
         if response.content and len(response.content) > 0:
-            content = response.content[0].text
+            content = "".join(
+                block.text for block in response.content if hasattr(block, 'text')
+            )
+            if getattr(response, 'stop_reason', None) == 'max_tokens':
+                logger.warning("Claude response hit max_tokens, recovering partial JSON")
             try:
-                return json.loads(content)
-            except json.JSONDecodeError as e:
+                return parse_lenient(content)
+            except ValueError as e:
                 logger.error(f"Failed to parse JSON response: {e}")
                 logger.error(f"Response content: {content}")
                 raise ValueError(f"Invalid JSON response from Claude: {e}")
         
         raise ValueError("Empty response from Claude")
     
+    async def _send(
+        self,
+        request_params: Dict[str, Any],
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None
+    ):
+        """
+        Send a Messages API request through the shared provider rate limiter
+        
+        Args:
+            request_params: Parameters for messages.create
+            on_text: Optional callback; when given the response is streamed
+            
+        Returns:
+            The final Message
+        """
+        model = request_params["model"]
+        limiter = get_rate_limiter('anthropic', model)
+        estimated = estimate_tokens(
+            str(request_params.get("system", "")),
+            json.dumps(request_params["messages"], ensure_ascii=False),
+            max_output_tokens=request_params["max_tokens"]
+        )
+        
+        streamed = False
+        
+        async def forward_text(text: str):
+            nonlocal streamed
+            streamed = True
+            await on_text(text)
+        
+        if on_text is not None and hasattr(on_text, 'flush'):
+            forward_text.flush = on_text.flush
+        
+        async def call():
+            try:
+                if on_text is not None:
+                    return await self._stream_message(request_params, forward_text)
+                return await self.client.messages.create(**request_params)
+            except APIConnectionError as e:
+                # Includes timeouts; a stream that already sent text can't be replayed
+                if streamed:
+                    raise
+                raise TransientAPIError(f"Claude connection error for {model}: {e}") from e
+            except RateLimitError as e:
+                raise RateLimitExceeded(
+                    f"Claude rate limit for {model}",
+                    parse_retry_after(e.response.headers.get("retry-after"))
+                ) from e
+            except APIStatusError as e:
+                # 529 overloaded is a capacity signal just like 429
+                if e.status_code == 529:
+                    raise RateLimitExceeded(
+                        f"Claude overloaded for {model}",
+                        parse_retry_after(e.response.headers.get("retry-after"))
+                    ) from e
+                if not streamed and (e.status_code in (408, 409) or e.status_code >= 500):
+                    raise TransientAPIError(
+                        f"Claude API error {e.status_code} for {model}",
+                        parse_retry_after(e.response.headers.get("retry-after"))
+                    ) from e
+                raise
+        
+        return await limiter.execute(call, estimated, count_tokens=self._usage_tokens)
+    
+    @staticmethod
+    def _usage_tokens(response) -> Optional[int]:
+        """Total tokens billed for a response, if reported"""
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return None
+        return (usage.input_tokens or 0) + (usage.output_tokens or 0)
+    
+    async def _stream_message(
+        self,
+        request_params: Dict[str, Any],
+        on_text: Callable[[str], Awaitable[None]]
+    ):
+        """Stream a message, forwarding text deltas, and return the final message"""
+        async with self.client.messages.stream(**request_params) as stream:
+            async for text in stream.text_stream:
+                await on_text(text)
+            response = await stream.get_final_message()
+        
+        # Push out anything the callback still buffers
+        flush = getattr(on_text, 'flush', None)
+        if flush is not None:
+            await flush()
+        
+        return response
+    
     def get_cache_key(self, prompt_hash: str, model: str) -> str:
         """Generate cache key for prompt caching"""
         return f"claude:cache:{model}:{prompt_hash}"
@@ -0,0 +1,216 @@
+"""
+Article content storage tier in MongoDB
+Full text, raw HTML and extraction metadata of older articles move to one Mongo
+document per article (compressed with zstd, or gzip when zstandard is not installed).
+Postgres keeps a short summary and a pointer, so list and scan queries read a fraction
+of the bytes; the full text is loaded lazily through Article.full_text.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import gzip
+import logging
+
+from bson.binary import Binary
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from pymongo import ReplaceOne
+
+from .models import Article
+from .utils import get_mongodb
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+class ContentNotFound(LookupError):
+    """An article's content_ref points to no document in the content store"""
+
+
+def get_content_store_settings() -> Dict[str, Any]:
+    config = getattr(settings, 'CONTENT_STORE', {})
+    return {
+        'collection': config.get('COLLECTION', 'article_documents'),
+        'codec': config.get('CODEC', 'zstd'),
+        'zstd_level': config.get('ZSTD_LEVEL', 9),
+        'summary_chars': config.get('SUMMARY_CHARS', 600),
+        'offload_after_days': config.get('OFFLOAD_AFTER_DAYS', 7),
+    }
+
+
+def compress(text: str, codec: Optional[str] = None) -> Tuple[str, bytes]:
+    """
+    Compress text with the configured codec
+
+    Returns:
+        (codec actually used, compressed bytes)
+    """
+    config = get_content_store_settings()
+    codec = codec or config['codec']
+    data = text.encode('utf-8')
+
+    if codec == 'zstd' and zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=config['zstd_level']).compress(data)
+    return 'gzip', gzip.compress(data, compresslevel=6)
+
+
+def decompress(codec: str, data: bytes) -> str:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed content")
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    if codec == 'gzip':
+        return gzip.decompress(data).decode('utf-8')
+    raise ValueError(f"Unknown content codec: {codec}")
+
+
+def make_summary(content: str, max_chars: Optional[int] = None) -> str:
+    """Leading paragraphs of the content, cut at a word boundary"""
+    max_chars = max_chars or get_content_store_settings()['summary_chars']
+    content = content.strip()
+    if len(content) <= max_chars:
+        return content
+    cut = content[:max_chars].rsplit(' ', 1)[0]
+    return cut.rstrip(' ,.;:') + '…'
+
+
+def get_collection():
+    return get_mongodb()[get_content_store_settings()['collection']]
+
+
+def build_document(article: Article, html: Optional[str] = None) -> Dict[str, Any]:
+    """Mongo document for an article; _id is the article id"""
+    codec, content = compress(article.content)
+    document = {
+        '_id': str(article.id),
+        'url': article.url,
+        'codec': codec,
+        'content': Binary(content),
+        'content_length': len(article.content),
+        'metadata': {
+            'title': article.title,
+            'author': article.author,
+            'published_at': article.published_at,
+            'language': article.language,
+            'word_count': article.word_count,
+            'source_id': article.source_id,
+        },
+        'stored_at': timezone.now(),
+    }
+    if html:
+        document['html'] = Binary(compress(html, codec)[1])
+    return document
+
+
+def offload_articles(articles: List[Article], include_html: bool = True) -> int:
+    """
+    Move the content of articles to Mongo and keep only summary and pointer in Postgres
+
+    Documents are written with one bulk upsert; Postgres rows are updated only after
+    Mongo acknowledged the write, so a failure leaves content inline.
+
+    Args:
+        articles: Articles with content loaded
+        include_html: Also store the raw HTML from the on-disk HTML cache, if present
+
+    Returns:
+        Number of articles offloaded
+    """
+    articles = [article for article in articles if article.content and not article.content_ref]
+    if not articles:
+        return 0
+
+    html_cache = None
+    if include_html:
+        from .extractors.html_cache import get_html_cache
+        html_cache = get_html_cache()
+
+    operations = []
+    for article in articles:
+        cached = html_cache.get(article.url) if html_cache else None
+        document = build_document(article, cached.body if cached else None)
+        operations.append(ReplaceOne({'_id': document['_id']}, document, upsert=True))
+
+    get_collection().bulk_write(operations, ordered=False)
+
+    for article in articles:
+        article.summary = make_summary(article.content)
+        article.content_ref = str(article.id)
+        article.content = ''
+
+    # bulk_update skips post_save, so the stored search vector keeps the full text
+    with transaction.atomic():
+        Article.objects.bulk_update(articles, ['content', 'summary', 'content_ref'])
+
+    logger.info(f"Offloaded content of {len(articles)} articles to Mongo")
+    return len(articles)
+
+
+def load_contents(refs: Iterable[str]) -> Dict[str, str]:
+    """Fetch and decompress the full text of offloaded articles in one query"""
+    refs = list(set(refs))
+    if not refs:
+        return {}
+
+    contents = {}
+    for document in get_collection().find({'_id': {'$in': refs}}, {'codec': 1, 'content': 1}):
+        contents[document['_id']] = decompress(document['codec'], document['content'])
+    return contents
+
+
+async def aload_contents(refs: Iterable[str]) -> Dict[str, str]:
+    """load_contents for async callers, over the pooled async client"""
+    from .document_store import get_document_store
+
+    refs = list(set(refs))
+    if not refs:
+        return {}
+
+    documents = await get_document_store().find(
+        get_content_store_settings()['collection'], {'_id': {'$in': refs}}, {'codec': 1, 'content': 1}
+    )
+    return {document['_id']: decompress(document['codec'], document['content']) for document in documents}
+
+
+def load_content(ref: str) -> str:
+    """
+    Full text of one offloaded article
+
+    Raises:
+        ContentNotFound: If the document is missing
+    """
+    contents = load_contents([ref])
+    if ref not in contents:
+        logger.error(f"Content document {ref} is missing")
+        raise ContentNotFound(f"Content document {ref} is missing")
+    return contents[ref]
+
+
+def _offloaded(articles: Iterable[Article]) -> List[Article]:
+    return [article for article in articles if article.content_ref and not article.content]
+
+
+def _set_full_text(offloaded: List[Article], contents: Dict[str, str]):
+    missing = [article for article in offloaded if article.content_ref not in contents]
+    if missing:
+        # Left unset, so full_text raises ContentNotFound for these
+        logger.error(f"Content documents missing for {len(missing)} articles: "
+                     f"{[str(article.id) for article in missing[:10]]}")
+    for article in offloaded:
+        if article.content_ref in contents:
+            article._full_text = contents[article.content_ref]
+
+
+def prefetch_full_text(articles: Iterable[Article]):
+    """Load the full text of offloaded articles in bulk, so full_text doesn't query per row"""
+    offloaded = _offloaded(articles)
+    _set_full_text(offloaded, load_contents(article.content_ref for article in offloaded))
+
+
+async def aprefetch_full_text(articles: Iterable[Article]):
+    """prefetch_full_text for async callers, over the pooled async client"""
+    offloaded = _offloaded(articles)
+    _set_full_text(offloaded, await aload_contents(article.content_ref for article in offloaded))
@@ -0,0 +1,302 @@
+"""
+Near-duplicate article detection
+
+Wire-service stories are republished by many Greek outlets with small edits (bylines,
+intros, related links), so URL uniqueness does not catch them. Each article gets a
+64-bit SimHash over word shingles of its normalized text. The fingerprint is split into
+six 10-11 bit bands: two fingerprints within Hamming distance 5 always share at least one
+band, so candidates are found with an indexed band overlap among recent articles and
+confirmed by distance.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import Counter, defaultdict
+from datetime import timedelta
+import hashlib
+import logging
+import re
+import unicodedata
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Article, AIAnalysis
+
+logger = logging.getLogger(__name__)
+
+
+FINGERPRINT_BITS = 64
+# Changing the bands requires re-fingerprinting stored articles
+BAND_WIDTHS = [11, 11, 11, 11, 10, 10]
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def get_dedup_settings() -> Dict[str, Any]:
+    config = getattr(settings, 'NEAR_DUPLICATES', {})
+    return {
+        'enabled': config.get('ENABLED', True),
+        'max_distance': min(config.get('MAX_DISTANCE', 5), len(BAND_WIDTHS) - 1),
+        'shingle_size': config.get('SHINGLE_SIZE', 3),
+        'min_words': config.get('MIN_WORDS', 50),
+        'window_days': config.get('WINDOW_DAYS', 14),
+        'max_candidates': config.get('MAX_CANDIDATES', 200),
+    }
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercase words with accents (Greek tonos/dialytika) stripped"""
+    decomposed = unicodedata.normalize('NFD', text)
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _WORD_RE.findall(stripped.casefold())
+
+
+def compute_simhash(text: str, shingle_size: int = 3) -> Optional[int]:
+    """
+    Unsigned 64-bit SimHash of the word shingles of text
+
+    Returns:
+        The fingerprint, or None when the text has no complete shingle
+    """
+    words = normalize_words(text)
+    if len(words) < shingle_size:
+        return None
+
+    shingles = Counter(
+        ' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)
+    )
+
+    weights = [0] * FINGERPRINT_BITS
+    for shingle, count in shingles.items():
+        value = int.from_bytes(
+            hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big'
+        )
+        for bit in range(FINGERPRINT_BITS):
+            if value >> bit & 1:
+                weights[bit] += count
+            else:
+                weights[bit] -= count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def band_keys(fingerprint: int) -> List[int]:
+    """Band values tagged with their position, so equal bits in different bands don't match"""
+    keys = []
+    offset = 0
+    for band, width in enumerate(BAND_WIDTHS):
+        keys.append((band << 16) | (fingerprint >> offset & ((1 << width) - 1)))
+        offset += width
+    return keys
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((a ^ b) & ((1 << FINGERPRINT_BITS) - 1)).count('1')
+
+
+def to_signed(fingerprint: int) -> int:
+    """Fit an unsigned fingerprint into a signed BIGINT column"""
+    return fingerprint - (1 << FINGERPRINT_BITS) if fingerprint >= 1 << (FINGERPRINT_BITS - 1) else fingerprint
+
+
+def to_unsigned(value: int) -> int:
+    return value & ((1 << FINGERPRINT_BITS) - 1)
+
+
+def fingerprint_article(content: str) -> Optional[Tuple[int, List[int]]]:
+    """
+    Fingerprint article content for storage on Article
+
+    Returns:
+        (signed simhash, band keys), or None for texts too short to fingerprint reliably
+    """
+    config = get_dedup_settings()
+    if not config['enabled'] or len(content.split()) < config['min_words']:
+        return None
+
+    fingerprint = compute_simhash(content, config['shingle_size'])
+    if fingerprint is None:
+        return None
+    return to_signed(fingerprint), band_keys(fingerprint)
+
+
+def _recent_canonicals(bands: List[int], window_days: int):
+    """Canonical articles of the last window_days sharing a band, newest first"""
+    # Newest first: when band collisions exceed the cap, recent stories are the likely matches
+    return Article.objects.filter(
+        simhash_bands__overlap=bands,
+        canonical_article__isnull=True,
+        created_at__gte=timezone.now() - timedelta(days=window_days)
+    ).order_by('-created_at')
+
+
+def _closest_match(
+    simhash: int,
+    candidates: Iterable[Tuple[int, Any]],
+    max_distance: int
+) -> Tuple[Optional[Any], int]:
+    """
+    Closest of (unsigned simhash, ref) candidates ordered newest first
+
+    Returns:
+        (ref, distance), or (None, max_distance + 1) when nothing is close enough
+    """
+    best = None
+    best_distance = max_distance + 1
+    for candidate_hash, ref in candidates:
+        distance = hamming_distance(simhash, candidate_hash)
+        # Later candidates are older, so they also win ties
+        if distance < best_distance or (best is not None and distance == best_distance):
+            best, best_distance = ref, distance
+    return best, best_distance
+
+
+def find_canonical_article(
+    simhash: int,
+    bands: List[int],
+    exclude_id: Optional[Any] = None
+) -> Optional[Article]:
+    """
+    Find the canonical article that a fingerprint is a near-duplicate of
+
+    Only canonical articles created within the last WINDOW_DAYS are candidates, so
+    duplicates always point one level up rather than forming chains and the lookup
+    stays bounded as the archive grows. The closest of the MAX_CANDIDATES newest
+    candidates wins, the oldest on ties.
+
+    Args:
+        simhash: Signed fingerprint as stored on Article
+        bands: Band keys of the fingerprint
+        exclude_id: Article to leave out (the article being checked)
+
+    Returns:
+        The canonical Article, or None
+    """
+    config = get_dedup_settings()
+    candidates = _recent_canonicals(bands, config['window_days'])
+    if exclude_id is not None:
+        candidates = candidates.exclude(id=exclude_id)
+    candidates = candidates.only('id', 'simhash', 'title', 'created_at')[:config['max_candidates']]
+
+    best, best_distance = _closest_match(
+        to_unsigned(simhash),
+        ((to_unsigned(candidate.simhash), candidate) for candidate in candidates),
+        config['max_distance']
+    )
+    if best is not None:
+        logger.info(f"Near-duplicate of article {best.id} (distance {best_distance})")
+    return best
+
+
+def find_canonical_articles(
+    fingerprints: List[Optional[Tuple[int, List[int]]]]
+) -> Tuple[Dict[int, Any], Dict[int, int]]:
+    """
+    Bulk find_canonical_article for a batch of new articles
+
+    Candidates for the whole batch are read in one query; each fingerprint is then
+    matched against its own MAX_CANDIDATES newest candidates with the same tie rule.
+    Fingerprints are matched in order and earlier ones of the batch count as the
+    newest candidates, so a story that appears twice links to its first occurrence.
+
+    Args:
+        fingerprints: fingerprint_article() results (None entries are skipped)
+
+    Returns:
+        (index -> id of an existing canonical article,
+         index -> index of an earlier fingerprint in the batch)
+    """
+    config = get_dedup_settings()
+    all_bands = {band for fingerprint in fingerprints if fingerprint for band in fingerprint[1]}
+
+    # band -> [(recency, unsigned simhash, ('article', id) or ('batch', index))];
+    # lower recency is newer
+    by_band = defaultdict(list)
+    if all_bands:
+        candidates = _recent_canonicals(list(all_bands), config['window_days'])
+        rows = candidates.values_list('id', 'simhash', 'simhash_bands')
+        for recency, (article_id, simhash, bands) in enumerate(rows.iterator(chunk_size=2000)):
+            for band in bands:
+                if band in all_bands:
+                    by_band[band].append((recency, to_unsigned(simhash), ('article', article_id)))
+
+    existing: Dict[int, Any] = {}
+    within: Dict[int, int] = {}
+    for index, fingerprint in enumerate(fingerprints):
+        if not fingerprint:
+            continue
+        simhash = to_unsigned(fingerprint[0])
+
+        # A candidate sharing several bands is listed once
+        candidates = {
+            ref: (recency, candidate_hash)
+            for band in fingerprint[1]
+            for recency, candidate_hash, ref in by_band.get(band, ())
+        }
+        newest = sorted(candidates.items(), key=lambda item: item[1][0])[:config['max_candidates']]
+        best, _ = _closest_match(
+            simhash,
+            ((candidate_hash, ref) for ref, (_, candidate_hash) in newest),
+            config['max_distance']
+        )
+
+        if best is None:
+            # Batch articles are newer than stored ones, later ones newest
+            for band in fingerprint[1]:
+                by_band[band].append((-1 - index, simhash, ('batch', index)))
+        elif best[0] == 'article':
+            existing[index] = best[1]
+        else:
+            within[index] = best[1]
+
+    if existing or within:
+        logger.info(f"Found {len(existing) + len(within)} near-duplicates in a batch of {len(fingerprints)}")
+    return existing, within
+
+
+def reuse_canonical_analyses(article: Article, analysis_types: List[str]) -> List[str]:
+    """
+    Copy the canonical article's analyses of the given types onto a duplicate
+
+    Args:
+        article: A duplicate article (canonical_article set)
+        analysis_types: Analysis types wanted
+
+    Returns:
+        The analysis types that were copied
+    """
+    if not article.canonical_article_id:
+        return []
+
+    analyses = [
+        AIAnalysis(
+            article=article,
+            analysis_type=analysis.analysis_type,
+            result=analysis.result,
+            model_used=analysis.model_used,
+            processing_time=0
+        )
+        for analysis in AIAnalysis.objects.filter(
+            article_id=article.canonical_article_id,
+            analysis_type__in=analysis_types
+        )
+    ]
+    if not analyses:
+        return []
+
+    AIAnalysis.objects.bulk_create(
+        analyses,
+        update_conflicts=True,
+        unique_fields=['article', 'analysis_type'],
+        update_fields=['result', 'model_used', 'processing_time', 'updated_at']
+    )
+    if not article.is_enriched:
+        article.is_enriched = True
+        article.save(update_fields=['is_enriched', 'updated_at'])
+
+    logger.info(f"Reused {len(analyses)} analyses of article {article.canonical_article_id} "
+                f"for duplicate {article.id}")
+    return [analysis.analysis_type for analysis in analyses]
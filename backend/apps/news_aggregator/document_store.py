@@ -0,0 +1,237 @@
+"""
+Async MongoDB document store
+Keeps one pooled AsyncMongoClient per event loop, buffers single-document inserts into
+insert_many batches flushed by size or interval, and ensures indexes once at startup,
+so document I/O from concurrent coroutines never blocks the event loop.
+"""
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+import asyncio
+import logging
+import weakref
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from django.conf import settings
+from pymongo import ASCENDING, DESCENDING, AsyncMongoClient, IndexModel
+from pymongo.errors import BulkWriteError, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+
+def get_mongo_settings() -> Dict[str, Any]:
+    config = getattr(settings, 'MONGO_CONFIG', {})
+    return {
+        'connection_string': config.get('connection_string'),
+        'database': config.get('database'),
+        'max_pool_size': config.get('max_pool_size', 50),
+        'min_pool_size': config.get('min_pool_size', 0),
+        'write_batch_size': config.get('write_batch_size', 500),
+        'flush_interval': config.get('flush_interval', 1.0),
+    }
+
+
+# Indexes ensured at startup, per collection
+INDEXES: Dict[str, List[IndexModel]] = {
+    'article_documents': [
+        IndexModel([('url', ASCENDING)], name='url'),
+        IndexModel([('stored_at', DESCENDING)], name='stored_at'),
+    ],
+}
+
+
+def document_id(value: str) -> Any:
+    """ObjectId for ids that look like one, the string itself otherwise"""
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        return value
+
+
+class BufferedWriter:
+    """
+    Collects documents for one collection and writes them with insert_many
+
+    A batch is written as soon as it reaches batch_size, otherwise flush_interval after
+    its first document. Failed batches are kept for the next flush up to ten batches;
+    beyond that the oldest documents are dropped and logged.
+    """
+
+    def __init__(self, collection, batch_size: int, flush_interval: float):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Dict[str, Any]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    async def add(self, document: Dict[str, Any]):
+        self._buffer.append(document)
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Write everything buffered; returns the number of documents inserted"""
+        async with self._lock:
+            if not self._buffer:
+                return 0
+            batch, self._buffer = self._buffer, []
+
+            try:
+                result = await self.collection.insert_many(batch, ordered=False)
+                return len(result.inserted_ids)
+            except BulkWriteError as e:
+                # Duplicates and other per-document errors don't block the rest of the batch
+                inserted = e.details.get('nInserted', 0)
+                logger.warning(f"Bulk insert into {self.collection.name}: {inserted} inserted, "
+                               f"{len(e.details.get('writeErrors', []))} failed")
+                return inserted
+            except PyMongoError as e:
+                logger.error(f"Bulk insert of {len(batch)} documents into {self.collection.name} failed: {e}")
+                self._buffer = batch + self._buffer
+                overflow = len(self._buffer) - self.batch_size * 10
+                if overflow > 0:
+                    logger.error(f"Dropping {overflow} buffered documents for {self.collection.name}")
+                    self._buffer = self._buffer[overflow:]
+                return 0
+
+    async def aclose(self):
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        await self.flush()
+
+
+@dataclass
+class _LoopState:
+    client: AsyncMongoClient
+    writers: Dict[str, BufferedWriter] = field(default_factory=dict)
+
+
+class AsyncDocumentStore:
+    """Async document API over pooled AsyncMongoClient instances, one per event loop"""
+
+    def __init__(self):
+        # Clients are bound to the loop they were created on, so keep them per loop
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._indexes_ensured = False
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            config = get_mongo_settings()
+            state = _LoopState(client=AsyncMongoClient(
+                config['connection_string'],
+                maxPoolSize=config['max_pool_size'],
+                minPoolSize=config['min_pool_size'],
+                serverSelectionTimeoutMS=5000
+            ))
+            self._states[loop] = state
+            logger.debug("Created pooled MongoDB client")
+        return state
+
+    def database(self):
+        return self._state().client[get_mongo_settings()['database']]
+
+    def collection(self, name: str):
+        return self.database()[name]
+
+    async def insert(self, collection_name: str, document: Dict[str, Any]):
+        """Queue a document for the next batched insert of its collection"""
+        state = self._state()
+        writer = state.writers.get(collection_name)
+        if writer is None:
+            config = get_mongo_settings()
+            writer = BufferedWriter(
+                self.collection(collection_name), config['write_batch_size'], config['flush_interval']
+            )
+            state.writers[collection_name] = writer
+        await writer.add(document)
+
+    async def insert_many(self, collection_name: str, documents: List[Dict[str, Any]]) -> List[Any]:
+        """Insert documents right away in one unordered batch"""
+        if not documents:
+            return []
+        result = await self.collection(collection_name).insert_many(documents, ordered=False)
+        return result.inserted_ids
+
+    async def bulk_write(self, collection_name: str, operations: List[Any]):
+        if not operations:
+            return None
+        return await self.collection(collection_name).bulk_write(operations, ordered=False)
+
+    async def get(self, collection_name: str, doc_id: str, projection: Optional[Dict[str, int]] = None):
+        return await self.collection(collection_name).find_one({'_id': document_id(doc_id)}, projection)
+
+    async def find(self, collection_name: str, query: Dict[str, Any], projection: Optional[Dict[str, int]] = None):
+        return await self.collection(collection_name).find(query, projection).to_list(None)
+
+    async def ensure_indexes(self):
+        """Create the indexes in INDEXES once per process"""
+        if self._indexes_ensured:
+            return
+        for collection_name, indexes in INDEXES.items():
+            await self.collection(collection_name).create_indexes(indexes)
+        self._indexes_ensured = True
+        logger.info(f"MongoDB indexes ensured for {len(INDEXES)} collections")
+
+    async def flush(self):
+        """Write all buffered documents of the running loop"""
+        state = self._states.get(asyncio.get_running_loop())
+        if state is not None:
+            for writer in list(state.writers.values()):
+                await writer.flush()
+
+    async def aclose(self):
+        """Flush buffered documents and close the client of the running loop"""
+        state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is None:
+            return
+        for writer in state.writers.values():
+            await writer.aclose()
+        await state.client.close()
+
+    def close(self, timeout: float = 10.0):
+        """
+        Flush and close from outside an event loop (worker shutdown hooks)
+
+        Stores on loops running in other threads are closed there and waited for;
+        stores of stopped loops are dropped.
+        """
+        for loop in list(self._states.keys()):
+            if loop.is_closed():
+                continue
+            if loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(self.aclose(), loop)
+                try:
+                    future.result(timeout)
+                except Exception as e:
+                    logger.warning(f"Error closing MongoDB document store: {e}")
+            else:
+                loop.run_until_complete(self.aclose())
+        self._states.clear()
+
+
+_document_store = AsyncDocumentStore()
+
+
+def get_document_store() -> AsyncDocumentStore:
+    """Get the process-wide async document store"""
+    return _document_store
+
+
+def close_document_store():
+    """Flush and close all document store clients, for use in shutdown hooks"""
+    _document_store.close()
@@ -2,10 +2,8 @@
 Enhanced article extraction module for Django
 Uses trafilatura with Selenium fallback for JavaScript-heavy sites
 """
-import trafilatura
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Iterable
 import logging
-from datetime import datetime
 from urllib.parse import urlparse
 import httpx
 from bs4 import BeautifulSoup
@@ -17,6 +15,12 @@ import platform
 from django.conf import settings
 from django.utils import timezone
 
+from ..http_pool import get_http_client
+from .crawler import CrawlScheduler
+from .parsing import get_parse_executor, parse_article_html
+from .browser_pool import BrowserUnavailable, get_browser_pool
+from .html_cache import CachedPage, get_html_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,139 +50,92 @@ class ArticleExtractor:
                 logger.error(f"Failed to fetch HTML from {url}")
                 return None
             
-            # Try trafilatura first
-            result = self._extract_with_trafilatura(html, url)
-            
-            # Fallback to BeautifulSoup if needed
-            if not result or not result.get('content'):
-                logger.info(f"Trafilatura failed for {url}, trying BeautifulSoup")
-                result = self._extract_with_beautifulsoup(html, url)
-            
-            # Add metadata
-            if result:
-                result['url'] = url
-                result['extracted_at'] = timezone.now()
-                result['domain'] = urlparse(url).netloc
-            
-            return result
+            return await self._parse_html(html, url)
             
         except Exception as e:
             logger.error(f"Error extracting article from {url}: {str(e)}")
             return None
     
-    async def _fetch_html(self, url: str) -> Optional[str]:
-        """Fetch HTML content from URL"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(url, headers=self.headers, follow_redirects=True)
-                response.raise_for_status()
-                return response.text
-            except Exception as e:
-                logger.error(f"Error fetching {url}: {str(e)}")
-                return None
-    
-    def _extract_with_trafilatura(self, html: str, url: str) -> Optional[Dict[str, Any]]:
-        """Extract using trafilatura"""
-        try:
-            # Extract metadata
-            metadata = trafilatura.extract_metadata(html, default_url=url)
-            
-            # Extract content
-            content = trafilatura.extract(
-                html,
-                url=url,
-                include_comments=False,
-                include_tables=True,
-                include_images=False,
-                favor_precision=True,
-                target_language='el'
-            )
-            
-            if not content:
-                return None
-            
-            # Build result
-            result = {
-                'content': content,
-                'title': metadata.title if metadata else '',
-                'author': metadata.author if metadata else '',
-                'published_at': None
-            }
-            
-            # Parse date if available
-            if metadata and metadata.date:
-                try:
-                    result['published_at'] = datetime.fromisoformat(metadata.date)
-                except:
-                    pass
-            
-            return result
+    async def extract_many(self, urls: Iterable[str], **scheduler_options) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Extract many articles concurrently with per-domain politeness limits
+        
+        Args:
+            urls: Article URLs
+            **scheduler_options: Overrides for CrawlScheduler (e.g. per_domain_concurrency)
             
-        except Exception as e:
-            logger.error(f"Trafilatura extraction error: {str(e)}")
-            return None
+        Returns:
+            Dictionary mapping each URL to its article data or None if extraction failed
+        """
+        scheduler = CrawlScheduler(**scheduler_options)
+        results = {}
+        
+        async for crawl_result in scheduler.crawl(urls, self._fetch_html, self._parse_html):
+            if not crawl_result.success:
+                logger.warning(f"Extraction failed for {crawl_result.url}: {crawl_result.error}")
+            results[crawl_result.url] = crawl_result.data
+        
+        return results
+    
+    async def _parse_html(self, html: str, url: str) -> Optional[Dict[str, Any]]:
+        """Turn fetched HTML into article data in the parse process pool"""
+        result = await get_parse_executor().run(parse_article_html, html, url)
+        
+        # Add metadata
+        if result:
+            result['url'] = url
+            result['extracted_at'] = timezone.now()
+            result['domain'] = urlparse(url).netloc
+        
+        return result
     
-    def _extract_with_beautifulsoup(self, html: str, url: str) -> Optional[Dict[str, Any]]:
-        """Fallback extraction using BeautifulSoup"""
+    async def _fetch_html(self, url: str) -> Optional[str]:
+        """
+        Fetch HTML content from URL over the shared connection pool
+        
+        Fresh pages come from the on-disk HTML cache without a request; stale ones are
+        revalidated with a conditional GET. In offline mode only the cache is used.
+        """
+        loop = asyncio.get_running_loop()
+        html_cache = get_html_cache()
+        cached = await loop.run_in_executor(None, html_cache.get, url) if html_cache else None
+        
+        if cached and (html_cache.offline or html_cache.is_fresh(cached)):
+            logger.info(f"Using cached HTML for {url}")
+            return cached.body
+        if html_cache and html_cache.offline:
+            logger.error(f"No cached HTML for {url} in offline mode")
+            return None
+        
+        headers = {**self.headers, **cached.conditional_headers()} if cached else self.headers
+        client = get_http_client('extractor', timeout=self.timeout)
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Remove script and style elements
-            for element in soup(['script', 'style', 'nav', 'header', 'footer']):
-                element.decompose()
-            
-            # Try to find title
-            title = ''
-            title_tag = soup.find('h1') or soup.find('title')
-            if title_tag:
-                title = title_tag.get_text(strip=True)
-            
-            # Try to find author
-            author = ''
-            author_meta = soup.find('meta', attrs={'name': 'author'})
-            if author_meta:
-                author = author_meta.get('content', '')
-            
-            # Extract main content
-            content = ''
-            
-            # Common article containers
-            article_selectors = [
-                'article',
-                '[role="main"]',
-                '.article-content',
-                '.post-content',
-                '.entry-content',
-                '#content',
-                'main'
-            ]
-            
-            for selector in article_selectors:
-                container = soup.select_one(selector)
-                if container:
-                    # Get all paragraphs
-                    paragraphs = container.find_all('p')
-                    if paragraphs:
-                        content = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                        break
-            
-            # Fallback to all paragraphs
-            if not content:
-                all_paragraphs = soup.find_all('p')
-                content = '\n\n'.join([p.get_text(strip=True) for p in all_paragraphs if len(p.get_text(strip=True)) > 50])
-            
-            if not content:
-                return None
-            
-            return {
-                'title': title,
-                'content': content,
-                'author': author,
-                'published_at': None
-            }
-            
+            response = await client.get(url, headers=headers, follow_redirects=True)
+            
+            if response.status_code == 304 and cached:
+                logger.info(f"HTML not modified for {url}")
+                await loop.run_in_executor(None, html_cache.touch, cached)
+                return cached.body
+            
+            response.raise_for_status()
+            
+            if html_cache:
+                page = CachedPage(
+                    url=url,
+                    body=response.text,
+                    fetched_at=time.time(),
+                    etag=response.headers.get('etag'),
+                    last_modified=response.headers.get('last-modified')
+                )
+                await loop.run_in_executor(None, html_cache.put, page)
+            
+            return response.text
         except Exception as e:
-            logger.error(f"BeautifulSoup extraction error: {str(e)}")
+            logger.error(f"Error fetching {url}: {str(e)}")
+            # A stale copy is better than failing the extraction
+            if cached:
+                logger.warning(f"Using stale cached HTML for {url}")
+                return cached.body
             return None
 
 
@@ -259,10 +216,8 @@ class EnhancedArticleExtractor(ArticleExtractor):
     
     def __init__(self):
         super().__init__()
-        self.driver = None
+        # Browsers are leased from the shared pool per page, none are started here
         self.selenium_available = self._check_selenium_available()
-        if self.selenium_available:
-            self._setup_driver()
     
     def _check_selenium_available(self) -> bool:
         """Check if Selenium is available and configured"""
@@ -274,35 +229,34 @@ class EnhancedArticleExtractor(ArticleExtractor):
             logger.warning("Selenium not available, falling back to basic extraction")
             return False
     
-    def _setup_driver(self):
-        """Setup Chrome WebDriver with appropriate options"""
-        try:
-            # Try undetected-chromedriver first (better for macOS security)
-            try:
-                self.driver = setup_undetected_chrome()
-                logger.info("Undetected WebDriver initialized successfully")
-            except:
-                # Fallback to regular setup
-                self.driver = setup_regular_chrome()
-                logger.info("Regular WebDriver initialized successfully")
-        except Exception as e:
-            logger.warning(f"Could not initialize WebDriver: {e}")
-            self.driver = None
-    
     async def extract(self, url: str) -> Optional[Dict[str, Any]]:
         """
         Extract article with enhanced Selenium fallback for JS sites
         """
         # First try regular extraction
         result = await super().extract(url)
+        return await self._with_selenium_fallback(url, result)
+    
+    async def extract_many(self, urls: Iterable[str], **scheduler_options) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Extract many articles, rendering JS sites in parallel on pooled browsers
+        """
+        results = await super().extract_many(urls, **scheduler_options)
         
+        fallbacks = await asyncio.gather(*[
+            self._with_selenium_fallback(url, result) for url, result in results.items()
+        ])
+        return dict(zip(results.keys(), fallbacks))
+    
+    async def _with_selenium_fallback(self, url: str, result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Re-extract with a real browser when basic extraction found too little content"""
         # Check if we got meaningful content
         if result and result.get('content') and len(result['content']) > 100:
             logger.info(f"Basic extraction successful for {url}")
             return result
         
         # If failed or insufficient content and URL requires JS, try Selenium
-        if self.selenium_available and self.driver and self._requires_javascript(url):
+        if self.selenium_available and self._requires_javascript(url):
             logger.info(f"Trying enhanced Selenium extraction for {url}")
             result = await self._extract_with_selenium(url)
         
@@ -322,45 +276,49 @@ class EnhancedArticleExtractor(ArticleExtractor):
         return any(site in domain for site in js_sites)
     
     async def _extract_with_selenium(self, url: str) -> Optional[Dict[str, Any]]:
-        """Extract using Selenium in a thread pool"""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._selenium_extract_sync, url)
+        """Extract using a browser leased from the shared pool"""
+        try:
+            return await get_browser_pool().run(self._selenium_extract_sync, url)
+        except BrowserUnavailable as e:
+            logger.warning(f"No browser available for {url}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error extracting with Selenium: {e}")
+            return None
     
-    def _selenium_extract_sync(self, url: str, wait_time: int = 5) -> Optional[Dict[str, Any]]:
+    def _selenium_extract_sync(self, driver, url: str, wait_time: int = 10) -> Optional[Dict[str, Any]]:
         """
         Synchronous Selenium extraction with enhanced Greek news site support
         Migrated from legacy EnhancedExtractor with full functionality
+        
+        WebDriver errors propagate so the pool can replace a crashed browser.
         """
-        if not self.driver:
-            logger.error("WebDriver not available")
-            return None
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.common.by import By
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        
+        logger.info(f"Loading URL with JavaScript: {url}")
+        driver.get(url)
+        
+        # Wait for rendered content instead of sleeping a fixed time
+        if 'amna.gr' in url:
+            # Angular fills ng-bind-html elements after the document has loaded
+            logger.info("Detected AMNA site, waiting for Angular...")
+            content_locator = (By.CSS_SELECTOR, "[ng-bind-html], .article-body, .content")
+        else:
+            content_locator = (By.CSS_SELECTOR, "article p, .article-content, .article-body, .content p")
+        
+        try:
+            wait = WebDriverWait(driver, wait_time)
+            wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+            wait.until(EC.presence_of_element_located(content_locator))
+        except TimeoutException as e:
+            logger.debug(f"Content wait timed out, continuing: {e}")
         
         try:
-            logger.info(f"Loading URL with JavaScript: {url}")
-            self.driver.get(url)
-            
-            # Enhanced waiting logic for Angular/JavaScript sites
-            if 'amna.gr' in url:
-                logger.info("Detected AMNA site, waiting for Angular...")
-                time.sleep(wait_time + 3)  # Extra time for Angular
-                
-                # Try to wait for specific Angular elements
-                try:
-                    from selenium.webdriver.support.ui import WebDriverWait
-                    from selenium.webdriver.support import expected_conditions as EC
-                    from selenium.webdriver.common.by import By
-                    
-                    # Wait for any ng-binding or article element
-                    wait = WebDriverWait(self.driver, 10)
-                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "[ng-bind-html], .article-body, .content")))
-                except Exception as e:
-                    logger.debug(f"Angular wait failed, continuing: {e}")
-                    pass
-            else:
-                time.sleep(wait_time)
-            
             # Get page source after JS execution
-            page_source = self.driver.page_source
+            page_source = driver.page_source
             
             # Parse with BeautifulSoup
             soup = BeautifulSoup(page_source, 'html.parser')
@@ -455,7 +413,7 @@ class EnhancedArticleExtractor(ArticleExtractor):
             content = re.sub(r'(Διαβάστε επίσης|Περισσότερα|Αναλυτικά|Δείτε όλα|Περισσότερες πληροφορίες).*?$', '', content, flags=re.MULTILINE)
             
             # Use found title if better than page title
-            page_title = self.driver.title
+            page_title = driver.title
             if title_found and (not page_title or "Αθηναϊκό - Μακεδονικό πρακτορείο ειδήσεων" in page_title):
                 title = title_found
             else:
@@ -480,20 +438,12 @@ class EnhancedArticleExtractor(ArticleExtractor):
             logger.info(f"Selenium extraction successful: {len(content)} characters")
             return result
             
+        except WebDriverException:
+            raise
         except Exception as e:
             logger.error(f"Error extracting with Selenium: {e}")
             return None
     
     def close(self):
-        """Close the WebDriver"""
-        if self.driver:
-            try:
-                self.driver.quit()
-                logger.info("WebDriver closed")
-            except:
-                pass
-            self.driver = None
-    
-    def __del__(self):
-        """Cleanup WebDriver on object destruction"""
-        self.close()
\ No newline at end of file
+        """Kept for callers; browsers belong to the shared pool and are returned per page"""
+        pass
\ No newline at end of file
@@ -0,0 +1,245 @@
+"""
+Pool of headless Chrome drivers for JavaScript-heavy sites
+Drivers are started on demand up to a fixed size, leased to one page load at a time,
+health-checked before reuse, recycled after a number of pages to bound memory growth,
+and replaced when they crash.
+"""
+from typing import Any, Callable, Dict, List, Optional
+from contextlib import contextmanager
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_browser_pool_settings() -> Dict[str, Any]:
+    config = getattr(settings, 'BROWSER_POOL', {})
+    return {
+        'size': config.get('SIZE', 2),
+        'max_pages_per_driver': config.get('MAX_PAGES_PER_DRIVER', 50),
+        'page_load_timeout': config.get('PAGE_LOAD_TIMEOUT', 30),
+        'lease_timeout': config.get('LEASE_TIMEOUT', 120),
+    }
+
+
+def create_chrome_driver():
+    """Start a headless Chrome, preferring undetected-chromedriver"""
+    from .article import setup_undetected_chrome, setup_regular_chrome
+
+    try:
+        # Try undetected-chromedriver first (better for macOS security)
+        return setup_undetected_chrome()
+    except Exception:
+        # Fallback to regular setup
+        return setup_regular_chrome()
+
+
+class BrowserUnavailable(Exception):
+    """No driver could be leased or started"""
+
+
+class _PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.monotonic()
+
+
+class BrowserPool:
+    """Bounded pool of WebDriver instances with lease/return semantics"""
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_pages_per_driver: Optional[int] = None,
+        page_load_timeout: Optional[int] = None,
+        lease_timeout: Optional[float] = None,
+        driver_factory: Callable[[], Any] = create_chrome_driver
+    ):
+        config = get_browser_pool_settings()
+        self.size = size or config['size']
+        self.max_pages_per_driver = max_pages_per_driver or config['max_pages_per_driver']
+        self.page_load_timeout = page_load_timeout or config['page_load_timeout']
+        self.lease_timeout = lease_timeout or config['lease_timeout']
+        self.driver_factory = driver_factory
+
+        self._idle: List[_PooledDriver] = []
+        self._total = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        # Selenium is blocking; page loads run on threads dedicated to the pool
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.size, thread_name_prefix='browser-pool'
+        )
+
+    def warm(self, count: Optional[int] = None):
+        """Start drivers ahead of the first page load"""
+        started = []
+        for _ in range(min(count or self.size, self.size)):
+            try:
+                started.append(self._acquire())
+            except BrowserUnavailable as e:
+                logger.warning(f"Could not warm browser pool: {e}")
+                break
+        for pooled in started:
+            self._release(pooled)
+
+    @contextmanager
+    def lease(self):
+        """
+        Lease a healthy driver for one page load
+
+        Drivers that raise a WebDriver error while leased are discarded instead of
+        being returned, so the next lease gets a fresh browser.
+        """
+        pooled = self._acquire()
+        try:
+            yield pooled.driver
+        except Exception as e:
+            if _is_driver_error(e):
+                logger.warning(f"Discarding crashed browser: {e}")
+                self._discard(pooled)
+                pooled = None
+            raise
+        finally:
+            if pooled is not None:
+                pooled.pages += 1
+                self._release(pooled)
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run fn(driver, *args) on a leased driver without blocking the event loop"""
+        def run_with_driver():
+            with self.lease() as driver:
+                return fn(driver, *args)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, run_with_driver)
+
+    def _acquire(self) -> _PooledDriver:
+        deadline = time.monotonic() + self.lease_timeout
+
+        while True:
+            pooled = None
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise BrowserUnavailable("Browser pool is shut down")
+                    if self._idle:
+                        pooled = self._idle.pop()
+                        break
+                    if self._total < self.size:
+                        # Reserve the slot, then start Chrome outside the lock
+                        self._total += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise BrowserUnavailable(f"No browser free within {self.lease_timeout}s")
+                    self._condition.wait(remaining)
+
+            if pooled is None:
+                break
+            # Health-check outside the lock, a hung browser must not block other leases
+            if self._is_healthy(pooled):
+                return pooled
+            self._discard(pooled)
+
+        try:
+            driver = self.driver_factory()
+            driver.set_page_load_timeout(self.page_load_timeout)
+        except Exception as e:
+            with self._condition:
+                self._total -= 1
+                self._condition.notify()
+            raise BrowserUnavailable(f"Could not start browser: {e}")
+
+        logger.info(f"Started pooled browser ({self._total}/{self.size})")
+        return _PooledDriver(driver)
+
+    def _release(self, pooled: _PooledDriver):
+        if pooled.pages >= self.max_pages_per_driver:
+            logger.info(f"Recycling browser after {pooled.pages} pages")
+            self._discard(pooled)
+            return
+
+        with self._condition:
+            if self._closed:
+                self._total -= 1
+                self._quit(pooled)
+            else:
+                self._idle.append(pooled)
+            self._condition.notify()
+
+    def _discard(self, pooled: _PooledDriver):
+        self._quit(pooled)
+        with self._condition:
+            self._total -= 1
+            self._condition.notify()
+
+    def _is_healthy(self, pooled: _PooledDriver) -> bool:
+        """Cheap round-trip to the browser; fails if Chrome died or hung up"""
+        try:
+            pooled.driver.execute_script('return 1')
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled browser failed health check: {e}")
+            return False
+
+    def _quit(self, pooled: _PooledDriver):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    def shutdown(self):
+        """Quit all idle drivers; leased drivers are quit when returned"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._condition.notify_all()
+
+        for pooled in idle:
+            self._quit(pooled)
+        self._executor.shutdown(wait=False)
+
+
+def _is_driver_error(error: Exception) -> bool:
+    try:
+        from selenium.common.exceptions import WebDriverException
+    except ImportError:
+        return False
+    return isinstance(error, WebDriverException)
+
+
+_browser_pool: Optional[BrowserPool] = None
+_browser_pool_pid: Optional[int] = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get or create the process-wide browser pool"""
+    global _browser_pool, _browser_pool_pid
+    with _browser_pool_lock:
+        # Forked children must not share their parent's Chrome processes
+        if _browser_pool is None or _browser_pool_pid != os.getpid():
+            _browser_pool = BrowserPool()
+            _browser_pool_pid = os.getpid()
+            atexit.register(_browser_pool.shutdown)
+        return _browser_pool
+
+
+def shutdown_browser_pool():
+    """Quit the pooled browsers of this process, if any were started"""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is not None and _browser_pool_pid == os.getpid():
+            _browser_pool.shutdown()
+        _browser_pool = None
@@ -0,0 +1,147 @@
+"""
+On-disk cache of fetched article HTML
+Stores the compressed body with its ETag/Last-Modified validators and fetch time, so
+retries and re-extraction can skip the network (fresh entries) or revalidate with a
+conditional GET (stale entries), and extractor changes can be replayed offline
+against real pages.
+"""
+from typing import Any, Dict, Optional
+from dataclasses import dataclass, asdict
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_html_cache_settings() -> Dict[str, Any]:
+    config = getattr(settings, 'HTML_CACHE', {})
+    return {
+        'enabled': config.get('ENABLED', True),
+        'directory': Path(config.get('DIR') or Path(settings.BASE_DIR) / 'data' / 'html_cache'),
+        'fresh_seconds': config.get('FRESH_SECONDS', 3600),
+        'max_age_days': config.get('MAX_AGE_DAYS', 30),
+        'offline': config.get('OFFLINE', False),
+    }
+
+
+@dataclass
+class CachedPage:
+    """A fetched page and the validators needed to revalidate it"""
+    url: str
+    body: str
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for revalidation"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HTMLCache:
+    """Gzip-compressed pages keyed by URL hash, sharded into subdirectories"""
+
+    def __init__(self, directory: Optional[Path] = None):
+        config = get_html_cache_settings()
+        self.directory = Path(directory or config['directory'])
+        self.fresh_seconds = config['fresh_seconds']
+        self.max_age_days = config['max_age_days']
+        self.offline = config['offline']
+
+    def path_for(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json.gz"
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Load the cached page for url, or None"""
+        path = self.path_for(url)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable HTML cache entry for {url}: {e}")
+            self._remove(path)
+            return None
+
+        # Guard against (unlikely) hash collisions
+        if data.get('url') != url:
+            return None
+        return CachedPage(**data)
+
+    def put(self, page: CachedPage):
+        """Store a page atomically"""
+        path = self.path_for(page.url)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                    f.write(json.dumps(asdict(page), ensure_ascii=False).encode('utf-8'))
+                os.replace(tmp_path, path)
+            except BaseException:
+                self._remove(Path(tmp_path))
+                raise
+        except OSError as e:
+            # Caching is an optimization; a full or read-only disk must not fail extraction
+            logger.warning(f"Failed to cache HTML for {page.url}: {e}")
+
+    def touch(self, page: CachedPage):
+        """Record a successful revalidation (304 Not Modified)"""
+        page.fetched_at = time.time()
+        self.put(page)
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        return page.age() < self.fresh_seconds
+
+    def prune(self, max_age_days: Optional[int] = None) -> int:
+        """Delete entries older than max_age_days; returns the number removed"""
+        cutoff = time.time() - (max_age_days or self.max_age_days) * 24 * 3600
+        removed = 0
+        if not self.directory.exists():
+            return 0
+
+        for path in self.directory.glob('*/*.json.gz'):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def _remove(self, path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+_html_cache: Optional[HTMLCache] = None
+
+
+def get_html_cache() -> Optional[HTMLCache]:
+    """Get the HTML cache, or None when disabled in settings"""
+    global _html_cache
+    if not get_html_cache_settings()['enabled']:
+        return None
+    if _html_cache is None:
+        _html_cache = HTMLCache()
+    return _html_cache
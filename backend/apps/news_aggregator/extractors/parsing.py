@@ -0,0 +1,236 @@
+"""
+CPU-bound article parsing in a process pool
+trafilatura and BeautifulSoup parsing takes tens to hundreds of milliseconds per page
+and holds the GIL, so it runs in worker processes instead of on the event loop. The
+parse functions here are module-level (picklable) and must not depend on Django.
+"""
+from typing import Any, Callable, Dict, Optional
+from datetime import datetime
+import asyncio
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import threading
+
+import trafilatura
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+
+def extract_with_trafilatura(html: str, url: str) -> Optional[Dict[str, Any]]:
+    """Extract using trafilatura"""
+    try:
+        # Extract metadata
+        metadata = trafilatura.extract_metadata(html, default_url=url)
+
+        # Extract content
+        content = trafilatura.extract(
+            html,
+            url=url,
+            include_comments=False,
+            include_tables=True,
+            include_images=False,
+            favor_precision=True,
+            target_language='el'
+        )
+
+        if not content:
+            return None
+
+        # Build result
+        result = {
+            'content': content,
+            'title': metadata.title if metadata else '',
+            'author': metadata.author if metadata else '',
+            'published_at': None
+        }
+
+        # Parse date if available
+        if metadata and metadata.date:
+            try:
+                result['published_at'] = datetime.fromisoformat(metadata.date)
+            except:
+                pass
+
+        return result
+
+    except Exception as e:
+        logger.error(f"Trafilatura extraction error: {str(e)}")
+        return None
+
+
+def extract_with_beautifulsoup(html: str, url: str) -> Optional[Dict[str, Any]]:
+    """Fallback extraction using BeautifulSoup"""
+    try:
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Remove script and style elements
+        for element in soup(['script', 'style', 'nav', 'header', 'footer']):
+            element.decompose()
+
+        # Try to find title
+        title = ''
+        title_tag = soup.find('h1') or soup.find('title')
+        if title_tag:
+            title = title_tag.get_text(strip=True)
+
+        # Try to find author
+        author = ''
+        author_meta = soup.find('meta', attrs={'name': 'author'})
+        if author_meta:
+            author = author_meta.get('content', '')
+
+        # Extract main content
+        content = ''
+
+        # Common article containers
+        article_selectors = [
+            'article',
+            '[role="main"]',
+            '.article-content',
+            '.post-content',
+            '.entry-content',
+            '#content',
+            'main'
+        ]
+
+        for selector in article_selectors:
+            container = soup.select_one(selector)
+            if container:
+                # Get all paragraphs
+                paragraphs = container.find_all('p')
+                if paragraphs:
+                    content = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+                    break
+
+        # Fallback to all paragraphs
+        if not content:
+            all_paragraphs = soup.find_all('p')
+            content = '\n\n'.join([p.get_text(strip=True) for p in all_paragraphs if len(p.get_text(strip=True)) > 50])
+
+        if not content:
+            return None
+
+        return {
+            'title': title,
+            'content': content,
+            'author': author,
+            'published_at': None
+        }
+
+    except Exception as e:
+        logger.error(f"BeautifulSoup extraction error: {str(e)}")
+        return None
+
+
+def parse_article_html(html: str, url: str) -> Optional[Dict[str, Any]]:
+    """Extract article fields with trafilatura, falling back to BeautifulSoup"""
+    result = extract_with_trafilatura(html, url)
+
+    if not result or not result.get('content'):
+        logger.info(f"Trafilatura failed for {url}, trying BeautifulSoup")
+        result = extract_with_beautifulsoup(html, url)
+
+    return result
+
+
+_WARMUP_HTML = (
+    '<html><head><title>Τίτλος</title></head><body><article>'
+    '<p>Θέρμανση του parser πριν από τα πραγματικά άρθρα, ώστε η πρώτη σελίδα να μην πληρώνει το κόστος.</p>'
+    '</article></body></html>'
+)
+
+
+def warm_worker():
+    """Process pool initializer: import and exercise the parsers once"""
+    import lxml.html  # noqa: F401 - trafilatura's backend, loaded up front
+    parse_article_html(_WARMUP_HTML, 'https://example.gr/warmup')
+
+
+def get_parse_pool_settings() -> Dict[str, Any]:
+    from django.conf import settings
+    config = getattr(settings, 'PARSE_POOL', {})
+    return {
+        'workers': config.get('WORKERS') or os.cpu_count() or 1,
+        'start_method': config.get('START_METHOD', 'spawn'),
+        'enabled': config.get('ENABLED', True),
+    }
+
+
+class ParseExecutor:
+    """
+    Lazily started process pool for parse work
+
+    Falls back to a thread when processes cannot be used: inside daemonic processes
+    (e.g. Celery prefork children, which may not have children of their own), when
+    disabled in settings, or after the pool broke more than MAX_RESTARTS times.
+    """
+
+    MAX_RESTARTS = 3
+
+    def __init__(self):
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._restarts = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[concurrent.futures.ProcessPoolExecutor]:
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                return self._executor
+
+            config = get_parse_pool_settings()
+            if not config['enabled'] or multiprocessing.current_process().daemon:
+                return None
+            if self._restarts > self.MAX_RESTARTS:
+                return None
+
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=config['workers'],
+                mp_context=multiprocessing.get_context(config['start_method']),
+                initializer=warm_worker
+            )
+            self._pid = os.getpid()
+            logger.info(f"Started parse pool with {config['workers']} workers")
+            return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run fn(*args) in the pool without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+
+        if executor is not None:
+            try:
+                return await loop.run_in_executor(executor, fn, *args)
+            except concurrent.futures.process.BrokenProcessPool:
+                if self._executor is executor:
+                    logger.error("Parse pool broke, restarting it on next use")
+                self._discard(executor)
+
+        return await loop.run_in_executor(None, fn, *args)
+
+    def _discard(self, executor: concurrent.futures.ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                self._restarts += 1
+                if self._restarts > self.MAX_RESTARTS:
+                    logger.error("Parse pool keeps breaking, parsing in threads from now on")
+        executor.shutdown(wait=False)
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._pid == os.getpid():
+            executor.shutdown(wait=True)
+
+
+_parse_executor = ParseExecutor()
+
+
+def get_parse_executor() -> ParseExecutor:
+    """Get the process-wide parse executor"""
+    return _parse_executor
@@ -0,0 +1,363 @@
+"""
+Continuous ingestion from RSS/Atom feeds and news sitemaps
+Due NewsSources are polled with conditional GETs, item URLs are filtered by each
+feed's cursor and a compact seen-URL set in the shared cache, and only new URLs are
+enqueued for extraction, in batches.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone as dt_timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urldefrag, urlparse
+import asyncio
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from lxml import etree
+
+from .http_pool import get_http_client
+from .models import Article, NewsSource
+
+logger = logging.getLogger(__name__)
+
+
+def get_feed_settings() -> Dict[str, Any]:
+    config = getattr(settings, 'FEEDS', {})
+    return {
+        'concurrency': config.get('CONCURRENCY', 8),
+        'timeout': config.get('TIMEOUT', 20),
+        'max_items_per_feed': config.get('MAX_ITEMS_PER_FEED', 500),
+        'max_child_sitemaps': config.get('MAX_CHILD_SITEMAPS', 3),
+        'seen_ttl': config.get('SEEN_TTL_DAYS', 30) * 24 * 3600,
+        'enqueue_batch_size': config.get('ENQUEUE_BATCH_SIZE', 100),
+    }
+
+
+FEED_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; NewsCopilot/1.0; +feeds)',
+    'Accept': 'application/rss+xml, application/atom+xml, application/xml;q=0.9, text/xml;q=0.8, */*;q=0.1',
+}
+
+# Feeds are untrusted input: no entity expansion or network access while parsing
+_XML_PARSER = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+
+
+@dataclass
+class FeedItem:
+    """An article URL announced by a feed or sitemap"""
+    url: str
+    published_at: Optional[datetime] = None
+
+
+@dataclass
+class FeedFetch:
+    """Outcome of polling one feed URL"""
+    feed_url: str
+    items: List[FeedItem] = field(default_factory=list)
+    child_sitemaps: List[FeedItem] = field(default_factory=list)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+    error: Optional[str] = None
+
+
+def _localname(element) -> str:
+    return etree.QName(element).localname if isinstance(element.tag, str) else ''
+
+
+def _child_text(element, *names: str) -> Optional[str]:
+    """Text of the first descendant with one of the given local names"""
+    for child in element.iter():
+        if _localname(child) in names and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse RFC 822 (RSS) or ISO 8601 (Atom, sitemaps) dates as aware datetimes"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed
+
+
+def _clean_url(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return None
+    url = urldefrag(url.strip())[0]
+    return url if urlparse(url).scheme in ('http', 'https') else None
+
+
+def parse_feed(content: bytes) -> Tuple[List[FeedItem], List[FeedItem]]:
+    """
+    Parse an RSS, Atom, sitemap or sitemap index document
+
+    Returns:
+        (article items, child sitemaps of a sitemap index)
+    """
+    try:
+        root = etree.fromstring(content, parser=_XML_PARSER)
+    except etree.XMLSyntaxError:
+        return [], []
+    if root is None:
+        return [], []
+
+    kind = _localname(root)
+    items: List[FeedItem] = []
+    children: List[FeedItem] = []
+
+    if kind == 'rss' or kind == 'RDF':
+        for item in (el for el in root.iter() if _localname(el) == 'item'):
+            url = _clean_url(_child_text(item, 'link') or _child_text(item, 'guid'))
+            if url:
+                items.append(FeedItem(url, _parse_date(_child_text(item, 'pubDate', 'date'))))
+
+    elif kind == 'feed':
+        for entry in (el for el in root if _localname(el) == 'entry'):
+            links = [el for el in entry if _localname(el) == 'link']
+            # rel="alternate" (the default) points at the article itself
+            link = next((el for el in links if el.get('rel', 'alternate') == 'alternate'), None)
+            url = _clean_url(link.get('href') if link is not None else None)
+            if url:
+                items.append(FeedItem(url, _parse_date(_child_text(entry, 'published', 'updated'))))
+
+    elif kind == 'urlset':
+        for entry in (el for el in root if _localname(el) == 'url'):
+            url = _clean_url(_child_text(entry, 'loc'))
+            if url:
+                # Google News sitemaps carry the publication date, plain ones lastmod
+                items.append(FeedItem(url, _parse_date(_child_text(entry, 'publication_date', 'lastmod'))))
+
+    elif kind == 'sitemapindex':
+        for entry in (el for el in root if _localname(el) == 'sitemap'):
+            url = _clean_url(_child_text(entry, 'loc'))
+            if url:
+                children.append(FeedItem(url, _parse_date(_child_text(entry, 'lastmod'))))
+
+    return items, children
+
+
+def _unchanged_fetch(feed_url: str, state: Dict[str, Any], **kwargs) -> FeedFetch:
+    """A fetch without a new body; a sitemap index keeps pointing at its stored children"""
+    return FeedFetch(
+        feed_url,
+        child_sitemaps=[FeedItem(url) for url in state.get('children', [])],
+        etag=state.get('etag'),
+        last_modified=state.get('last_modified'),
+        **kwargs
+    )
+
+
+def newest_children(fetch: FeedFetch, limit: int) -> List[str]:
+    """URLs of the most recently modified child sitemaps; undated ones keep their order"""
+    dated = sorted(
+        fetch.child_sitemaps,
+        key=lambda child: child.published_at or datetime.min.replace(tzinfo=dt_timezone.utc),
+        reverse=True
+    )
+    return [child.url for child in dated[:limit]]
+
+
+async def fetch_feed(feed_url: str, state: Dict[str, Any]) -> FeedFetch:
+    """
+    Fetch and parse one feed, revalidating with the stored ETag/Last-Modified
+
+    Args:
+        feed_url: Feed or sitemap URL
+        state: Stored validators for the feed ({'etag', 'last_modified', ...})
+    """
+    config = get_feed_settings()
+    headers = dict(FEED_HEADERS)
+    if state.get('etag'):
+        headers['If-None-Match'] = state['etag']
+    if state.get('last_modified'):
+        headers['If-Modified-Since'] = state['last_modified']
+
+    client = get_http_client('feeds', timeout=config['timeout'])
+    try:
+        response = await client.get(feed_url, headers=headers, follow_redirects=True)
+        if response.status_code == 304:
+            return _unchanged_fetch(feed_url, state, not_modified=True)
+        response.raise_for_status()
+    except Exception as e:
+        logger.warning(f"Failed to fetch feed {feed_url}: {e}")
+        return _unchanged_fetch(feed_url, state, error=str(e))
+
+    items, children = parse_feed(response.content)
+    return FeedFetch(
+        feed_url,
+        items=items[:config['max_items_per_feed']],
+        child_sitemaps=children,
+        etag=response.headers.get('etag'),
+        last_modified=response.headers.get('last-modified')
+    )
+
+
+async def fetch_source_feeds(feed_urls: List[str], feed_state: Dict[str, Any]) -> List[FeedFetch]:
+    """
+    Poll all feeds of a source, following the newest children of sitemap indexes
+
+    Only the MAX_CHILD_SITEMAPS most recently modified children are fetched; news sites
+    keep appending to the latest one.
+    """
+    config = get_feed_settings()
+    fetches = list(await asyncio.gather(*(
+        fetch_feed(url, feed_state.get(url, {})) for url in feed_urls
+    )))
+
+    children = []
+    for fetch in fetches:
+        children.extend(newest_children(fetch, config['max_child_sitemaps']))
+
+    if children:
+        fetches.extend(await asyncio.gather(*(
+            fetch_feed(url, feed_state.get(url, {})) for url in children
+        )))
+    return fetches
+
+
+class SeenURLs:
+    """
+    Set of URLs already handed to extraction, kept in the shared cache
+
+    Members are 8-byte URL digests with a TTL, so the set stays compact and old entries
+    age out; lookups are a single multi-get. Articles in the database are checked too,
+    so URLs submitted through the API are not enqueued again.
+    """
+
+    prefix = 'feed_seen'
+
+    def __init__(self, ttl: Optional[int] = None):
+        self.ttl = ttl or get_feed_settings()['seen_ttl']
+
+    def _key(self, url: str) -> str:
+        return f"{self.prefix}:{hashlib.blake2b(url.encode('utf-8'), digest_size=8).hexdigest()}"
+
+    def filter_new(self, urls: Iterable[str]) -> List[str]:
+        """Return the URLs not seen before, in order and without repeats"""
+        keys = {url: self._key(url) for url in dict.fromkeys(urls)}
+        if not keys:
+            return []
+
+        try:
+            seen = cache.get_many(list(keys.values()))
+        except Exception as e:
+            logger.warning(f"Seen-URL lookup failed, falling back to the database: {e}")
+            seen = {}
+
+        unseen = [url for url, key in keys.items() if key not in seen]
+        existing = set(Article.objects.filter(url__in=unseen).values_list('url', flat=True))
+        if existing:
+            self.mark_seen(existing)
+        return [url for url in unseen if url not in existing]
+
+    def mark_seen(self, urls: Iterable[str]):
+        try:
+            cache.set_many({self._key(url): 1 for url in urls}, timeout=self.ttl)
+        except Exception as e:
+            logger.warning(f"Failed to record seen URLs: {e}")
+
+
+def is_due(source: NewsSource, now: datetime) -> bool:
+    return source.last_polled_at is None or source.last_polled_at + timedelta(seconds=source.poll_interval) <= now
+
+
+def enqueue_urls(urls: List[str]) -> int:
+    """Queue extraction for new URLs, one bulk ingestion task per batch"""
+    from .queues import BACKFILL, plan_schedule
+    from .tasks import process_articles_batch_task
+
+    batch_size = get_feed_settings()['enqueue_batch_size']
+    options = plan_schedule(BACKFILL).options()
+    for start in range(0, len(urls), batch_size):
+        process_articles_batch_task.apply_async(args=[urls[start:start + batch_size]], **options)
+    return len(urls)
+
+
+def _new_items(fetch: FeedFetch, cursor: Optional[datetime]) -> List[str]:
+    """Item URLs not older than the feed's cursor (undated items always pass)"""
+    return [
+        item.url for item in fetch.items
+        if cursor is None or item.published_at is None or item.published_at >= cursor
+    ]
+
+
+def poll_feeds(source_ids: Optional[List[int]] = None, force: bool = False) -> Dict[str, Any]:
+    """
+    Poll due sources and enqueue the articles they announce
+
+    Args:
+        source_ids: Limit polling to these sources
+        force: Poll even if a source's polling interval has not elapsed
+
+    Returns:
+        Dict with counts of polled sources, feeds and enqueued URLs
+    """
+    from .runtime import run_async
+
+    now = timezone.now()
+    sources = NewsSource.objects.filter(is_active=True).exclude(feed_urls=[])
+    if source_ids:
+        sources = sources.filter(id__in=source_ids)
+    due = [source for source in sources if force or is_due(source, now)]
+    if not due:
+        return {"sources": 0, "feeds": 0, "enqueued": 0}
+
+    config = get_feed_settings()
+    semaphore = asyncio.Semaphore(config['concurrency'])
+
+    async def poll(source: NewsSource) -> List[FeedFetch]:
+        async with semaphore:
+            return await fetch_source_feeds(source.feed_urls, source.feed_state or {})
+
+    async def poll_all() -> List[List[FeedFetch]]:
+        return await asyncio.gather(*(poll(source) for source in due))
+
+    results = run_async(poll_all())
+
+    seen = SeenURLs()
+    feeds = enqueued = 0
+    for source, fetches in zip(due, results):
+        # Rebuilt from this poll's fetches, so rotated-out child sitemaps are dropped
+        previous = source.feed_state or {}
+        state = {}
+        candidates = []
+
+        for fetch in fetches:
+            feeds += 1
+            feed_state = dict(previous.get(fetch.feed_url, {}))
+            feed_state.update(etag=fetch.etag, last_modified=fetch.last_modified)
+            if fetch.child_sitemaps:
+                feed_state['children'] = newest_children(fetch, config['max_child_sitemaps'])
+
+            if fetch.items:
+                cursor = _parse_date(feed_state.get('cursor'))
+                candidates.extend(_new_items(fetch, cursor))
+                dated = [item.published_at for item in fetch.items if item.published_at]
+                if dated:
+                    feed_state['cursor'] = max(dated + ([cursor] if cursor else [])).isoformat()
+            state[fetch.feed_url] = feed_state
+
+        new_urls = seen.filter_new(candidates)
+        if new_urls:
+            enqueue_urls(new_urls)
+            seen.mark_seen(new_urls)
+            enqueued += len(new_urls)
+            logger.info(f"Enqueued {len(new_urls)} new articles from {source.domain}")
+
+        source.feed_state = state
+        source.last_polled_at = now
+        source.save(update_fields=['feed_state', 'last_polled_at', 'updated_at'])
+
+    return {"sources": len(due), "feeds": feeds, "enqueued": enqueued}
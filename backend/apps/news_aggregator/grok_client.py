@@ -12,6 +12,12 @@ from datetime import datetime
 from django.conf import settings
 from django.core.cache import cache
 
+from .http_pool import get_http_client
+from .json_stream import parse_lenient
+from .rate_limit import (
+    RateLimitExceeded, TransientAPIError, estimate_tokens, get_rate_limiter, parse_retry_after
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -87,31 +93,56 @@ class GrokClient:
             except Exception as e:
                 logger.debug(f"Search params logging failed: {e}")
         
-        # Make the API call
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        # Make the API call over the shared connection pool, within the xAI rate limits
+        client = get_http_client('grok', timeout=self.timeout)
+        limiter = get_rate_limiter('xai', model)
+        estimated = estimate_tokens(
+            json.dumps(messages, ensure_ascii=False),
+            max_output_tokens=max_tokens or 0
+        )
+        
+        async def call():
             try:
                 response = await client.post(
                     f"{self.base_url}/chat/completions",
                     headers=self._get_headers(),
                     json=request_body
                 )
-                response.raise_for_status()
-                
-                result = response.json()
-                
-                # Log token usage if available
-                if "usage" in result:
-                    logger.info(f"Token usage - Prompt: {result['usage'].get('prompt_tokens', 0)}, "
-                               f"Completion: {result['usage'].get('completion_tokens', 0)}")
-                
-                return result
-                
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Grok API HTTP error: {e.response.status_code} - {e.response.text}")
-                raise Exception(f"Grok API error: {e.response.status_code}")
-            except Exception as e:
-                logger.error(f"Grok API request failed: {str(e)}")
-                raise
+            except httpx.TransportError as e:
+                raise TransientAPIError(f"Grok connection error for {model}: {e}") from e
+            if response.status_code in (408, 409) or response.status_code >= 500:
+                raise TransientAPIError(
+                    f"Grok API error {response.status_code} for {model}",
+                    parse_retry_after(response.headers.get("retry-after"))
+                )
+            if response.status_code == 429:
+                raise RateLimitExceeded(
+                    f"Grok rate limit for {model}",
+                    parse_retry_after(response.headers.get("retry-after"))
+                )
+            response.raise_for_status()
+            return response.json()
+        
+        try:
+            result = await limiter.execute(
+                call,
+                estimated,
+                count_tokens=lambda r: r.get("usage", {}).get("total_tokens")
+            )
+            
+            # Log token usage if available
+            if "usage" in result:
+                logger.info(f"Token usage - Prompt: {result['usage'].get('prompt_tokens', 0)}, "
+                           f"Completion: {result['usage'].get('completion_tokens', 0)}")
+            
+            return result
+            
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Grok API HTTP error: {e.response.status_code} - {e.response.text}")
+            raise Exception(f"Grok API error: {e.response.status_code}")
+        except Exception as e:
+            logger.error(f"Grok API request failed: {str(e)}")
+            raise
     
     async def create_chat_completion(
         self,
@@ -196,7 +227,7 @@ class GrokClient:
         
         # Parse and return the JSON response
         content = result["choices"][0]["message"]["content"]
-        return json.loads(content)
+        return parse_lenient(content)
     
     def build_search_params(
         self,
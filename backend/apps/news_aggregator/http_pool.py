@@ -0,0 +1,144 @@
+"""
+Shared HTTP connection pools for outbound API and web requests
+Keeps one httpx.AsyncClient per (event loop, name) so keep-alive connections are reused
+"""
+from typing import Dict, Any
+import asyncio
+import logging
+import weakref
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_POOL_CONFIG = {
+    'MAX_CONNECTIONS': 100,
+    'MAX_KEEPALIVE_CONNECTIONS': 20,
+    'KEEPALIVE_EXPIRY': 30.0,
+    'HTTP2': False,
+}
+
+
+def get_pool_config() -> Dict[str, Any]:
+    """Get the pool configuration merged with defaults"""
+    return {**DEFAULT_POOL_CONFIG, **getattr(settings, 'HTTP_POOL', {})}
+
+
+def _http2_available() -> bool:
+    """HTTP/2 support in httpx needs the optional h2 package"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HTTPClientPool:
+    """Registry of shared httpx.AsyncClient instances, one set per event loop"""
+
+    def __init__(self):
+        # Clients are bound to the loop they were created on, so keep them per loop
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get_client(self, name: str = 'default', **client_kwargs) -> httpx.AsyncClient:
+        """
+        Get the shared client for the running event loop, creating it on first use
+
+        Args:
+            name: Pool name, lets callers with different defaults (timeouts, headers) keep separate pools
+            **client_kwargs: Extra httpx.AsyncClient arguments, only used when the client is created
+
+        Returns:
+            A pooled httpx.AsyncClient
+        """
+        loop = asyncio.get_running_loop()
+        clients = self._clients.setdefault(loop, {})
+
+        client = clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create_client(**client_kwargs)
+            clients[name] = client
+            logger.debug(f"Created pooled HTTP client '{name}'")
+
+        return client
+
+    def _create_client(self, **client_kwargs) -> httpx.AsyncClient:
+        """Create a client with the configured connection limits"""
+        config = get_pool_config()
+
+        http2 = config['HTTP2']
+        if http2 and not _http2_available():
+            logger.warning("HTTP_POOL['HTTP2'] is enabled but h2 is not installed, using HTTP/1.1")
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=config['MAX_CONNECTIONS'],
+            max_keepalive_connections=config['MAX_KEEPALIVE_CONNECTIONS'],
+            keepalive_expiry=config['KEEPALIVE_EXPIRY']
+        )
+
+        return httpx.AsyncClient(limits=limits, http2=http2, **client_kwargs)
+
+    async def aclose(self):
+        """Close all clients that belong to the running event loop"""
+        loop = asyncio.get_running_loop()
+        clients = self._clients.pop(loop, {})
+
+        for name, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client '{name}': {e}")
+
+        if clients:
+            logger.info(f"Closed {len(clients)} pooled HTTP clients")
+
+    def close(self):
+        """
+        Close clients from outside an event loop (worker shutdown hooks)
+
+        Clients whose loop is still usable are closed on that loop; clients of
+        closed loops cannot do network I/O any more and are simply dropped.
+        """
+        for loop, clients in list(self._clients.items()):
+            if loop.is_closed() or not clients:
+                continue
+
+            if loop.is_running():
+                # Loop lives in another thread - schedule the close there
+                asyncio.run_coroutine_threadsafe(self._close_clients(clients), loop)
+            else:
+                loop.run_until_complete(self._close_clients(clients))
+
+        self._clients.clear()
+
+    @staticmethod
+    async def _close_clients(clients: Dict[str, httpx.AsyncClient]):
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+
+
+# Process-wide pool registry
+http_pool = HTTPClientPool()
+
+
+def get_http_client(name: str = 'default', **client_kwargs) -> httpx.AsyncClient:
+    """Get a pooled HTTP client for the running event loop"""
+    return http_pool.get_client(name, **client_kwargs)
+
+
+async def aclose_http_clients():
+    """Close pooled clients of the running event loop"""
+    await http_pool.aclose()
+
+
+def close_http_clients():
+    """Close all pooled clients, for use in shutdown hooks"""
+    http_pool.close()
@@ -0,0 +1,229 @@
+"""
+Bulk article ingestion
+Extracts many URLs at once and writes the results with a fixed number of queries per
+chunk (existence check, job rows, sources, near-duplicate candidates, articles, job
+updates) instead of several queries per URL.
+"""
+from typing import Any, Dict, List
+from urllib.parse import urlparse
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .content_store import make_summary
+from .dedup import fingerprint_article, find_canonical_articles
+from .models import Article, NewsSource, ProcessingJob
+from .search import update_search_vectors
+
+logger = logging.getLogger(__name__)
+
+
+def get_ingest_settings() -> Dict[str, Any]:
+    config = getattr(settings, 'NEWS_AGGREGATOR', {})
+    return {
+        'max_urls': config.get('BULK_MAX_URLS', 10000),
+        'task_size': config.get('BULK_TASK_SIZE', 500),
+        'chunk_size': config.get('BULK_WRITE_CHUNK_SIZE', 500),
+    }
+
+
+def source_domain(url: str) -> str:
+    """NewsSource domain for an article URL"""
+    return urlparse(url).netloc.replace('www.', '')
+
+
+def unique_urls(urls: List[str]) -> List[str]:
+    """Strip and de-duplicate URLs, keeping the first occurrence"""
+    return list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+
+
+def resolve_sources(domains: List[str]) -> Dict[str, NewsSource]:
+    """Get or create the NewsSource for each domain with two or three queries"""
+    sources = {source.domain: source for source in NewsSource.objects.filter(domain__in=domains)}
+    missing = [domain for domain in domains if domain not in sources]
+
+    if missing:
+        NewsSource.objects.bulk_create(
+            [NewsSource(domain=domain, name=domain, language='el', is_active=True) for domain in missing],
+            ignore_conflicts=True
+        )
+        # Re-read: rows created concurrently by other workers have ids we don't know
+        sources.update({
+            source.domain: source for source in NewsSource.objects.filter(domain__in=missing)
+        })
+    return sources
+
+
+def _article_from_data(url: str, data: Dict[str, Any], source: NewsSource, fingerprint) -> Article:
+    content = data.get('content', '')
+    word_count = len(content.split())
+    return Article(
+        url=url,
+        title=(data.get('title') or '')[:500],
+        content=content,
+        summary=make_summary(content),
+        author=(data.get('author') or '')[:255],
+        published_at=data.get('published_at'),
+        source=source,
+        word_count=word_count,
+        reading_time=max(1, word_count // 200),
+        is_processed=True,
+        simhash=fingerprint[0] if fingerprint else None,
+        simhash_bands=fingerprint[1] if fingerprint else [],
+    )
+
+
+def ingest_urls(urls: List[str], celery_task_id: str = '', progress=None) -> Dict[str, Any]:
+    """
+    Extract and store many articles
+
+    Args:
+        urls: Article URLs (duplicates and already stored URLs are skipped)
+        celery_task_id: Task id recorded on the ProcessingJob rows
+        progress: Optional ProgressReporter receiving per-chunk extract/store stages
+
+    Returns:
+        Dict with created article ids by URL, existing URLs, failed URLs and duplicates
+    """
+    from .extractors.article import ArticleExtractor
+    from .runtime import run_async
+
+    urls = unique_urls(urls)
+    chunk_size = get_ingest_settings()['chunk_size']
+    extractor = ArticleExtractor()
+
+    created: Dict[str, str] = {}
+    existing: List[str] = []
+    failed: Dict[str, str] = {}
+    duplicates = 0
+
+    chunks = (len(urls) + chunk_size - 1) // chunk_size
+    for start in range(0, len(urls), chunk_size):
+        chunk = urls[start:start + chunk_size]
+        chunk_number = start // chunk_size + 1
+
+        stored = set(Article.objects.filter(url__in=chunk).values_list('url', flat=True))
+        existing.extend(url for url in chunk if url in stored)
+        new_urls = [url for url in chunk if url not in stored]
+        if not new_urls:
+            continue
+
+        now = timezone.now()
+        jobs = ProcessingJob.objects.bulk_create([
+            ProcessingJob(
+                url=url,
+                job_type='extraction',
+                status='processing',
+                celery_task_id=celery_task_id,
+                started_at=now
+            )
+            for url in new_urls
+        ])
+        jobs_by_url = {job.url: job for job in jobs}
+
+        try:
+            if progress:
+                progress.stage('extract', chunk=chunk_number, chunks=chunks, urls=len(new_urls))
+            extracted = run_async(extractor.extract_many(new_urls))
+            extracted = {url: data for url, data in extracted.items() if data and data.get('content')}
+            for url in new_urls:
+                if url not in extracted:
+                    failed[url] = 'Failed to extract article content'
+
+            if progress:
+                progress.stage('store', chunk=chunk_number, chunks=chunks, articles=len(extracted))
+            chunk_created = _store_articles(extracted)
+            created.update(chunk_created['created'])
+            duplicates += chunk_created['duplicates']
+            for url in extracted:
+                if url not in chunk_created['created']:
+                    # Inserted by another worker since the existence check
+                    existing.append(url)
+
+            completed_at = timezone.now()
+            for url, job in jobs_by_url.items():
+                # bulk_update skips auto_now, so stamp it like save() would
+                job.completed_at = job.updated_at = completed_at
+                if url in failed:
+                    job.status = 'failed'
+                    job.error_message = failed[url]
+                else:
+                    job.status = 'completed'
+                    job.article_id = created.get(url) or chunk_created['ids'].get(url)
+            ProcessingJob.objects.bulk_update(
+                jobs, ['article', 'status', 'error_message', 'completed_at', 'updated_at'],
+                batch_size=chunk_size
+            )
+        except Exception as e:
+            # Fail this chunk's jobs rather than leaving them processing, and go on
+            logger.exception(f"Bulk ingestion chunk {chunk_number}/{chunks} failed: {e}")
+            lost = {url: job for url, job in jobs_by_url.items() if url not in created}
+            for url in lost:
+                failed[url] = str(e)
+            failed_at = timezone.now()
+            ProcessingJob.objects.filter(id__in=[job.id for job in lost.values()]).update(
+                status='failed',
+                error_message=str(e),
+                completed_at=failed_at,
+                updated_at=failed_at
+            )
+
+    logger.info(f"Bulk ingestion: {len(created)} created ({duplicates} near-duplicates), "
+                f"{len(existing)} existing, {len(failed)} failed")
+    return {
+        "created": created,
+        "existing": existing,
+        "failed": failed,
+        "near_duplicates": duplicates,
+    }
+
+
+def _store_articles(extracted: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Insert extracted articles, linking near-duplicates to their canonical article
+
+    Returns:
+        Dict with 'created' (url -> id of articles inserted here), 'ids' (url -> id of
+        the stored article, including ones inserted concurrently) and 'duplicates'
+    """
+    if not extracted:
+        return {"created": {}, "ids": {}, "duplicates": 0}
+
+    urls = list(extracted.keys())
+    sources = resolve_sources(sorted({source_domain(url) for url in urls}))
+    fingerprints = [fingerprint_article(extracted[url].get('content', '')) for url in urls]
+    canonical_ids, canonical_in_batch = find_canonical_articles(fingerprints)
+
+    articles = [
+        _article_from_data(url, extracted[url], sources[source_domain(url)], fingerprint)
+        for url, fingerprint in zip(urls, fingerprints)
+    ]
+    for index, canonical_id in canonical_ids.items():
+        articles[index].canonical_article_id = canonical_id
+
+    with transaction.atomic():
+        # ignore_conflicts: URLs inserted concurrently keep their existing row
+        Article.objects.bulk_create(articles, ignore_conflicts=True)
+        ids = dict(Article.objects.filter(url__in=urls).values_list('url', 'id'))
+        inserted = {article.url for article in articles if ids.get(article.url) == article.id}
+
+        # Link duplicates within the batch once their canonical row is known to exist
+        linked = []
+        for index, canonical_index in canonical_in_batch.items():
+            article, canonical = articles[index], articles[canonical_index]
+            if article.url in inserted and canonical.url in inserted:
+                article.canonical_article_id = canonical.id
+                linked.append(article)
+        if linked:
+            Article.objects.bulk_update(linked, ['canonical_article'])
+        
+        # bulk_create skips the post_save signal that maintains search vectors
+        update_search_vectors(ids[url] for url in urls if url in inserted)
+
+    return {
+        "created": {url: str(ids[url]) for url in urls if url in inserted},
+        "ids": {url: str(article_id) for url, article_id in ids.items()},
+        "duplicates": len(canonical_ids) + len(linked),
+    }
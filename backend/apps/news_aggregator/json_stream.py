@@ -0,0 +1,230 @@
+"""
+Incremental and tolerant JSON parsing for structured agent outputs
+
+IncrementalJSONParser consumes a token stream and emits elements of top-level arrays
+(e.g. each `terms[]` entry) as soon as they close. parse_lenient() recovers a JSON object
+from model output with surrounding prose, code fences, trailing garbage or truncation.
+"""
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PartialJSON(dict):
+    """Object parse_lenient() recovered from truncated output: trailing values are missing"""
+
+
+def array_paths_from_schema(schema: Dict[str, Any]) -> List[str]:
+    """Top-level properties of an object schema that hold arrays"""
+    return [
+        key for key, spec in schema.get('properties', {}).items()
+        if spec.get('type') == 'array'
+    ]
+
+
+class _Scanner:
+    """
+    Character-level JSON structure tracker
+
+    Tracks container nesting, strings and object key/value position without building
+    values, so it can run over partial input and tell where complete values end.
+    """
+
+    def __init__(self):
+        self.stack: List[str] = []          # open containers: '{' or '['
+        self.expect_key: List[bool] = []    # per container: next string is an object key
+        self.in_string = False
+        self.escape = False
+        self.started = False
+        self.finished = False
+        self.string_start = -1
+
+    def step(self, ch: str, pos: int) -> Optional[Tuple[str, int]]:
+        """
+        Advance over one character
+
+        Returns:
+            ('open', depth) when a container opens, ('close', depth) when one closes,
+            ('string', depth) when a string value ends, ('key', depth) when an object
+            key ends, ('colon', depth) for a key separator, otherwise None
+        """
+        if self.finished:
+            return None
+
+        if self.in_string:
+            if self.escape:
+                self.escape = False
+            elif ch == '\\':
+                self.escape = True
+            elif ch == '"':
+                self.in_string = False
+                depth = len(self.stack)
+                if self.stack and self.stack[-1] == '{' and self.expect_key[-1]:
+                    return ('key', depth)
+                return ('string', depth)
+            return None
+
+        if not self.started:
+            # Skip any prose or code fences before the top-level object
+            if ch == '{':
+                self.started = True
+            else:
+                return None
+
+        if ch == '"':
+            self.in_string = True
+            self.string_start = pos
+        elif ch in '{[':
+            self.stack.append(ch)
+            self.expect_key.append(ch == '{')
+            return ('open', len(self.stack))
+        elif ch in '}]':
+            if not self.stack:
+                return None
+            depth = len(self.stack)
+            self.stack.pop()
+            self.expect_key.pop()
+            if not self.stack:
+                self.finished = True
+            return ('close', depth)
+        elif ch == ':':
+            if self.expect_key:
+                self.expect_key[-1] = False
+            return ('colon', len(self.stack))
+        elif ch == ',':
+            if self.stack and self.stack[-1] == '{':
+                self.expect_key[-1] = True
+
+        return None
+
+
+class IncrementalJSONParser:
+    """Streaming parser that emits completed elements of top-level arrays"""
+
+    def __init__(self, item_paths: Optional[Iterable[str]] = None):
+        """
+        Args:
+            item_paths: Top-level keys whose array elements should be emitted;
+                None emits elements of every top-level array
+        """
+        self.item_paths = set(item_paths) if item_paths is not None else None
+        self.buffer = ''
+        self._scanner = _Scanner()
+        self._pending_key: Optional[str] = None
+        self._current_key: Optional[str] = None
+        self._array_key: Optional[str] = None
+        self._item_start = -1
+        self._item_counts: Dict[str, int] = {}
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Consume a chunk of streamed text
+
+        Returns:
+            List of {'path', 'index', 'item'} for every array element completed by this chunk
+        """
+        items = []
+        offset = len(self.buffer)
+        self.buffer += chunk
+        scanner = self._scanner
+
+        for i, ch in enumerate(chunk):
+            pos = offset + i
+            at_item_level = self._array_key is not None and len(scanner.stack) == 2
+            event = scanner.step(ch, pos)
+            if event is None:
+                continue
+
+            kind, depth = event
+
+            if kind == 'key' and depth == 1:
+                self._pending_key = self._decode_string(scanner.string_start, pos)
+            elif kind == 'colon' and depth == 1:
+                self._current_key = self._pending_key
+            elif kind == 'open':
+                if depth == 2 and scanner.stack[0] == '{' and ch == '[' and self._wants(self._current_key):
+                    self._array_key = self._current_key
+                elif depth == 3 and at_item_level:
+                    self._item_start = pos
+            elif kind == 'close':
+                if depth == 3 and self._array_key is not None and self._item_start >= 0:
+                    self._emit(items, self.buffer[self._item_start:pos + 1])
+                    self._item_start = -1
+                elif depth == 2 and self._array_key is not None:
+                    self._array_key = None
+            elif kind == 'string' and depth == 2 and self._array_key is not None:
+                self._emit(items, self.buffer[scanner.string_start:pos + 1])
+
+        return items
+
+    def _wants(self, key: Optional[str]) -> bool:
+        return key is not None and (self.item_paths is None or key in self.item_paths)
+
+    def _decode_string(self, start: int, end: int) -> Optional[str]:
+        try:
+            return json.loads(self.buffer[start:end + 1])
+        except ValueError:
+            return None
+
+    def _emit(self, items: List[Dict[str, Any]], raw: str):
+        try:
+            item = json.loads(raw)
+        except ValueError:
+            logger.debug(f"Skipping malformed streamed element for {self._array_key}")
+            return
+        index = self._item_counts.get(self._array_key, 0)
+        self._item_counts[self._array_key] = index + 1
+        items.append({'path': self._array_key, 'index': index, 'item': item})
+
+    def result(self) -> Dict[str, Any]:
+        """Parse everything fed so far, repairing truncated output if needed"""
+        return parse_lenient(self.buffer)
+
+
+def parse_lenient(text: str) -> Dict[str, Any]:
+    """
+    Parse the first JSON object in model output as leniently as possible
+
+    Ignores prose/code fences before the object and garbage after it. If the object is
+    truncated, the text is cut after the last complete value and open containers are
+    closed, so completed array elements are kept; the result is then a PartialJSON.
+
+    Raises:
+        ValueError: If no JSON object can be recovered
+    """
+    start = text.find('{')
+    if start < 0:
+        raise ValueError("No JSON object found in response")
+
+    scanner = _Scanner()
+    # (cut position, closers needed) after each complete value
+    cut_points: List[Tuple[int, str]] = []
+
+    for pos in range(start, len(text)):
+        event = scanner.step(text[pos], pos)
+        if scanner.finished:
+            return json.loads(text[start:pos + 1])
+        if event is None:
+            continue
+
+        kind, _ = event
+        # Only cut between whole top-level values or whole array elements, so a
+        # truncated element is dropped rather than returned half-filled
+        if kind in ('open', 'close', 'string') and len(scanner.stack) <= 2:
+            closers = ''.join('}' if c == '{' else ']' for c in reversed(scanner.stack))
+            cut_points.append((pos + 1, closers))
+
+    # Truncated output - try the latest cut points first
+    for cut, closers in reversed(cut_points[-200:]):
+        candidate = text[start:cut] + closers
+        try:
+            result = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(result, dict):
+            logger.warning(f"Recovered truncated JSON response ({len(text) - cut} trailing chars dropped)")
+            return PartialJSON(result)
+
+    raise ValueError("Could not recover a JSON object from response")
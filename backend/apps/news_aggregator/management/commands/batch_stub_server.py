@@ -0,0 +1,249 @@
+"""
+Django management command running a local stand-in for the Anthropic Messages API
+Usage: python manage.py batch_stub_server [--port 8765] [--processing-seconds 5]
+
+Point the app at it with ANTHROPIC_BASE_URL=http://127.0.0.1:8765 to exercise the batch
+pipeline (and non-streaming interactive calls) without network access or API spend.
+Tests start it in-process with make_server() and force per-request failures through
+StubState.outcomes.
+"""
+from django.core.management.base import BaseCommand
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime, timedelta, timezone
+import json
+import re
+import threading
+import time
+import uuid
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA_MARKER = 'schema:'
+
+
+def example_from_schema(schema: Dict[str, Any]) -> Any:
+    """Build a minimal value that satisfies a JSON schema"""
+    schema_type = schema.get('type')
+    if 'enum' in schema:
+        return schema['enum'][0]
+    if schema_type == 'object':
+        return {
+            key: example_from_schema(spec)
+            for key, spec in schema.get('properties', {}).items()
+        }
+    if schema_type == 'array':
+        return [example_from_schema(schema.get('items', {}))]
+    if schema_type in ('number', 'integer'):
+        return schema.get('minimum', 0)
+    if schema_type == 'boolean':
+        return False
+    return 'stub'
+
+
+# Outcomes a test can force for a batch request, by custom_id
+INVALID_JSON = 'invalid_json'  # succeeded, but the text holds no JSON object
+EMPTY_OBJECT = 'empty_object'  # succeeded with {}, which fails output validation
+ERRORED = 'errored'
+EXPIRED = 'expired'
+
+
+def fake_message(params: Dict[str, Any], text: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Message API response for a request, shaped after the schema in its system prompt
+
+    Args:
+        params: Messages API request parameters
+        text: Response text to return instead of the schema-shaped JSON
+    """
+    system = params.get('system') or ''
+    if isinstance(system, list):
+        system = ''.join(block.get('text', '') for block in system)
+
+    if text is None:
+        payload: Any = {}
+        marker = system.find(SCHEMA_MARKER)
+        if marker >= 0:
+            start = system.find('{', marker)
+            try:
+                schema, _ = json.JSONDecoder().raw_decode(system[start:])
+                payload = example_from_schema(schema)
+            except ValueError:
+                pass
+        text = json.dumps(payload, ensure_ascii=False)
+
+    return {
+        'id': f"msg_stub_{uuid.uuid4().hex[:24]}",
+        'type': 'message',
+        'role': 'assistant',
+        'model': params.get('model', 'stub'),
+        'content': [{'type': 'text', 'text': text}],
+        'stop_reason': 'end_turn',
+        'stop_sequence': None,
+        'usage': {
+            'input_tokens': len(json.dumps(params.get('messages', []))) // 3 + len(system) // 3,
+            'output_tokens': len(text) // 3,
+        },
+    }
+
+
+class StubState:
+    """Batches held in memory by the stub server"""
+
+    def __init__(self, processing_seconds: float):
+        self.processing_seconds = processing_seconds
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        # custom_id -> forced outcome (INVALID_JSON, EMPTY_OBJECT, ERRORED or EXPIRED)
+        self.outcomes: Dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    def create_batch(self, requests) -> Dict[str, Any]:
+        batch_id = f"msgbatch_stub_{uuid.uuid4().hex[:24]}"
+        with self.lock:
+            self.batches[batch_id] = {
+                'requests': requests,
+                'created': time.time(),
+            }
+        return batch_id
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            return self.batches.get(batch_id)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Implements the subset of the Messages API used by the app"""
+
+    state: StubState = None
+    base_url: str = ''
+
+    def do_POST(self):
+        body = self._read_json()
+        if self.path == '/v1/messages':
+            if body.get('stream'):
+                self._send_json(400, self._error('Streaming is not supported by the stub server'))
+                return
+            self._send_json(200, fake_message(body))
+        elif self.path == '/v1/messages/batches':
+            batch_id = self.state.create_batch(body.get('requests', []))
+            self._send_json(200, self._batch_object(batch_id))
+        else:
+            self._send_json(404, self._error(f"Unknown endpoint {self.path}"))
+
+    def do_GET(self):
+        match = re.fullmatch(r'/v1/messages/batches/([\w-]+)(/results)?', self.path)
+        if not match or self.state.get_batch(match.group(1)) is None:
+            self._send_json(404, self._error(f"Unknown endpoint {self.path}"))
+            return
+
+        batch_id, results = match.group(1), match.group(2)
+        if not results:
+            self._send_json(200, self._batch_object(batch_id))
+            return
+
+        lines = [
+            json.dumps({'custom_id': request['custom_id'], 'result': self._result(request)}, ensure_ascii=False)
+            for request in self.state.get_batch(batch_id)['requests']
+        ]
+        self._send(200, '\n'.join(lines).encode('utf-8'), 'application/binary')
+
+    def _result(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Batch result of one request, honouring a forced outcome"""
+        outcome = self.state.outcomes.get(request['custom_id'])
+        if outcome == ERRORED:
+            return {'type': 'errored', 'error': self._error('Forced error')}
+        if outcome == EXPIRED:
+            return {'type': 'expired'}
+
+        text = {INVALID_JSON: 'Not JSON at all', EMPTY_OBJECT: '{}'}.get(outcome)
+        return {'type': 'succeeded', 'message': fake_message(request['params'], text)}
+
+    def _batch_object(self, batch_id: str) -> Dict[str, Any]:
+        batch = self.state.get_batch(batch_id)
+        created = datetime.fromtimestamp(batch['created'], tz=timezone.utc)
+        ended = time.time() - batch['created'] >= self.state.processing_seconds
+        total = len(batch['requests'])
+
+        return {
+            'id': batch_id,
+            'type': 'message_batch',
+            'processing_status': 'ended' if ended else 'in_progress',
+            'request_counts': {
+                'processing': 0 if ended else total,
+                'succeeded': total if ended else 0,
+                'errored': 0,
+                'canceled': 0,
+                'expired': 0,
+            },
+            'created_at': created.isoformat(),
+            'expires_at': (created + timedelta(hours=24)).isoformat(),
+            'ended_at': (
+                (created + timedelta(seconds=self.state.processing_seconds)).isoformat()
+                if ended else None
+            ),
+            'archived_at': None,
+            'cancel_initiated_at': None,
+            'results_url': f"{self.base_url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def _error(self, message: str) -> Dict[str, Any]:
+        return {'type': 'error', 'error': {'type': 'invalid_request_error', 'message': message}}
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _send_json(self, status: int, data: Dict[str, Any]):
+        self._send(status, json.dumps(data, ensure_ascii=False).encode('utf-8'), 'application/json')
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def make_server(host: str, port: int, processing_seconds: float) -> ThreadingHTTPServer:
+    """
+    Stub server with its own state; port 0 picks a free port
+
+    The caller runs serve_forever() (e.g. in a thread) and reads the state from
+    server.RequestHandlerClass.state.
+    """
+    handler = type('StubHandler', (StubHandler,), {'state': StubState(processing_seconds)})
+    server = ThreadingHTTPServer((host, port), handler)
+    handler.base_url = f"http://{host}:{server.server_address[1]}"
+    return server
+
+
+class Command(BaseCommand):
+    help = 'Run a local stand-in for the Anthropic Messages and Message Batches APIs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+        parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+        parser.add_argument(
+            '--processing-seconds',
+            type=float,
+            default=5.0,
+            help='How long a submitted batch stays in progress'
+        )
+
+    def handle(self, *args, **options):
+        server = make_server(options['host'], options['port'], options['processing_seconds'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Anthropic stub listening on {server.RequestHandlerClass.base_url} "
+            f"(set ANTHROPIC_BASE_URL to use it)"
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,116 @@
+"""
+Django management command to benchmark the agent coordinator against a fake LLM backend
+Usage: python manage.py benchmark_agents [--in-flight 1 4 16]
+"""
+from django.core.management.base import BaseCommand
+import asyncio
+import time
+import uuid
+import logging
+from typing import Dict, Any, List
+
+from apps.news_aggregator import claude_client as claude_client_module
+
+logger = logging.getLogger(__name__)
+
+
+# Simulated response latency per model (seconds), roughly proportional to real traffic
+FAKE_MODEL_LATENCY = {
+    'claude-3-5-haiku-latest': 0.4,
+    'claude-3-7-sonnet-20250219': 0.8,
+    'claude-sonnet-4-20250514': 1.2,
+}
+
+SAMPLE_ARTICLE = """
+Συνεδριάζει την Τετάρτη το υπουργικό συμβούλιο υπό τον Πρωθυπουργό
+με μοναδικά θέματα τα οικονομικά. Η συνεδρίαση θα πραγματοποιηθεί στο Μέγαρο
+Μαξίμου και αναμένεται να διαρκέσει περίπου δύο ώρες.
+"""
+
+
+class FakeClaudeClient:
+    """Stand-in for ClaudeClient that sleeps instead of calling the API"""
+
+    def __init__(self, latency_scale: float = 1.0):
+        self.latency_scale = latency_scale
+        self.calls = 0
+
+    async def create_structured_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: Dict[str, Any],
+        model: str = "claude-3-7-sonnet-20250219",
+        **kwargs
+    ) -> Dict[str, Any]:
+        self.calls += 1
+        await asyncio.sleep(FAKE_MODEL_LATENCY.get(model, 1.0) * self.latency_scale)
+
+        # Minimal payload that satisfies the agent schema
+        return {
+            key: [] if spec.get('type') == 'array' else 'benchmark'
+            for key, spec in schema.get('properties', {}).items()
+        }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark serial vs concurrent agent execution using a fake LLM backend'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--in-flight',
+            type=int,
+            nargs='+',
+            default=[1, 4, 16],
+            help='Numbers of articles analyzed at the same time'
+        )
+        parser.add_argument(
+            '--latency-scale',
+            type=float,
+            default=1.0,
+            help='Multiplier applied to the simulated model latencies'
+        )
+
+    def handle(self, *args, **options):
+        # Swap the singleton before agents are constructed so they pick up the fake
+        fake_client = FakeClaudeClient(options['latency_scale'])
+        claude_client_module._claude_client = fake_client
+
+        from apps.news_aggregator.agents.coordinator import AgentCoordinator
+        coordinator = AgentCoordinator()
+
+        self.stdout.write(
+            f"{'in-flight':>10} {'serial (s)':>12} {'concurrent (s)':>16} {'speedup':>9}"
+        )
+
+        for in_flight in options['in_flight']:
+            serial = asyncio.run(self._run(self._analyze_serial, coordinator, in_flight))
+            concurrent = asyncio.run(self._run(self._analyze_concurrent, coordinator, in_flight))
+            speedup = serial / concurrent if concurrent else 0
+
+            self.stdout.write(
+                f"{in_flight:>10} {serial:>12.2f} {concurrent:>16.2f} {speedup:>8.1f}x"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Fake LLM calls made: {fake_client.calls}"))
+
+    async def _run(self, analyze, coordinator, in_flight: int) -> float:
+        """Analyze `in_flight` articles at once and return the wall time"""
+        start = time.perf_counter()
+        await asyncio.gather(*[analyze(coordinator) for _ in range(in_flight)])
+        return time.perf_counter() - start
+
+    async def _analyze_serial(self, coordinator) -> List[Any]:
+        """Previous behaviour: each agent awaited one after another"""
+        article_content = self._unique_article()
+        results = []
+        for agent in coordinator.agents.values():
+            results.append(await agent.execute_with_monitoring(article_content))
+        return results
+
+    async def _analyze_concurrent(self, coordinator) -> Dict[str, Any]:
+        return await coordinator.analyze_article(article_content=self._unique_article())
+
+    def _unique_article(self) -> str:
+        """Distinct text per run so the content-addressed result cache never hits"""
+        return f"{SAMPLE_ARTICLE}\n{uuid.uuid4()}"
@@ -0,0 +1,139 @@
+"""
+Django management command to measure connection reuse of the shared HTTP pool
+Usage: python manage.py benchmark_http_pool [--requests 200] [--concurrency 8]
+"""
+from django.core.management.base import BaseCommand, CommandError
+import asyncio
+import os
+import ssl
+import subprocess
+import tempfile
+import time
+import logging
+
+import httpx
+
+from apps.news_aggregator.http_pool import get_http_client, aclose_http_clients
+
+logger = logging.getLogger(__name__)
+
+
+class TLSStubServer:
+    """Minimal keep-alive HTTPS server that counts accepted connections"""
+
+    RESPONSE_BODY = b'{"choices": [{"message": {"content": "{}"}}]}'
+
+    def __init__(self, ssl_context: ssl.SSLContext):
+        self.ssl_context = ssl_context
+        self.connections = 0
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(
+            self._handle, '127.0.0.1', 0, ssl=self.ssl_context
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                # Read request headers and body, then answer and keep the connection open
+                headers = await reader.readuntil(b'\r\n\r\n')
+                length = 0
+                for line in headers.split(b'\r\n'):
+                    if line.lower().startswith(b'content-length:'):
+                        length = int(line.split(b':', 1)[1])
+                if length:
+                    await reader.readexactly(length)
+
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\n'
+                    b'Content-Type: application/json\r\n'
+                    b'Content-Length: ' + str(len(self.RESPONSE_BODY)).encode() + b'\r\n'
+                    b'Connection: keep-alive\r\n\r\n' + self.RESPONSE_BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ssl.SSLError):
+            pass
+        finally:
+            writer.close()
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request HTTP clients with the shared pool against a local TLS stub server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per run')
+        parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight at once')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ssl_context = self._make_ssl_context(tmpdir)
+            asyncio.run(self._benchmark(ssl_context, options['requests'], options['concurrency']))
+
+    def _make_ssl_context(self, tmpdir: str) -> ssl.SSLContext:
+        """Create a throwaway self-signed certificate for the stub server"""
+        certfile = os.path.join(tmpdir, 'cert.pem')
+        keyfile = os.path.join(tmpdir, 'key.pem')
+        try:
+            subprocess.run(
+                [
+                    'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+                    '-keyout', keyfile, '-out', certfile, '-days', '1',
+                    '-subj', '/CN=localhost'
+                ],
+                check=True,
+                capture_output=True
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise CommandError(f"Could not generate a self-signed certificate with openssl: {e}")
+
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(certfile, keyfile)
+        return context
+
+    async def _benchmark(self, ssl_context: ssl.SSLContext, total: int, concurrency: int):
+        server = TLSStubServer(ssl_context)
+        await server.start()
+        url = f"https://127.0.0.1:{server.port}/v1/chat/completions"
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def per_request_client():
+            # Previous GrokClient behaviour: a new client (and TLS handshake) per call
+            async with semaphore:
+                async with httpx.AsyncClient(verify=False) as client:
+                    response = await client.post(url, json={'model': 'stub'})
+                    response.raise_for_status()
+
+        async def pooled_client():
+            async with semaphore:
+                client = get_http_client('benchmark', verify=False)
+                response = await client.post(url, json={'model': 'stub'})
+                response.raise_for_status()
+
+        try:
+            rows = []
+            for label, request in [('per-request', per_request_client), ('pooled', pooled_client)]:
+                server.connections = 0
+                start = time.perf_counter()
+                await asyncio.gather(*[request() for _ in range(total)])
+                elapsed = time.perf_counter() - start
+                rows.append((label, server.connections, elapsed))
+            await aclose_http_clients()
+        finally:
+            await server.stop()
+
+        self.stdout.write(f"{'client':>12} {'handshakes':>11} {'total (s)':>10} {'ms/request':>11}")
+        for label, connections, elapsed in rows:
+            self.stdout.write(
+                f"{label:>12} {connections:>11} {elapsed:>10.2f} {elapsed * 1000 / total:>11.2f}"
+            )
+
+        saved = rows[0][1] - rows[1][1]
+        self.stdout.write(self.style.SUCCESS(f"TLS handshakes saved by pooling: {saved}/{total}"))
@@ -0,0 +1,68 @@
+"""
+Django management command to move article content to the Mongo content store
+Usage: python manage.py offload_article_content [--older-than-days 7] [--batch-size 500] [--no-html]
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.news_aggregator.content_store import get_content_store_settings, offload_articles
+from apps.news_aggregator.models import Article
+
+
+class Command(BaseCommand):
+    help = 'Offload full text, raw HTML and metadata of older articles to MongoDB'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days',
+            type=int,
+            default=None,
+            help='Only articles created before this many days ago (default: OFFLOAD_AFTER_DAYS)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Articles per Mongo bulk write'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Stop after this many articles'
+        )
+        parser.add_argument(
+            '--no-html',
+            action='store_true',
+            help='Do not store raw HTML from the HTML cache'
+        )
+
+    def handle(self, *args, **options):
+        days = options['older_than_days']
+        if days is None:
+            days = get_content_store_settings()['offload_after_days']
+        cutoff = timezone.now() - timedelta(days=days)
+
+        candidates = Article.objects.filter(
+            created_at__lt=cutoff, content_ref=''
+        ).exclude(content='').order_by('id')
+
+        batch_size = options['batch_size']
+        limit = options['limit']
+        total = 0
+
+        # Offloaded rows drop out of the filter, so each batch starts from the top again
+        while limit is None or total < limit:
+            size = batch_size if limit is None else min(batch_size, limit - total)
+            batch = list(candidates[:size])
+            if not batch:
+                break
+
+            total += offload_articles(batch, include_html=not options['no_html'])
+            self.stdout.write(f"Offloaded {total} articles")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Offloaded content of {total} articles created before {cutoff:%Y-%m-%d}"
+        ))
@@ -10,6 +10,8 @@ import logging
 from apps.news_aggregator.models import Article, NewsSource, ProcessingJob
 from apps.news_aggregator.extractors.article import ArticleExtractor, EnhancedArticleExtractor
 from apps.news_aggregator.agents.coordinator import AgentCoordinator
+from apps.news_aggregator.content_store import aprefetch_full_text
+from apps.news_aggregator.document_store import get_document_store
 
 logger = logging.getLogger(__name__)
 
@@ -172,9 +174,10 @@ class Command(BaseCommand):
         )
         
         try:
-            # Run all analyses
+            # Offloaded articles load their text from the content store
+            await aprefetch_full_text([article])
             results = await coordinator.analyze_article(
-                article_content=article.content,
+                article_content=article.full_text,
                 article_id=str(article.id)
             )
             
@@ -215,6 +218,9 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.ERROR(f"Analysis failed: {str(e)}")
             )
+        finally:
+            # The loop ends with asyncio.run, so close its pooled document client
+            await get_document_store().aclose()
     
     def _get_domain_from_url(self, url: str) -> str:
         """Extract domain from URL"""
@@ -0,0 +1,49 @@
+"""
+Django management command to (re)build article search vectors
+Usage: python manage.py rebuild_search_index [--all] [--batch-size 1000]
+"""
+from django.core.management.base import BaseCommand
+
+from apps.news_aggregator.models import Article
+from apps.news_aggregator.search import update_search_vectors
+
+
+class Command(BaseCommand):
+    help = 'Compute the full-text search vector of existing articles in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Rebuild every article, not only those without a search vector'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Articles updated per UPDATE statement'
+        )
+
+    def handle(self, *args, **options):
+        articles = Article.objects.order_by('id')
+        if not options['all']:
+            articles = articles.filter(search_vector__isnull=True)
+
+        batch_size = options['batch_size']
+        total = 0
+        last_id = None
+
+        # Walk by primary key so each batch is a short transaction and progress survives restarts
+        while True:
+            batch = articles
+            if last_id is not None:
+                batch = batch.filter(id__gt=last_id)
+            ids = list(batch.values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+
+            total += update_search_vectors(ids)
+            last_id = ids[-1]
+            self.stdout.write(f"Indexed {total} articles")
+
+        self.stdout.write(self.style.SUCCESS(f"Search index updated for {total} articles"))
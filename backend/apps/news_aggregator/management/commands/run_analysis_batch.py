@@ -0,0 +1,95 @@
+"""
+Django management command to backfill analyses through the Message Batches API
+Usage: python manage.py run_analysis_batch [--types jargon timeline] [--limit 5000] [--wait]
+       python manage.py run_analysis_batch --poll
+"""
+from django.core.management.base import BaseCommand, CommandError
+import time
+import logging
+
+from apps.news_aggregator.batch import (
+    get_batch_settings, poll_analysis_batch, poll_open_batches, submit_analysis_batch
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Submit pending article analyses as a Message Batch and collect the results'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--types',
+            nargs='+',
+            default=None,
+            help='Analysis types to run (default: all)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Maximum number of requests in the batch'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-analyze articles that already have results'
+        )
+        parser.add_argument(
+            '--wait',
+            action='store_true',
+            help='Poll until the batch ends and its results are written'
+        )
+        parser.add_argument(
+            '--poll',
+            action='store_true',
+            help='Only poll open batches and collect finished ones'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=None,
+            help='Seconds between polls when waiting'
+        )
+
+    def handle(self, *args, **options):
+        if options['poll']:
+            for batch in poll_open_batches():
+                self._report(batch)
+            return
+
+        try:
+            batch = submit_analysis_batch(
+                analysis_types=options['types'],
+                limit=options['limit'],
+                force=options['force']
+            )
+        except Exception as e:
+            raise CommandError(f"Batch submission failed: {e}")
+
+        if batch is None:
+            self.stdout.write(self.style.WARNING("No pending analyses to submit"))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Submitted batch {batch.provider_batch_id} with {batch.request_count} requests "
+            f"({', '.join(batch.analysis_types)})"
+        ))
+
+        if not options['wait']:
+            return
+
+        poll_interval = options['poll_interval'] or get_batch_settings()['poll_interval']
+        while batch.status in ('submitted', 'in_progress', 'ended'):
+            time.sleep(poll_interval)
+            batch = poll_analysis_batch(batch)
+            self.stdout.write(f"  {batch.provider_batch_id}: {batch.status}")
+
+        self._report(batch)
+
+    def _report(self, batch):
+        style = self.style.ERROR if batch.status == 'failed' else self.style.SUCCESS
+        self.stdout.write(style(
+            f"{batch.provider_batch_id}: {batch.status} - {batch.succeeded_count} succeeded, "
+            f"{batch.errored_count} errored, {batch.expired_count} expired"
+        ))
@@ -38,7 +38,7 @@ class Command(BaseCommand):
                     self.style.WARNING(f"Article already exists: {existing_article.id}")
                 )
                 self.stdout.write(f"Title: {existing_article.title}")
-                self.stdout.write(f"Content length: {len(existing_article.content)} characters")
+                self.stdout.write(f"Content length: {len(existing_article.full_text)} characters")
                 return
             
             # Extract article
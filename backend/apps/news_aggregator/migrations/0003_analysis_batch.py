@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:36
+
+import django.contrib.postgres.fields
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_aggregator', '0002_processing_job_nullable_article'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisBatch',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('provider_batch_id', models.CharField(max_length=255, unique=True)),
+                ('status', models.CharField(choices=[('submitted', 'Submitted'), ('in_progress', 'In Progress'), ('ended', 'Ended'), ('collected', 'Collected'), ('failed', 'Failed')], default='submitted', max_length=20)),
+                ('analysis_types', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=20), default=list, size=None)),
+                ('request_count', models.IntegerField(default=0)),
+                ('succeeded_count', models.IntegerField(default=0)),
+                ('errored_count', models.IntegerField(default=0)),
+                ('expired_count', models.IntegerField(default=0)),
+                ('error_message', models.TextField(blank=True)),
+                ('ended_at', models.DateTimeField(blank=True, null=True)),
+                ('collected_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'analysis_batches',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status'], name='analysis_ba_status_6fed64_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:44
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_aggregator', '0003_analysis_batch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='canonical_article',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='news_aggregator.article'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='simhash',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='simhash_bands',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, default=list, size=None),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['simhash_bands'], name='articles_simhash_bands_gin'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:46
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_aggregator', '0004_article_near_duplicates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newssource',
+            name='feed_state',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='feed_urls',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.URLField(max_length=500), blank=True, default=list, size=None),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='last_polled_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='newssource',
+            name='poll_interval',
+            field=models.PositiveIntegerField(default=900),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_aggregator', '0005_news_source_feeds'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aianalysis',
+            index=models.Index(fields=['-created_at', '-id'], name='ai_analyses_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(models.OrderBy(models.F('published_at'), descending=True, nulls_last=True), models.OrderBy(models.F('created_at'), descending=True), models.OrderBy(models.F('id'), descending=True), name='articles_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:51
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension, UnaccentExtension
+from django.db import migrations
+
+
+# Greek stemming behind unaccent, so accented and unaccented spellings match
+CREATE_SEARCH_CONFIG = """
+CREATE TEXT SEARCH CONFIGURATION greek_unaccent (COPY = pg_catalog.greek);
+ALTER TEXT SEARCH CONFIGURATION greek_unaccent
+    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, greek_stem;
+"""
+
+DROP_SEARCH_CONFIG = "DROP TEXT SEARCH CONFIGURATION IF EXISTS greek_unaccent;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_aggregator', '0006_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        UnaccentExtension(),
+        TrigramExtension(),
+        migrations.RunSQL(CREATE_SEARCH_CONFIG, DROP_SEARCH_CONFIG),
+        migrations.AddField(
+            model_name='article',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='articles_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='articles_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
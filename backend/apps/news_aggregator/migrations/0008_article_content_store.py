@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_aggregator', '0007_article_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='content_ref',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='summary',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='article',
+            name='content',
+            field=models.TextField(blank=True),
+        ),
+    ]
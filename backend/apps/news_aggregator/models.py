@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models import F
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from apps.core.models import TimestampedModel, User
 import uuid
 
@@ -14,6 +17,12 @@ class NewsSource(TimestampedModel):
     is_active = models.BooleanField(default=True)
     requires_javascript = models.BooleanField(default=False)
     
+    # Feed ingestion (see feeds.py): RSS/Atom feeds and news sitemaps to poll
+    feed_urls = ArrayField(models.URLField(max_length=500), default=list, blank=True)
+    poll_interval = models.PositiveIntegerField(default=900)  # in seconds
+    last_polled_at = models.DateTimeField(null=True, blank=True)
+    feed_state = models.JSONField(default=dict, blank=True)  # per-feed validators and cursor
+    
     class Meta:
         db_table = 'news_sources'
         ordering = ['name']
@@ -30,7 +39,7 @@ class Article(TimestampedModel):
     source = models.ForeignKey(NewsSource, on_delete=models.CASCADE, related_name='articles')
     url = models.URLField(unique=True, max_length=500)
     title = models.CharField(max_length=500)
-    content = models.TextField()
+    content = models.TextField(blank=True)  # empty once offloaded, see full_text
     author = models.CharField(max_length=255, blank=True)
     published_at = models.DateTimeField(null=True, blank=True)
     
@@ -44,6 +53,20 @@ class Article(TimestampedModel):
     is_enriched = models.BooleanField(default=False)
     processing_error = models.TextField(blank=True)
     
+    # Content offloaded to the Mongo content store (see content_store.py)
+    summary = models.TextField(blank=True)
+    content_ref = models.CharField(max_length=64, blank=True)
+    
+    # Near-duplicate detection (see dedup.py)
+    simhash = models.BigIntegerField(null=True, blank=True)
+    simhash_bands = ArrayField(models.IntegerField(), default=list, blank=True)
+    canonical_article = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True, related_name='duplicates'
+    )
+    
+    # Full-text search (see search.py), maintained by signals.py
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         db_table = 'articles'
         ordering = ['-published_at', '-created_at']
@@ -51,10 +74,33 @@ class Article(TimestampedModel):
             models.Index(fields=['url']),
             models.Index(fields=['published_at']),
             models.Index(fields=['is_processed', 'is_enriched']),
+            GinIndex(fields=['simhash_bands'], name='articles_simhash_bands_gin'),
+            GinIndex(fields=['search_vector'], name='articles_search_vector_gin'),
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='articles_title_trgm'),
+            # Keyset pagination order (apps.api.pagination.ArticleKeysetPagination)
+            models.Index(
+                F('published_at').desc(nulls_last=True), F('created_at').desc(), F('id').desc(),
+                name='articles_keyset_idx'
+            ),
         ]
     
     def __str__(self):
         return self.title
+    
+    @property
+    def full_text(self) -> str:
+        """
+        Article text, loaded from the content store if it was offloaded
+
+        Raises:
+            ContentNotFound: If the offloaded document is missing
+        """
+        if not self.content_ref or self.content:
+            return self.content
+        if getattr(self, '_full_text', None) is None:
+            from .content_store import load_content
+            self._full_text = load_content(self.content_ref)
+        return self._full_text
 
 
 class AIAnalysis(TimestampedModel):
@@ -84,6 +130,7 @@ class AIAnalysis(TimestampedModel):
         indexes = [
             models.Index(fields=['analysis_type']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['-created_at', '-id'], name='ai_analyses_keyset_idx'),
         ]
     
     def __str__(self):
@@ -120,4 +167,39 @@ class ProcessingJob(TimestampedModel):
         ]
     
     def __str__(self):
-        return f"{self.job_type} - {self.status}"
\ No newline at end of file
+        return f"{self.job_type} - {self.status}"
+
+
+class AnalysisBatch(TimestampedModel):
+    """
+    Tracks a Message Batches API submission of (article, analysis type) requests
+    """
+    STATUS_CHOICES = [
+        ('submitted', 'Submitted'),
+        ('in_progress', 'In Progress'),
+        ('ended', 'Ended'),
+        ('collected', 'Collected'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    provider_batch_id = models.CharField(max_length=255, unique=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='submitted')
+    analysis_types = ArrayField(models.CharField(max_length=20), default=list)
+    request_count = models.IntegerField(default=0)
+    succeeded_count = models.IntegerField(default=0)
+    errored_count = models.IntegerField(default=0)
+    expired_count = models.IntegerField(default=0)
+    error_message = models.TextField(blank=True)
+    ended_at = models.DateTimeField(null=True, blank=True)
+    collected_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'analysis_batches'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status']),
+        ]
+    
+    def __str__(self):
+        return f"{self.provider_batch_id} - {self.status}"
\ No newline at end of file
@@ -0,0 +1,296 @@
+"""
+Task progress publishing
+
+Tasks report the stages they go through (fetch, parse, each agent, database writes)
+to a ProgressReporter, which pushes them to the `task_{id}` and `article_{id}`
+channel-layer groups and keeps the `task_status:{id}` entry that
+ProcessingProgressConsumer sends to newly connected clients (read it with
+get_task_status). On Redis the entry is a hash with one field per stage, so
+reporters of the same task running on different workers never overwrite each
+other's stages.
+
+Events are coalesced: at most one message per group and one cache write every
+`min_interval` seconds, each carrying all events since the previous one; events
+held back are sent by a timer once the interval has passed. Clients get pushed
+updates without polling Celery results, and fast stages don't turn into message
+storms.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+import json
+import logging
+import threading
+import time
+
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .utils import get_redis_cache_client
+
+logger = logging.getLogger(__name__)
+
+
+STARTED = 'started'
+COMPLETED = 'completed'
+FAILED = 'failed'
+RETRYING = 'retrying'
+
+
+def get_progress_settings() -> Dict[str, Any]:
+    config = getattr(settings, 'TASK_PROGRESS', {})
+    return {
+        'min_interval': config.get('MIN_INTERVAL', 0.5),
+        'status_ttl': config.get('STATUS_TTL', 3600),
+    }
+
+
+TERMINAL_STATES = ('SUCCESS', 'FAILURE')
+
+
+def task_status_key(task_id: str) -> str:
+    return f"task_status:{task_id}"
+
+
+def _status_from_hash(fields: Dict[bytes, bytes]) -> Dict[str, Any]:
+    """Status dict from the fields of a task status hash"""
+    values = {key.decode(): json.loads(value) for key, value in fields.items()}
+    status = {
+        'task_id': values.get('task_id'),
+        # A finished task stays finished whatever late subtask events set
+        'state': values.get('final_state') or values.get('state'),
+        'stage': values.get('stage'),
+        'stages': {key[len('stage:'):]: value for key, value in values.items() if key.startswith('stage:')},
+        'article_ids': [key[len('article:'):] for key in values if key.startswith('article:')],
+        'updated_at': values.get('updated_at'),
+    }
+    for key in ('result', 'error'):
+        if key in values:
+            status[key] = values[key]
+    return status
+
+
+def get_task_status(task_id: str) -> Optional[Dict[str, Any]]:
+    """Last published status of a task, or None if nothing was published (or it expired)"""
+    key = task_status_key(task_id)
+    redis_cache = get_redis_cache_client(key)
+    if redis_cache is None:
+        return cache.get(key)
+
+    client, full_key, _ = redis_cache
+    fields = client.hgetall(full_key)
+    return _status_from_hash(fields) if fields else None
+
+
+class ProgressReporter:
+    """
+    Publishes the progress of one task
+
+    Several Celery tasks can report for the same task id (per-agent analysis tasks
+    report under their dispatcher's id): pass `to_dict()` to the subtask and rebuild
+    the reporter there with `from_dict()`. Stages of all of them are merged in the
+    stored status.
+
+    Meant for synchronous task code (not coroutines on the worker runtime loop):
+    sends go through that loop and wait for it.
+    """
+
+    def __init__(self, task_id: str, article_ids: Iterable[str] = (), min_interval: Optional[float] = None):
+        config = get_progress_settings()
+        self.task_id = task_id
+        self.article_ids = list(dict.fromkeys(str(article_id) for article_id in article_ids if article_id))
+        self.min_interval = config['min_interval'] if min_interval is None else min_interval
+        self.status_ttl = config['status_ttl']
+        self.state = 'PROGRESS'
+        self.stages: Dict[str, str] = {}
+        self.current: Optional[str] = None
+        self._pending: List[Dict[str, Any]] = []
+        self._last_sent = 0.0
+        self._timer: Optional[threading.Timer] = None
+        # _lock guards the pending events, _send_lock keeps publishes in order
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'task_id': self.task_id, 'article_ids': self.article_ids}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ProgressReporter':
+        return cls(data['task_id'], article_ids=data.get('article_ids', []))
+
+    def add_article(self, article_id: Any):
+        """Also publish to an article's group, e.g. once extraction created the article"""
+        article_id = str(article_id)
+        if article_id not in self.article_ids:
+            self.article_ids.append(article_id)
+
+    def stage(self, name: str, status: str = STARTED, **data):
+        """
+        Record a stage event
+
+        Starting a stage completes the one started before it, so sequential stages
+        need a single call each.
+        """
+        if status == STARTED and self.current and self.stages.get(self.current) == STARTED:
+            self.stages[self.current] = COMPLETED
+        if status == STARTED:
+            self.current = name
+
+        self.stages[name] = status
+        self._record({'stage': name, 'status': status, **data})
+
+    def complete(self, result: Optional[Dict[str, Any]] = None):
+        """Mark the task finished and publish immediately"""
+        if self.current and self.stages.get(self.current) == STARTED:
+            self.stages[self.current] = COMPLETED
+        self.state = 'SUCCESS'
+        self._record({'stage': 'done', 'status': COMPLETED, 'result': result}, force=True)
+
+    def fail(self, error: str):
+        """Mark the task failed and publish immediately"""
+        if self.current and self.stages.get(self.current) == STARTED:
+            self.stages[self.current] = FAILED
+        self.state = 'FAILURE'
+        self._record({'stage': self.current or 'task', 'status': FAILED, 'error': error}, force=True)
+
+    def _record(self, event: Dict[str, Any], force: bool = False):
+        event['at'] = timezone.now().isoformat()
+        with self._lock:
+            self._pending.append(event)
+            wait = 0.0 if force else self._last_sent + self.min_interval - time.monotonic()
+            if 0 < wait and self._timer is None:
+                self._timer = threading.Timer(wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if wait <= 0:
+            self.flush()
+
+    def flush(self):
+        """Publish pending events now (call at the end of a task so none wait for the timer)"""
+        with self._send_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._pending:
+                    return
+                events, self._pending = self._pending, []
+                self._last_sent = time.monotonic()
+                snapshot = (self.state, dict(self.stages), list(self.article_ids))
+
+            status = self._write_status(events[-1], *snapshot)
+            self._send(snapshot[0], status, events, snapshot[2])
+
+    def _write_status(
+        self,
+        last_event: Dict[str, Any],
+        state: str,
+        stages: Dict[str, str],
+        article_ids: List[str]
+    ) -> Dict[str, Any]:
+        """Merge this reporter's state into the stored status; returns the merged status"""
+        key = task_status_key(self.task_id)
+        redis_cache = get_redis_cache_client(key)
+        if redis_cache is not None:
+            try:
+                return self._write_status_hash(redis_cache, last_event, state, stages, article_ids)
+            except Exception as e:
+                logger.warning(f"Failed to store status of task {self.task_id}: {e}")
+                return self._merge_status({}, last_event, state, stages, article_ids)
+
+        # Other cache backends (local development): a plain read-modify-write
+        try:
+            previous = cache.get(key) or {}
+        except Exception:
+            previous = {}
+
+        status = self._merge_status(previous, last_event, state, stages, article_ids)
+        try:
+            cache.set(key, status, self.status_ttl)
+        except Exception as e:
+            logger.warning(f"Failed to store status of task {self.task_id}: {e}")
+        return status
+
+    def _merge_status(
+        self,
+        previous: Dict[str, Any],
+        last_event: Dict[str, Any],
+        state: str,
+        stages: Dict[str, str],
+        article_ids: List[str]
+    ) -> Dict[str, Any]:
+        if state == 'PROGRESS' and previous.get('state') in TERMINAL_STATES:
+            # Late events of a subtask don't reopen a finished task
+            state = previous['state']
+            last_event = {**{k: previous[k] for k in ('result', 'error') if k in previous}, **last_event}
+
+        status = {
+            'task_id': self.task_id,
+            'state': state,
+            'stage': last_event['stage'],
+            'stages': {**previous.get('stages', {}), **stages},
+            'article_ids': list(dict.fromkeys(previous.get('article_ids', []) + article_ids)),
+            'updated_at': last_event['at'],
+        }
+        if 'result' in last_event:
+            status['result'] = last_event['result']
+        if 'error' in last_event:
+            status['error'] = last_event['error']
+        return status
+
+    def _write_status_hash(
+        self,
+        redis_cache,
+        last_event: Dict[str, Any],
+        state: str,
+        stages: Dict[str, str],
+        article_ids: List[str]
+    ) -> Dict[str, Any]:
+        """Set only this reporter's fields of the status hash and read it back, in one transaction"""
+        client, full_key, _ = redis_cache
+        fields = {
+            'task_id': self.task_id,
+            'final_state' if state in TERMINAL_STATES else 'state': state,
+            'stage': last_event['stage'],
+            'updated_at': last_event['at'],
+            **{f"stage:{name}": status for name, status in stages.items()},
+            **{f"article:{article_id}": 1 for article_id in article_ids},
+        }
+        for key in ('result', 'error'):
+            if key in last_event:
+                fields[key] = last_event[key]
+
+        pipeline = client.pipeline(transaction=True)
+        pipeline.hset(full_key, mapping={
+            key: json.dumps(value, cls=DjangoJSONEncoder) for key, value in fields.items()
+        })
+        pipeline.expire(full_key, self.status_ttl)
+        pipeline.hgetall(full_key)
+        return _status_from_hash(pipeline.execute()[-1])
+
+    def _send(self, state: str, status: Dict[str, Any], events: List[Dict[str, Any]], article_ids: List[str]):
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+
+        from .runtime import run_async
+
+        data = {**status, 'events': events}
+        task_message = {
+            'SUCCESS': 'task_complete',
+            'FAILURE': 'task_failed',
+        }.get(state, 'task_progress')
+        # ArticleUpdateConsumer clients refresh the article on article_update
+        article_message = 'article_update' if state == 'SUCCESS' else 'analysis_progress'
+
+        async def send_all():
+            await channel_layer.group_send(f"task_{self.task_id}", {'type': task_message, 'data': data})
+            for article_id in article_ids:
+                await channel_layer.group_send(f"article_{article_id}", {'type': article_message, 'data': data})
+
+        try:
+            run_async(send_all(), timeout=5)
+        except Exception as e:
+            # Progress is best effort and must never fail the task
+            logger.warning(f"Failed to publish progress of task {self.task_id}: {e}")
@@ -0,0 +1,173 @@
+"""
+Celery queue routing and scheduling for extraction and analysis work
+Every agent runs as its own task on a queue picked from the agent's ComplexityLevel,
+so cheap agents are served by their own workers and are never stuck behind slow ones
+(fact checks with web search), which scale independently.
+
+Work is also split into two priority classes. Interactive requests use the base
+queues; backfills (bulk ingestion, feed polling, periodic jobs) use a `_backfill`
+twin of each queue. Workers read queues in declaration order (Redis
+`queue_order_strategy='priority'`), interactive first, so a large backfill only
+runs on capacity live users are not using. Within a queue, the broker message
+priority follows the request's deadline hint, and users who submit more than their
+fair share of interactive requests are demoted to the backfill class.
+"""
+from typing import Any, Dict, Optional
+from dataclasses import dataclass, asdict
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .agents.base import BaseAgent, ComplexityLevel
+
+logger = logging.getLogger(__name__)
+
+
+INTERACTIVE = 'interactive'
+BACKFILL = 'backfill'
+PRIORITY_CLASSES = (INTERACTIVE, BACKFILL)
+
+DEFAULT_ANALYSIS_QUEUES = {
+    ComplexityLevel.SIMPLE.name: 'analysis_fast',
+    ComplexityLevel.MEDIUM.name: 'analysis_fast',
+    ComplexityLevel.HIGH.name: 'analysis_slow',
+    ComplexityLevel.VERY_HIGH.name: 'analysis_slow',
+}
+
+
+def get_queue_settings() -> Dict[str, Any]:
+    config = getattr(settings, 'NEWS_AGGREGATOR', {})
+    scheduling = config.get('SCHEDULING', {})
+    return {
+        'analysis_queues': {**DEFAULT_ANALYSIS_QUEUES, **config.get('ANALYSIS_QUEUES', {})},
+        'merge_queue': config.get('ANALYSIS_MERGE_QUEUE', 'analysis_fast'),
+        'default_queue': getattr(settings, 'CELERY_TASK_DEFAULT_QUEUE', 'celery'),
+        # Interactive requests per user and window before further ones are demoted
+        'fair_share_requests': scheduling.get('FAIR_SHARE_REQUESTS', 20),
+        'fair_share_window': scheduling.get('FAIR_SHARE_WINDOW', 60),
+        # Deadline (seconds) assumed when a request gives none
+        'default_deadlines': {
+            INTERACTIVE: 60,
+            BACKFILL: 6 * 3600,
+            **scheduling.get('DEFAULT_DEADLINES', {}),
+        },
+        # (deadline up to N seconds, broker priority); 0 is served first on Redis
+        'deadline_priorities': scheduling.get('DEADLINE_PRIORITIES', [(30, 0), (300, 3), (3600, 6)]),
+    }
+
+
+def queue_for_complexity(complexity: ComplexityLevel) -> str:
+    """Celery queue serving agents of the given complexity"""
+    return get_queue_settings()['analysis_queues'][complexity.name]
+
+
+def agent_queue(agent: BaseAgent) -> str:
+    """Celery queue for one agent's analysis task"""
+    return queue_for_complexity(agent.config.complexity)
+
+
+def merge_queue() -> str:
+    """Celery queue for the callback that merges per-agent results"""
+    return get_queue_settings()['merge_queue']
+
+
+def class_queue(base_queue: str, priority_class: str) -> str:
+    """Queue of the given priority class for a base queue"""
+    return base_queue if priority_class == INTERACTIVE else f"{base_queue}_{BACKFILL}"
+
+
+def deadline_priority(deadline_seconds: float) -> int:
+    """Broker message priority for a deadline hint: the sooner, the lower (more urgent)"""
+    for max_deadline, priority in get_queue_settings()['deadline_priorities']:
+        if deadline_seconds <= max_deadline:
+            return priority
+    return 9
+
+
+@dataclass
+class Schedule:
+    """Where and how urgently a request's tasks are queued"""
+    priority_class: str
+    priority: int
+
+    def options(self, base_queue: Optional[str] = None) -> Dict[str, Any]:
+        """apply_async/Signature.set options for a task that belongs on base_queue"""
+        base_queue = base_queue or get_queue_settings()['default_queue']
+        return {'queue': class_queue(base_queue, self.priority_class), 'priority': self.priority}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Schedule':
+        return cls(priority_class=data['priority_class'], priority=data['priority'])
+
+
+def over_fair_share(user_id: Any, cost: int = 1) -> bool:
+    """Charge cost interactive requests to user_id; True once the user exceeds their share"""
+    config = get_queue_settings()
+    key = f"fair_share:{user_id}"
+    try:
+        cache.add(key, 0, config['fair_share_window'])
+        return cache.incr(key, cost) > config['fair_share_requests']
+    except Exception as e:
+        # Without the shared cache every request keeps its requested class
+        logger.warning(f"Fair share backend unavailable: {e}")
+        return False
+
+
+def plan_schedule(
+    priority_class: Optional[str] = None,
+    user_id: Any = None,
+    deadline_seconds: Optional[float] = None,
+    cost: int = 1
+) -> Schedule:
+    """
+    Decide the priority class and broker priority of a request
+
+    Args:
+        priority_class: Requested class (default: interactive)
+        user_id: Requesting user; anonymous requests are not fair-share limited, but
+            only single ones (cost 1) may be interactive
+        deadline_seconds: Deadline hint, in seconds from now
+        cost: Units of work (e.g. URLs) the request is charged to the fair share
+
+    Returns:
+        The Schedule to enqueue the request's tasks with
+    """
+    priority_class = priority_class or INTERACTIVE
+    if priority_class == INTERACTIVE:
+        if user_id is None and cost > 1:
+            priority_class = BACKFILL
+        elif user_id is not None and over_fair_share(user_id, cost):
+            logger.info(f"User {user_id} is over their interactive share, queueing as backfill")
+            priority_class = BACKFILL
+
+    if deadline_seconds is None:
+        deadline_seconds = get_queue_settings()['default_deadlines'][priority_class]
+    return Schedule(priority_class=priority_class, priority=deadline_priority(deadline_seconds))
+
+
+def queue_depths() -> Dict[str, Any]:
+    """
+    Messages waiting in each declared Celery queue, and totals per priority class
+
+    Tasks already reserved by workers are not counted.
+    """
+    from celery import current_app
+
+    depths = {}
+    with current_app.connection_for_read() as connection:
+        channel = connection.default_channel
+        for queue in current_app.conf.task_queues or []:
+            try:
+                depths[queue.name] = channel.queue_declare(queue=queue.name, passive=True).message_count
+            except Exception:
+                # Passive declare fails for queues nothing was ever sent to
+                depths[queue.name] = 0
+
+    totals = {priority_class: 0 for priority_class in PRIORITY_CLASSES}
+    for name, depth in depths.items():
+        totals[BACKFILL if name.endswith(f"_{BACKFILL}") else INTERACTIVE] += depth
+    return {'queues': depths, **totals}
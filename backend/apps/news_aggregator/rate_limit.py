@@ -0,0 +1,320 @@
+"""
+Provider-aware rate limiting for LLM API calls
+
+Each (provider, model) pair gets a limiter that enforces requests/minute and
+tokens/minute budgets shared by all workers through the cache (Redis), plus an AIMD
+adaptive concurrency limit: it grows slowly while calls succeed and halves on every
+429, honouring the provider's retry-after hint across workers. Calls waiting for a
+concurrency slot sleep on a condition that finishing calls notify. Transient failures
+(timeouts, conflicts, 5xx, dropped connections) are retried with exponential backoff
+without touching the concurrency limit. Shared-cache calls run in a thread so they
+never block the event loop.
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from dataclasses import dataclass
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_RATE_LIMITS = {
+    'anthropic': {
+        'default': {'REQUESTS_PER_MINUTE': 50, 'TOKENS_PER_MINUTE': 40000, 'MAX_CONCURRENCY': 8},
+    },
+    'xai': {
+        'default': {'REQUESTS_PER_MINUTE': 60, 'TOKENS_PER_MINUTE': 100000, 'MAX_CONCURRENCY': 8},
+    },
+}
+
+
+class RateLimitExceeded(Exception):
+    """Raised by API clients when the provider answers 429 / overloaded"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TransientAPIError(Exception):
+    """Raised by API clients for failures worth retrying as is (408, 409, 5xx, connection errors)"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class RateLimit:
+    """Budget for one provider/model"""
+    requests_per_minute: int
+    tokens_per_minute: int
+    max_concurrency: int
+
+
+def get_rate_limit(provider: str, model: str) -> RateLimit:
+    """Look up the configured limits for a model, falling back to the provider default"""
+    configured = getattr(settings, 'RATE_LIMITS', {})
+    provider_limits = {**DEFAULT_RATE_LIMITS.get(provider, {}), **configured.get(provider, {})}
+    limits = provider_limits.get(model) or provider_limits.get('default') or {}
+
+    return RateLimit(
+        requests_per_minute=limits.get('REQUESTS_PER_MINUTE', 50),
+        tokens_per_minute=limits.get('TOKENS_PER_MINUTE', 40000),
+        max_concurrency=limits.get('MAX_CONCURRENCY', 8)
+    )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a retry-after header value given in seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class RateLimiter:
+    """Shared RPM/TPM windows plus AIMD concurrency for one provider/model"""
+
+    # AIMD tuning: concurrency grows by roughly one slot per `limit` successes
+    # and is halved on every rate-limit response
+    INCREASE_STEP = 1.0
+    DECREASE_FACTOR = 0.5
+    DEFAULT_BACKOFF = 10.0
+    # Exponential backoff for transient errors without a retry-after hint
+    RETRY_BASE_DELAY = 1.0
+    MAX_RETRY_DELAY = 30.0
+
+    def __init__(self, provider: str, model: str, limits: RateLimit):
+        self.provider = provider
+        self.model = model
+        self.limits = limits
+        self.concurrency_limit = float(max(1, limits.max_concurrency // 2))
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        # Used only when the shared cache is unreachable
+        self._local_windows: Dict[Tuple[str, int], int] = {}
+        self._local_lock = threading.Lock()
+        # Conditions belong to the loop that created them, so keep one per loop
+        self._slot_conditions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Condition]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @property
+    def _prefix(self) -> str:
+        return f"ratelimit:{self.provider}:{self.model}"
+
+    async def acquire(self, estimated_tokens: int):
+        """Wait until a call with the given token estimate fits every budget"""
+        while True:
+            # Hold a slot while the shared budgets are checked
+            await self._take_slot()
+            try:
+                wait = await sync_to_async(self._reserve_budgets, thread_sensitive=False)(estimated_tokens)
+            except BaseException:
+                await self._free_slot()
+                raise
+            if wait <= 0:
+                return
+            await self._free_slot()
+
+            # Jitter keeps workers that wake up together from stampeding
+            await asyncio.sleep(wait + random.uniform(0, min(1.0, wait / 10)))
+
+    async def release(self, estimated_tokens: int, actual_tokens: Optional[int] = None):
+        """Finish a call, correcting the token reservation with actual usage"""
+        await self._free_slot()
+        if actual_tokens is not None and actual_tokens != estimated_tokens:
+            await sync_to_async(self._adjust, thread_sensitive=False)('tokens', actual_tokens - estimated_tokens)
+
+    def record_success(self):
+        """Additive increase of the concurrency limit"""
+        self.concurrency_limit = min(
+            float(self.limits.max_concurrency),
+            self.concurrency_limit + self.INCREASE_STEP / self.concurrency_limit
+        )
+
+    async def record_rate_limited(self, retry_after: Optional[float]):
+        """Multiplicative decrease and a shared pause of retry-after seconds"""
+        self.concurrency_limit = max(1.0, self.concurrency_limit * self.DECREASE_FACTOR)
+        backoff = retry_after if retry_after is not None else self.DEFAULT_BACKOFF
+        self.blocked_until = max(self.blocked_until, time.time() + backoff)
+
+        try:
+            await sync_to_async(cache.set, thread_sensitive=False)(
+                f"{self._prefix}:blocked_until", self.blocked_until, int(backoff) + 1
+            )
+        except Exception as e:
+            logger.debug(f"Could not share rate-limit backoff: {e}")
+
+        logger.warning(
+            f"Rate limited by {self.provider} for {self.model}: backing off {backoff:.1f}s, "
+            f"concurrency limit now {int(self.concurrency_limit)}"
+        )
+
+    async def execute(
+        self,
+        coro_factory: Callable[[], Awaitable[Any]],
+        estimated_tokens: int,
+        count_tokens: Optional[Callable[[Any], Optional[int]]] = None,
+        max_attempts: int = 4
+    ) -> Any:
+        """
+        Run an API call under the limiter, retrying rate-limit and transient errors in place
+
+        Args:
+            coro_factory: Creates the API call coroutine; raises RateLimitExceeded on 429
+                and TransientAPIError on failures worth retrying
+            estimated_tokens: Tokens reserved before the call
+            count_tokens: Extracts actual token usage from the result
+            max_attempts: Attempts before the error is raised to the caller
+
+        Returns:
+            The API call result
+        """
+        for attempt in range(max_attempts):
+            await self.acquire(estimated_tokens)
+            try:
+                result = await coro_factory()
+            except RateLimitExceeded as e:
+                await self.release(estimated_tokens)
+                await self.record_rate_limited(e.retry_after)
+                if attempt == max_attempts - 1:
+                    raise
+                continue
+            except TransientAPIError as e:
+                await self.release(estimated_tokens)
+                if attempt == max_attempts - 1:
+                    raise
+                delay = e.retry_after
+                if delay is None:
+                    delay = min(self.MAX_RETRY_DELAY, self.RETRY_BASE_DELAY * 2 ** attempt)
+                logger.warning(f"{self.provider} call for {self.model} failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay + random.uniform(0, delay / 4))
+                continue
+            except BaseException:
+                await self.release(estimated_tokens)
+                raise
+
+            # Grow the limit first so releasing the slot wakes every waiter that now fits
+            self.record_success()
+            await self.release(estimated_tokens, count_tokens(result) if count_tokens else None)
+            return result
+
+    def _slot_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        condition = self._slot_conditions.get(loop)
+        if condition is None:
+            condition = self._slot_conditions[loop] = asyncio.Condition()
+        return condition
+
+    def _has_free_slot(self) -> bool:
+        return self.in_flight < int(self.concurrency_limit)
+
+    async def _take_slot(self):
+        """Wait until a concurrency slot is free and take it"""
+        condition = self._slot_condition()
+        async with condition:
+            await condition.wait_for(self._has_free_slot)
+            self.in_flight += 1
+
+    async def _free_slot(self):
+        """Give a slot back and wake the calls waiting for one"""
+        self.in_flight = max(0, self.in_flight - 1)
+        current = asyncio.get_running_loop()
+        for loop, condition in list(self._slot_conditions.items()):
+            if loop is current:
+                await self._notify(condition)
+            elif loop.is_running():
+                # Slots are shared by every loop of the process
+                asyncio.run_coroutine_threadsafe(self._notify(condition), loop)
+
+    @staticmethod
+    async def _notify(condition: asyncio.Condition):
+        async with condition:
+            condition.notify_all()
+
+    def _reserve_budgets(self, estimated_tokens: int) -> float:
+        """Reserve one request and the tokens; returns seconds to wait if either does not fit"""
+        wait = self._backoff_remaining()
+        if wait > 0:
+            return wait
+        wait = self._reserve('requests', 1, self.limits.requests_per_minute)
+        if wait > 0:
+            return wait
+        wait = self._reserve('tokens', estimated_tokens, self.limits.tokens_per_minute)
+        if wait > 0:
+            self._unreserve('requests', 1)
+        return wait
+
+    def _backoff_remaining(self) -> float:
+        """Seconds left in a backoff started by this or another worker"""
+        blocked_until = self.blocked_until
+        try:
+            shared = cache.get(f"{self._prefix}:blocked_until")
+            if shared:
+                blocked_until = max(blocked_until, shared)
+        except Exception:
+            pass
+        return blocked_until - time.time()
+
+    def _window(self) -> Tuple[int, float]:
+        """Current one-minute window and seconds until it ends"""
+        now = time.time()
+        return int(now // 60), 60 - (now % 60)
+
+    def _reserve(self, kind: str, amount: int, limit: int) -> float:
+        """Reserve amount in the current window; returns seconds to wait if it does not fit"""
+        window, remaining = self._window()
+        used = self._adjust(kind, amount, window)
+
+        # A single oversized call is still allowed into an otherwise empty window
+        if used > limit and used - amount > 0:
+            self._adjust(kind, -amount, window)
+            return remaining
+        return 0.0
+
+    def _unreserve(self, kind: str, amount: int):
+        self._adjust(kind, -amount)
+
+    def _adjust(self, kind: str, delta: int, window: Optional[int] = None) -> int:
+        """Atomically add delta to a window counter and return the new value"""
+        if window is None:
+            window, _ = self._window()
+        key = f"{self._prefix}:{kind}:{window}"
+
+        try:
+            cache.add(key, 0, 120)
+            return cache.incr(key, delta)
+        except Exception:
+            local_key = (kind, window)
+            with self._local_lock:
+                self._local_windows = {k: v for k, v in self._local_windows.items() if k[1] >= window - 1}
+                self._local_windows[local_key] = self._local_windows.get(local_key, 0) + delta
+                return self._local_windows[local_key]
+
+
+_rate_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+
+
+def get_rate_limiter(provider: str, model: str) -> RateLimiter:
+    """Get or create the process-wide limiter for a provider/model"""
+    key = (provider, model)
+    if key not in _rate_limiters:
+        _rate_limiters[key] = RateLimiter(provider, model, get_rate_limit(provider, model))
+    return _rate_limiters[key]
+
+
+def estimate_tokens(*texts: str, max_output_tokens: int = 0) -> int:
+    """Rough token estimate for budget reservation (about 3 characters per token for Greek)"""
+    return sum(len(text) for text in texts if text) // 3 + max_output_tokens
@@ -0,0 +1,133 @@
+"""
+Worker-level async runtime
+Runs one long-lived event loop per process in a background thread, so sync code
+(Celery tasks, management commands) can submit coroutines without paying for a new
+event loop, HTTP connection pools and client state on every call.
+"""
+from typing import Any, Awaitable, Optional
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRuntime:
+    """Long-lived event loop running in a daemon thread with a submit/await bridge"""
+
+    def __init__(self, name: str = 'news-copilot-async'):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runtime event loop, started on first access"""
+        self._ensure_started()
+        return self._loop
+
+    def _ensure_started(self):
+        """Start the loop thread, restarting it in forked child processes"""
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+
+            # A forked child inherits the loop object but not the thread running it
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=run_loop, name=self.name, daemon=True)
+            thread.start()
+            started.wait()
+
+            self._loop = loop
+            self._thread = thread
+            self._pid = os.getpid()
+            logger.info(f"Async runtime started in process {self._pid}")
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        """Schedule a coroutine on the runtime loop and return a concurrent future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the runtime loop and block until it finishes
+
+        Args:
+            coro: Coroutine to run
+            timeout: Optional timeout in seconds
+
+        Returns:
+            The coroutine result
+        """
+        if self._loop is not None and threading.current_thread() is self._thread:
+            raise RuntimeError("AsyncRuntime.run() cannot be called from the runtime loop itself")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Timeouts and task interruptions (e.g. Celery soft time limits)
+            # must not leave the coroutine running in the background
+            future.cancel()
+            raise
+
+    def shutdown(self, timeout: float = 10.0):
+        """Close pooled resources, cancel pending tasks and stop the loop thread"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or self._pid != os.getpid() or not thread.is_alive():
+                self._loop = None
+                return
+
+            from .document_store import get_document_store
+            from .http_pool import aclose_http_clients
+
+            async def close_resources():
+                # Flush buffered document writes before their timers are cancelled below
+                await get_document_store().aclose()
+                await aclose_http_clients()
+                pending = [
+                    task for task in asyncio.all_tasks()
+                    if task is not asyncio.current_task()
+                ]
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+            try:
+                asyncio.run_coroutine_threadsafe(close_resources(), loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"Error while shutting down async runtime: {e}")
+
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+
+            self._loop = None
+            self._thread = None
+            logger.info(f"Async runtime stopped in process {os.getpid()}")
+
+
+# Process-wide runtime
+_runtime = AsyncRuntime()
+
+
+def get_async_runtime() -> AsyncRuntime:
+    """Get the process-wide async runtime"""
+    return _runtime
+
+
+def run_async(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the process-wide runtime loop and wait for the result"""
+    return _runtime.run(coro, timeout=timeout)
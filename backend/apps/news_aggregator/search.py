@@ -0,0 +1,130 @@
+"""
+Full-text article search on PostgreSQL
+Articles carry a stored tsvector (title weighted above content) built with the
+`greek_unaccent` text search configuration: the Greek snowball stemmer behind
+`unaccent`, so "κυβέρνηση" and "κυβερνηση" match. Titles also have a trigram index,
+which catches misspelled and partial title queries the stemmer would miss.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity,
+)
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce, NullIf
+
+from .models import Article
+
+logger = logging.getLogger(__name__)
+
+
+SEARCH_CONFIG = 'greek_unaccent'
+
+
+def get_search_settings() -> Dict[str, Any]:
+    config = getattr(settings, 'SEARCH', {})
+    return {
+        'max_results': config.get('MAX_RESULTS', 50),
+        'title_similarity_weight': config.get('TITLE_SIMILARITY_WEIGHT', 0.5),
+        'headline_max_words': config.get('HEADLINE_MAX_WORDS', 35),
+        'headline_fragments': config.get('HEADLINE_FRAGMENTS', 2),
+    }
+
+
+def article_search_vector() -> SearchVector:
+    """Expression for Article.search_vector"""
+    return (
+        SearchVector(Coalesce('title', Value('')), weight='A', config=SEARCH_CONFIG)
+        + SearchVector(Coalesce('content', Value('')), weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(article_ids: Iterable[Any]) -> int:
+    """
+    Recompute the stored search vector of the given articles in one UPDATE
+
+    Articles whose content was offloaded keep the vector built from their full text.
+    """
+    article_ids = list(article_ids)
+    if not article_ids:
+        return 0
+    return Article.objects.filter(id__in=article_ids, content_ref='').update(
+        search_vector=article_search_vector()
+    )
+
+
+def search_articles(
+    query: str,
+    limit: int = 20,
+    offset: int = 0,
+    source_id: Optional[int] = None
+) -> List[Article]:
+    """
+    Ranked keyword search over titles and content
+
+    Matches come from the tsvector (websearch syntax: quoted phrases, OR, -exclusions)
+    or from trigram similarity on the title. Ranking runs in one query over the
+    indexes; headline snippets, which need the full content, are computed in a second
+    query for the returned page only.
+
+    Args:
+        query: User query
+        limit: Page size (capped at MAX_RESULTS)
+        offset: Number of results to skip
+        source_id: Restrict to one NewsSource
+
+    Returns:
+        Articles annotated with `rank` and `headline`, best match first
+    """
+    config = get_search_settings()
+    limit = max(1, min(limit, config['max_results']))
+    search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+
+    matches = Article.objects.filter(
+        Q(search_vector=search_query) | Q(title__trigram_similar=query)
+    )
+    if source_id:
+        matches = matches.filter(source_id=source_id)
+
+    ranked = list(
+        matches.annotate(
+            # Trigram-only matches may have no vector yet; they rank on similarity alone
+            rank=Coalesce(
+                SearchRank(F('search_vector'), search_query, cover_density=True), Value(0.0)
+            ) + config['title_similarity_weight'] * TrigramSimilarity('title', query)
+        )
+        .order_by('-rank', '-published_at')
+        .values_list('id', 'rank')[offset:offset + limit]
+    )
+    if not ranked:
+        return []
+
+    ranks = dict(ranked)
+    articles = Article.objects.filter(id__in=ranks).select_related('source').defer('content').annotate(
+        # Offloaded articles highlight their summary
+        headline=SearchHeadline(
+            Coalesce(NullIf('content', Value('')), 'summary'),
+            search_query,
+            config=SEARCH_CONFIG,
+            start_sel='<mark>',
+            stop_sel='</mark>',
+            max_words=config['headline_max_words'],
+            min_words=min(15, config['headline_max_words']),
+            max_fragments=config['headline_fragments'],
+        )
+    )
+
+    by_id = {article.id: article for article in articles}
+    results = []
+    for article_id, rank in ranked:
+        article = by_id.get(article_id)
+        if article is not None:
+            article.rank = rank
+            results.append(article)
+    return results
@@ -0,0 +1,21 @@
+"""
+Signal handlers for news aggregator models
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Article
+
+SEARCH_FIELDS = {'title', 'content'}
+
+
+@receiver(post_save, sender=Article)
+def update_article_search_vector(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Keep the stored search vector in step with the title and content"""
+    if raw:
+        return
+    if update_fields is not None and not SEARCH_FIELDS.intersection(update_fields):
+        return
+
+    from .search import update_search_vectors
+    update_search_vectors([instance.pk])
@@ -0,0 +1,266 @@
+"""
+Request coalescing (single-flight) for duplicate work
+Concurrent callers asking for the same key share one running computation, in-process
+through shared futures and across workers through a lease held in the shared cache.
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+import uuid
+import weakref
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared call whose leader was cancelled, so its waiters take over instead"""
+
+
+class SingleFlight:
+    """In-process coalescing of concurrent async calls that share a key"""
+
+    def __init__(self):
+        # Futures belong to the loop that created them
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() unless a call with the same key is already running, in which case wait for it
+
+        Args:
+            key: Identity of the computation
+            fn: Zero-argument coroutine factory doing the work
+
+        Returns:
+            The (shared) result of fn()
+        """
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+
+        existing = calls.get(key)
+        while existing is not None:
+            logger.debug(f"Joining in-flight call for {key}")
+            try:
+                # Shield so one waiter being cancelled does not cancel the shared work
+                return await asyncio.shield(existing)
+            except _LeaderCancelled:
+                # The key is free again: the first waiter to get here runs fn(), the rest join it
+                existing = calls.get(key)
+
+        future = loop.create_future()
+        # Avoid "exception was never retrieved" warnings when nobody else waited
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        calls[key] = future
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # Only the leader's caller was cancelled; waiters must not see that
+            future.set_exception(_LeaderCancelled(key))
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            calls.pop(key, None)
+
+    def in_flight(self, key: str) -> bool:
+        """Whether a call for key is running on the current loop"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return key in self._calls.get(loop, {})
+
+
+class CacheLease:
+    """
+    Cross-worker lease stored in the shared cache
+
+    Acquisition relies on cache.add(), which is an atomic SET NX on Redis. The lease
+    expires on its own if the holder dies, so it never blocks work permanently.
+    """
+
+    def __init__(self, key: str, timeout: int):
+        self.key = f"lease:{key}"
+        self.timeout = timeout
+        self.owner = uuid.uuid4().hex
+        self.acquired = False
+
+    def acquire(self) -> bool:
+        """Try to take the lease without waiting"""
+        try:
+            self.acquired = cache.add(self.key, self.owner, self.timeout)
+        except Exception as e:
+            # Without a shared cache we can only coalesce in-process
+            logger.warning(f"Lease backend unavailable for {self.key}: {e}")
+            self.acquired = True
+        return self.acquired
+
+    def is_held(self) -> bool:
+        """Whether anyone currently holds the lease"""
+        try:
+            return cache.get(self.key) is not None
+        except Exception:
+            return False
+
+    def release(self):
+        """Release the lease if we still own it"""
+        if not self.acquired:
+            return
+        try:
+            compare_and_delete(self.key, self.owner)
+        except Exception as e:
+            logger.warning(f"Failed to release lease {self.key}: {e}")
+        self.acquired = False
+
+
+async def wait_for_lease_result(
+    lease: CacheLease,
+    fetch_result: Callable[[], Optional[Any]],
+    timeout: float,
+    poll_interval: float = 0.5,
+    max_poll_interval: float = 5.0
+) -> Optional[Any]:
+    """
+    Wait for another worker holding lease to publish its result
+
+    Args:
+        lease: The lease held by the other worker
+        fetch_result: Returns the published result or None
+        timeout: Maximum time to wait in seconds
+        poll_interval: Initial polling interval, doubled up to max_poll_interval
+
+    Returns:
+        The result, or None if the lease was released or expired without one
+    """
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        result = fetch_result()
+        if result is not None:
+            return result
+        if not lease.is_held():
+            # Holder finished without a result (failure) or died - re-check once more
+            return fetch_result()
+
+        await asyncio.sleep(min(poll_interval, max(0.0, deadline - time.monotonic())))
+        poll_interval = min(poll_interval * 2, max_poll_interval)
+
+    return None
+
+
+# Process-wide coalescing group for agent executions
+agent_singleflight = SingleFlight()
+
+
+def claim_task_slot(key: str, task_id: str, timeout: int) -> Optional[str]:
+    """
+    Register task_id as the running task for key
+
+    Returns:
+        None if the slot was claimed, otherwise the id of the task already holding it
+    """
+    slot_key = f"task_slot:{key}"
+    try:
+        if cache.add(slot_key, task_id, timeout):
+            return None
+        existing = cache.get(slot_key)
+        if existing is None and cache.add(slot_key, task_id, timeout):
+            # Previous holder released the slot in between
+            return None
+        return existing
+    except Exception as e:
+        logger.warning(f"Task slot backend unavailable for {key}: {e}")
+        return None
+
+
+# DEL key only while it still holds ARGV[1]
+_COMPARE_AND_DELETE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def compare_and_delete(cache_key: str, expected: Any) -> bool:
+    """
+    Delete cache_key only while it holds expected
+
+    Atomic on Redis, so an entry that expired and was taken by another worker in the
+    meantime is left alone.
+
+    Returns:
+        Whether the entry was deleted
+    """
+    from .utils import get_redis_cache_client
+
+    redis_cache = get_redis_cache_client(cache_key)
+    if redis_cache is not None:
+        client, full_key, serializer = redis_cache
+        return bool(client.eval(_COMPARE_AND_DELETE, 1, full_key, serializer.dumps(expected)))
+
+    # Not atomic, but only local-memory development caches take this path
+    if cache.get(cache_key) == expected:
+        return cache.delete(cache_key)
+    return False
+
+
+# SET key to ARGV[2] (expiring in ARGV[3] ms) only while it still holds ARGV[1]
+_COMPARE_AND_SET = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('set', KEYS[1], ARGV[2], 'PX', ARGV[3])
+end
+return false
+"""
+
+
+def replace_task_slot(key: str, stale_task_id: str, task_id: str, timeout: int) -> Optional[str]:
+    """
+    Take over a slot whose task is known to have finished
+
+    The takeover only happens while the slot still holds stale_task_id, so of several
+    requests that saw the same finished task exactly one wins.
+
+    Returns:
+        None if task_id took over the slot, otherwise the id of the task holding it
+    """
+    from .utils import get_redis_cache_client
+
+    slot_key = f"task_slot:{key}"
+    try:
+        redis_cache = get_redis_cache_client(slot_key)
+        if redis_cache is not None:
+            client, full_key, serializer = redis_cache
+            swapped = client.eval(
+                _COMPARE_AND_SET, 1, full_key,
+                serializer.dumps(stale_task_id), serializer.dumps(task_id), timeout * 1000
+            )
+            if swapped:
+                return None
+        elif cache.get(slot_key) == stale_task_id:
+            # Not atomic, but only local-memory development caches take this path
+            cache.delete(slot_key)
+
+        # The slot was released or taken over in between
+        return claim_task_slot(key, task_id, timeout)
+    except Exception as e:
+        logger.warning(f"Task slot backend unavailable for {key}: {e}")
+        return None
+
+
+def release_task_slot(key: str, task_id: str):
+    """Free the slot for key if it is still held by task_id"""
+    try:
+        compare_and_delete(f"task_slot:{key}", task_id)
+    except Exception as e:
+        logger.warning(f"Failed to release task slot for {key}: {e}")
@@ -0,0 +1,98 @@
+"""
+Streaming of incremental LLM output to WebSocket clients through the channel layer
+"""
+from typing import Dict, Any, Optional, Iterable
+import logging
+import time
+
+from channels.layers import get_channel_layer
+
+from .json_stream import IncrementalJSONParser
+
+logger = logging.getLogger(__name__)
+
+
+class ChannelStreamPublisher:
+    """
+    Forwards streamed text for one agent to a channel-layer group
+
+    Deltas are buffered and sent at most every `min_interval` seconds, so a fast token
+    stream turns into a handful of `task_progress` events instead of one per token.
+    Array elements listed in `item_paths` are parsed out of the stream and sent as
+    soon as they close, so clients can render e.g. each jargon term progressively.
+    """
+
+    def __init__(
+        self,
+        group_name: str,
+        agent_name: str,
+        item_paths: Optional[Iterable[str]] = None,
+        min_interval: float = 0.25
+    ):
+        self.group_name = group_name
+        self.agent_name = agent_name
+        self.min_interval = min_interval
+        self.channel_layer = get_channel_layer()
+        self.parser = IncrementalJSONParser(item_paths or [])
+        self._buffer = []
+        self._last_sent = 0.0
+        self._sequence = 0
+
+    async def __call__(self, text: str):
+        """Receive a text delta from the LLM stream"""
+        if self.channel_layer is None or not text:
+            return
+
+        self._buffer.append(text)
+        completed_items = self.parser.feed(text)
+
+        # Send the very first delta immediately so clients see output right away
+        if completed_items or self._sequence == 0 or time.monotonic() - self._last_sent >= self.min_interval:
+            await self.flush()
+
+        for item in completed_items:
+            await self._send({
+                'stage': 'agent_item',
+                'agent': self.agent_name,
+                'path': item['path'],
+                'index': item['index'],
+                'item': item['item'],
+            })
+
+    async def flush(self):
+        """Send any buffered text"""
+        if self.channel_layer is None or not self._buffer:
+            return
+
+        delta = ''.join(self._buffer)
+        self._buffer = []
+        self._last_sent = time.monotonic()
+        self._sequence += 1
+
+        await self._send({
+            'stage': 'agent_stream',
+            'agent': self.agent_name,
+            'sequence': self._sequence,
+            'delta': delta,
+        })
+
+    async def _send(self, data: Dict[str, Any]):
+        try:
+            await self.channel_layer.group_send(
+                self.group_name,
+                {'type': 'task_progress', 'data': data}
+            )
+        except Exception as e:
+            # Progress streaming is best effort and must never fail the analysis
+            logger.warning(f"Failed to publish stream event to {self.group_name}: {e}")
+
+
+def get_stream_publisher(
+    group_name: Optional[str],
+    agent_name: str,
+    item_paths: Optional[Iterable[str]] = None
+) -> Optional[ChannelStreamPublisher]:
+    """Create a publisher for an agent, or None when streaming is not requested"""
+    if not group_name:
+        return None
+    return ChannelStreamPublisher(group_name, agent_name, item_paths=item_paths)
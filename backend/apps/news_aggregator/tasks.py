@@ -3,12 +3,19 @@ Celery tasks for news aggregator
 """
 from celery import shared_task
 from celery.utils.log import get_task_logger
-import asyncio
 from typing import Dict, Any, List
 from django.utils import timezone
 
 logger = get_task_logger(__name__)
 
+# How long an enqueued analysis keeps other identical requests attached to it
+ANALYSIS_TASK_SLOT_TIMEOUT = 15 * 60
+
+
+def analysis_task_key(article_id: str, analysis_types: List[str]) -> str:
+    """Identity of an analysis request, used to coalesce duplicate submissions"""
+    return f"analyze:{article_id}:{','.join(sorted(set(analysis_types)))}"
+
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
 def process_article_task(self, url: str, user_id: int = None):
@@ -24,8 +31,13 @@ def process_article_task(self, url: str, user_id: int = None):
     """
     from apps.news_aggregator.models import Article, NewsSource, ProcessingJob
     from apps.news_aggregator.extractors.article import ArticleExtractor
+    from apps.news_aggregator.dedup import fingerprint_article, find_canonical_article
+    from apps.news_aggregator.content_store import make_summary
+    from apps.news_aggregator.runtime import run_async
+    from apps.news_aggregator.progress import RETRYING, ProgressReporter
     
     logger.info(f"Processing article: {url}")
+    progress = ProgressReporter(self.request.id)
     
     # Create processing job
     job = ProcessingJob.objects.create(
@@ -43,21 +55,32 @@ def process_article_task(self, url: str, user_id: int = None):
             job.article = existing
             job.status = 'completed'
             job.completed_at = timezone.now()
-            job.save()
-            return {
+            job.save(update_fields=['article', 'status', 'completed_at', 'updated_at'])
+            result = {
                 "status": "exists",
                 "article_id": str(existing.id),
                 "is_processed": existing.is_processed,
                 "is_enriched": existing.is_enriched
             }
+            progress.add_article(existing.id)
+            progress.complete(result)
+            return result
         
-        # Extract article using async extractor
+        # Extract article using async extractor, fetch and parse reported separately
         extractor = ArticleExtractor()
-        article_data = asyncio.run(extractor.extract(url))
+        progress.stage('fetch')
+        html = run_async(extractor._fetch_html(url))
+        if not html:
+            raise Exception("Failed to fetch article HTML")
+        
+        progress.stage('parse')
+        article_data = run_async(extractor._parse_html(html, url))
         
         if not article_data:
             raise Exception("Failed to extract article content")
         
+        progress.stage('store')
+        
         # Get or create news source
         from urllib.parse import urlparse
         domain = urlparse(url).netloc.replace('www.', '')
@@ -70,32 +93,44 @@ def process_article_task(self, url: str, user_id: int = None):
             }
         )
         
+        # Link republished wire stories to the article seen first
+        fingerprint = fingerprint_article(article_data.get('content', ''))
+        canonical = find_canonical_article(*fingerprint) if fingerprint else None
+        
         # Create article
         article = Article.objects.create(
             url=url,
             title=article_data.get('title', ''),
             content=article_data.get('content', ''),
+            summary=make_summary(article_data.get('content', '')),
             author=article_data.get('author', ''),
             published_at=article_data.get('published_at'),
             source=source,
             word_count=len(article_data.get('content', '').split()),
             reading_time=max(1, len(article_data.get('content', '').split()) // 200),
-            is_processed=True
+            is_processed=True,
+            simhash=fingerprint[0] if fingerprint else None,
+            simhash_bands=fingerprint[1] if fingerprint else [],
+            canonical_article=canonical
         )
         
         # Update job
         job.article = article
         job.status = 'completed'
         job.completed_at = timezone.now()
-        job.save()
+        job.save(update_fields=['article', 'status', 'completed_at', 'updated_at'])
         
         logger.info(f"Article processed successfully: {article.id}")
         
-        return {
+        result = {
             "status": "success",
             "article_id": str(article.id),
-            "title": article.title
+            "title": article.title,
+            "duplicate_of": str(canonical.id) if canonical else None
         }
+        progress.add_article(article.id)
+        progress.complete(result)
+        return result
         
     except Exception as e:
         logger.error(f"Error processing article: {str(e)}")
@@ -104,35 +139,100 @@ def process_article_task(self, url: str, user_id: int = None):
         job.status = 'failed'
         job.error_message = str(e)
         job.completed_at = timezone.now()
-        job.save()
+        job.save(update_fields=['status', 'error_message', 'completed_at', 'updated_at'])
+        
+        if self.request.retries >= self.max_retries:
+            progress.fail(str(e))
+        else:
+            progress.stage(progress.current or 'task', RETRYING, error=str(e))
+            progress.flush()
         
         # Retry the task
         raise self.retry(exc=e)
 
 
+@shared_task(bind=True)
+def process_articles_batch_task(self, urls: List[str], user_id: int = None):
+    """
+    Process many articles with batched extraction and bulk database writes
+    
+    Args:
+        urls: Article URLs to process
+        user_id: Optional user ID who initiated the processing
+        
+    Returns:
+        Dict with created article ids by URL, existing and failed URLs
+    """
+    from apps.news_aggregator.ingest import ingest_urls
+    from apps.news_aggregator.progress import ProgressReporter
+    
+    logger.info(f"Processing batch of {len(urls)} articles")
+    progress = ProgressReporter(self.request.id)
+    
+    # No task-level retry: failures are per URL and recorded on their ProcessingJob
+    result = ingest_urls(urls, celery_task_id=self.request.id or '', progress=progress)
+    
+    result = {
+        "status": "success",
+        "created": result["created"],
+        "existing": result["existing"],
+        "failed": result["failed"],
+        "near_duplicates": result["near_duplicates"]
+    }
+    progress.complete({
+        "created": len(result["created"]),
+        "existing": len(result["existing"]),
+        "failed": len(result["failed"]),
+    })
+    return result
+
+
 @shared_task(bind=True, max_retries=2, default_retry_delay=120)
-def analyze_article_task(self, article_id: str, analysis_types: List[str], user_id: int = None):
+def analyze_article_task(
+    self,
+    article_id: str,
+    analysis_types: List[str],
+    user_id: int = None,
+    schedule: Dict[str, Any] = None
+):
     """
     Run AI analysis on an article
     
+    Fans out one run_analysis_agent_task per agent, each on the queue for the agent's
+    complexity, and replaces itself with a chord whose merge_analysis_results_task
+    callback keeps this task's id, so AsyncResult(task_id) resolves to the merged result.
+    If the chord fails, analysis_failed_task fails the job and releases the request.
+    Eager runs (CELERY_TASK_ALWAYS_EAGER) run the agents and the merge inline instead.
+    
     Args:
         article_id: ID of the article to analyze
         analysis_types: List of analysis types to run
         user_id: Optional user ID who initiated the analysis
+        schedule: Schedule.to_dict() of the request; agents are queued in its priority
+            class and with its priority (default: interactive)
         
     Returns:
-        Dict with analysis results
+        Dict with analysis results (from the merge callback)
     """
-    from apps.news_aggregator.models import Article, AIAnalysis, ProcessingJob
-    from apps.news_aggregator.agents.coordinator import AgentCoordinator
+    from celery import chord, group
+    from apps.news_aggregator.models import Article, ProcessingJob
+    from apps.news_aggregator.agents.coordinator import get_agent_coordinator
+    from apps.news_aggregator.singleflight import release_task_slot
+    from apps.news_aggregator.dedup import reuse_canonical_analyses
+    from apps.news_aggregator.queues import Schedule, agent_queue, merge_queue, plan_schedule
+    from apps.news_aggregator.progress import COMPLETED, ProgressReporter
     
     logger.info(f"Analyzing article {article_id} with types: {analysis_types}")
+    task_key = analysis_task_key(article_id, analysis_types)
+    progress = ProgressReporter(self.request.id, article_ids=[article_id])
     
     # Get article
     try:
         article = Article.objects.get(id=article_id)
     except Article.DoesNotExist:
         logger.error(f"Article {article_id} not found")
+        release_task_slot(task_key, self.request.id)
+        progress.fail("Article not found")
         return {"status": "error", "error": "Article not found"}
     
     # Create processing job
@@ -145,61 +245,37 @@ def analyze_article_task(self, article_id: str, analysis_types: List[str], user_
     )
     
     try:
-        # Run analysis
-        coordinator = AgentCoordinator()
-        results = asyncio.run(
-            coordinator.analyze_article(
-                article_content=article.content,
-                article_id=str(article.id),
-                analysis_types=analysis_types
-            )
-        )
+        coordinator = get_agent_coordinator()
+        if 'all' in analysis_types:
+            requested = list(coordinator.agents.keys())
+        else:
+            requested = [t for t in dict.fromkeys(analysis_types) if t in coordinator.agents]
         
-        # Save results
-        successful_analyses = []
-        failed_analyses = []
-        
-        for agent_name, result in results.items():
-            if result.success and result.data:
-                # Save to database
-                analysis, created = AIAnalysis.objects.update_or_create(
-                    article=article,
-                    analysis_type=agent_name,
-                    defaults={
-                        'result': result.data,
-                        'model_used': result.model_used.value if result.model_used else 'grok-3',
-                        'processing_time': result.execution_time_ms / 1000.0 if result.execution_time_ms else 0
-                    }
-                )
-                successful_analyses.append(agent_name)
-            else:
-                failed_analyses.append({
-                    'agent': agent_name,
-                    'error': result.error
-                })
-        
-        # Mark article as enriched if at least one analysis succeeded
-        if successful_analyses:
-            article.is_enriched = True
-            article.save()
-        
-        # Update job
-        job.status = 'completed' if successful_analyses else 'failed'
-        job.completed_at = timezone.now()
-        if failed_analyses:
-            job.error_message = f"Failed analyses: {failed_analyses}"
-        job.save()
-        
-        logger.info(f"Analysis completed for article {article_id}: "
-                   f"{len(successful_analyses)} successful, {len(failed_analyses)} failed")
-        
-        return {
-            "status": "success",
-            "article_id": str(article.id),
-            "successful_analyses": successful_analyses,
-            "failed_analyses": failed_analyses
-        }
+        # Near-duplicates reuse the canonical article's analyses; missing types are
+        # analyzed (and stored) on the canonical article so later duplicates share them
+        target = article
+        reused = []
+        if article.canonical_article_id:
+            target = article.canonical_article
+            reused = reuse_canonical_analyses(article, requested)
+        pending_types = [t for t in requested if t not in reused]
+        progress.add_article(target.id)
         
+        schedule = Schedule.from_dict(schedule) if schedule else plan_schedule()
+        merge = merge_analysis_results_task.s(
+            article_id=str(article.id),
+            target_id=str(target.id),
+            reused=reused,
+            job_id=str(job.id),
+            task_key=task_key,
+            task_id=self.request.id
+        ).set(**schedule.options(merge_queue()))
+        on_error = analysis_failed_task.s(
+            job_id=str(job.id),
+            task_key=task_key,
+            task_id=self.request.id,
+            article_ids=progress.article_ids
+        )
     except Exception as e:
         logger.error(f"Error analyzing article: {str(e)}")
         
@@ -207,10 +283,296 @@ def analyze_article_task(self, article_id: str, analysis_types: List[str], user_
         job.status = 'failed'
         job.error_message = str(e)
         job.completed_at = timezone.now()
-        job.save()
+        job.save(update_fields=['status', 'error_message', 'completed_at', 'updated_at'])
+        
+        # Keep duplicate requests attached while retries remain
+        if self.request.retries >= self.max_retries:
+            release_task_slot(task_key, self.request.id)
+            progress.fail(str(e))
         
-        # Retry the task with lower complexity models
         raise self.retry(exc=e)
+    
+    progress.stage('dispatch', COMPLETED, agents=pending_types, reused=reused)
+    progress.flush()
+    
+    if not pending_types:
+        return merge([])
+    
+    # Agents retry on their own, so a failing agent never re-runs the ones that succeeded
+    header = group(
+        run_analysis_agent_task.s(
+            str(target.id),
+            agent_name,
+            stream_group=f"task_{self.request.id}",
+            progress=progress.to_dict()
+        ).set(**schedule.options(agent_queue(coordinator.agents[agent_name])))
+        for agent_name in pending_types
+    )
+    logger.info(f"Dispatching {len(pending_types)} agents for article {article_id}")
+    
+    if self.request.is_eager:
+        # An eager task can't wait for a chord it replaces itself with
+        try:
+            return merge([
+                signature.apply().get(disable_sync_subtasks=False)
+                for signature in header.tasks
+            ])
+        except Exception as e:
+            on_error(self.request, e, None)
+            raise
+    
+    raise self.replace(chord(header, merge.on_error(on_error)))
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=60)
+def run_analysis_agent_task(
+    self,
+    article_id: str,
+    agent_name: str,
+    stream_group: str = None,
+    progress: Dict[str, Any] = None
+):
+    """
+    Run one analysis agent on an article and store its result
+    
+    Failures are retried for this agent only; once retries are exhausted the failure
+    is returned instead of raised, so the chord callback still merges the other agents.
+    
+    Args:
+        article_id: ID of the article to analyze
+        agent_name: Agent to run
+        stream_group: Optional channel-layer group that receives streamed agent output
+        progress: ProgressReporter.to_dict() of the dispatching task, so agent start and
+            finish events are published under its task id
+        
+    Returns:
+        Dict with the agent name, success flag and error
+    """
+    from apps.news_aggregator.models import Article, AIAnalysis
+    from apps.news_aggregator.agents.coordinator import get_agent_coordinator
+    from apps.news_aggregator.runtime import run_async
+    from apps.news_aggregator.content_store import ContentNotFound
+    from apps.news_aggregator.progress import COMPLETED, FAILED, RETRYING, ProgressReporter
+    
+    progress = (
+        ProgressReporter.from_dict(progress) if progress
+        else ProgressReporter(self.request.id, article_ids=[article_id])
+    )
+    stage = f"agent:{agent_name}"
+    
+    try:
+        article = Article.objects.get(id=article_id)
+    except Article.DoesNotExist:
+        progress.stage(stage, FAILED, error="Article not found")
+        progress.flush()
+        return {"agent": agent_name, "success": False, "error": "Article not found"}
+    
+    progress.stage(stage, attempt=self.request.retries + 1)
+    try:
+        results = run_async(
+            get_agent_coordinator().analyze_article(
+                article_content=article.full_text,
+                article_id=str(article.id),
+                analysis_types=[agent_name],
+                stream_group=stream_group
+            )
+        )
+        result = results.get(agent_name)
+        if result is None or not result.success or not result.data:
+            raise Exception(result.error if result else f"Unknown agent: {agent_name}")
+        
+        AIAnalysis.objects.update_or_create(
+            article=article,
+            analysis_type=agent_name,
+            defaults={
+                'result': result.data,
+                'model_used': result.model_used.value if result.model_used else 'grok-3',
+                'processing_time': result.execution_time_ms / 1000.0 if result.execution_time_ms else 0
+            }
+        )
+    except Exception as e:
+        # A missing content document won't reappear on retry
+        if self.request.retries < self.max_retries and not isinstance(e, ContentNotFound):
+            logger.warning(f"Agent {agent_name} failed for article {article_id}, retrying: {str(e)}")
+            progress.stage(stage, RETRYING, error=str(e))
+            progress.flush()
+            raise self.retry(exc=e)
+        logger.error(f"Agent {agent_name} failed for article {article_id}: {str(e)}")
+        progress.stage(stage, FAILED, error=str(e))
+        progress.flush()
+        return {"agent": agent_name, "success": False, "error": str(e)}
+    
+    progress.stage(stage, COMPLETED, execution_time_ms=result.execution_time_ms)
+    progress.flush()
+    return {"agent": agent_name, "success": True, "error": None}
+
+
+@shared_task
+def merge_analysis_results_task(
+    agent_results: List[Dict[str, Any]],
+    article_id: str,
+    target_id: str,
+    reused: List[str],
+    job_id: str,
+    task_key: str,
+    task_id: str
+):
+    """
+    Chord callback: merge per-agent results, mark articles enriched and finish the job
+    
+    Args:
+        agent_results: Return values of run_analysis_agent_task
+        article_id: ID of the analyzed article
+        target_id: ID of the article the agents ran on (the canonical one for duplicates)
+        reused: Analysis types copied from the canonical article without running agents
+        job_id: Enrichment ProcessingJob to complete
+        task_key: Coalescing key of the analysis request
+        task_id: Id of the analyze_article_task that dispatched the agents
+        
+    Returns:
+        Dict with analysis results
+    """
+    from apps.news_aggregator.models import Article, ProcessingJob
+    from apps.news_aggregator.singleflight import release_task_slot
+    from apps.news_aggregator.dedup import reuse_canonical_analyses
+    from apps.news_aggregator.progress import ProgressReporter
+    
+    progress = ProgressReporter(task_id, article_ids=[article_id, target_id])
+    progress.stage('store')
+    
+    computed = [r['agent'] for r in agent_results if r['success']]
+    successful_analyses = list(reused) + computed
+    failed_analyses = [
+        {'agent': r['agent'], 'error': r['error']}
+        for r in agent_results if not r['success']
+    ]
+    
+    if target_id != article_id and computed:
+        reuse_canonical_analyses(Article.objects.get(id=article_id), computed)
+    
+    # Mark articles as enriched if at least one analysis succeeded
+    now = timezone.now()
+    if successful_analyses:
+        Article.objects.filter(id__in={article_id, target_id}).update(is_enriched=True, updated_at=now)
+    
+    ProcessingJob.objects.filter(id=job_id).update(
+        status='completed' if successful_analyses else 'failed',
+        completed_at=now,
+        error_message=f"Failed analyses: {failed_analyses}" if failed_analyses else '',
+        updated_at=now
+    )
+    
+    logger.info(f"Analysis completed for article {article_id}: "
+               f"{len(successful_analyses)} successful, {len(failed_analyses)} failed")
+    release_task_slot(task_key, task_id)
+    
+    result = {
+        "status": "success",
+        "article_id": article_id,
+        "successful_analyses": successful_analyses,
+        "failed_analyses": failed_analyses
+    }
+    progress.complete(result)
+    return result
+
+
+@shared_task
+def analysis_failed_task(
+    request,
+    exc,
+    traceback,
+    job_id: str,
+    task_key: str,
+    task_id: str,
+    article_ids: List[str]
+):
+    """
+    Chord error callback: fail the enrichment job and release the analysis request
+    
+    Args:
+        request: Request of the task that failed
+        exc: Exception it failed with
+        traceback: Its traceback
+        job_id: Enrichment ProcessingJob to fail
+        task_key: Coalescing key of the analysis request
+        task_id: Id of the analyze_article_task that dispatched the agents
+        article_ids: Articles whose groups receive the failure
+    """
+    from apps.news_aggregator.models import ProcessingJob
+    from apps.news_aggregator.singleflight import release_task_slot
+    from apps.news_aggregator.progress import ProgressReporter
+    
+    logger.error(f"Analysis {task_id} failed: {exc}")
+    now = timezone.now()
+    ProcessingJob.objects.filter(id=job_id).update(
+        status='failed',
+        completed_at=now,
+        error_message=str(exc),
+        updated_at=now
+    )
+    release_task_slot(task_key, task_id)
+    ProgressReporter(task_id, article_ids=article_ids).fail(str(exc))
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=300)
+def submit_analysis_batch_task(self, analysis_types: List[str] = None, limit: int = None, force: bool = False):
+    """
+    Submit pending analyses as a Message Batch for backfills
+    
+    Args:
+        analysis_types: Analysis types to run (default: all)
+        limit: Maximum number of requests in the batch
+        force: Re-analyze articles that already have results
+        
+    Returns:
+        Dict with the batch id and request count
+    """
+    from apps.news_aggregator.batch import submit_analysis_batch
+    
+    try:
+        batch = submit_analysis_batch(analysis_types=analysis_types, limit=limit, force=force)
+    except Exception as e:
+        logger.error(f"Error submitting analysis batch: {str(e)}")
+        raise self.retry(exc=e)
+    
+    if batch is None:
+        return {"status": "empty"}
+    
+    return {
+        "status": "submitted",
+        "batch_id": str(batch.id),
+        "provider_batch_id": batch.provider_batch_id,
+        "request_count": batch.request_count
+    }
+
+
+@shared_task
+def poll_analysis_batches_task():
+    """
+    Periodic task that polls open analysis batches and collects finished ones
+    """
+    from apps.news_aggregator.batch import poll_open_batches
+    
+    batches = poll_open_batches()
+    
+    return {
+        "polled": len(batches),
+        "collected": [batch.provider_batch_id for batch in batches if batch.status == 'collected']
+    }
+
+
+@shared_task
+def poll_feeds_task(source_ids: List[int] = None, force: bool = False):
+    """
+    Periodic task that polls due RSS/Atom feeds and news sitemaps
+    
+    Args:
+        source_ids: Limit polling to these NewsSource ids
+        force: Poll even if a source's polling interval has not elapsed
+    """
+    from apps.news_aggregator.feeds import poll_feeds
+    
+    return poll_feeds(source_ids=source_ids, force=force)
 
 
 @shared_task
@@ -230,4 +592,9 @@ def cleanup_old_jobs():
     
     logger.info(f"Cleaned up {deleted_count} old processing jobs")
     
-    return {"deleted_count": deleted_count}
\ No newline at end of file
+    # Drop cached article HTML nobody has fetched for a while
+    from apps.news_aggregator.extractors.html_cache import get_html_cache
+    html_cache = get_html_cache()
+    pruned_pages = html_cache.prune() if html_cache else 0
+    
+    return {"deleted_count": deleted_count, "pruned_html_pages": pruned_pages}
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Batch analysis pipeline against the local Anthropic stub server
+
+submit_analysis_batch, poll_analysis_batch and collect_analysis_batch run end to end
+over HTTP against batch_stub_server, with failures forced per request.
+"""
+import threading
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from apps.news_aggregator import batch as batch_module
+from apps.news_aggregator import claude_client
+from apps.news_aggregator.agents import coordinator
+from apps.news_aggregator.batch import (
+    make_custom_id, poll_analysis_batch, submit_analysis_batch
+)
+from apps.news_aggregator.management.commands.batch_stub_server import (
+    EMPTY_OBJECT, ERRORED, EXPIRED, INVALID_JSON, make_server
+)
+from apps.news_aggregator.models import AIAnalysis, Article, NewsSource
+
+
+class BatchPipelineTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Batches end as soon as they are submitted
+        cls.server = make_server('127.0.0.1', 0, processing_seconds=0)
+        cls.stub = cls.server.RequestHandlerClass
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        source = NewsSource.objects.create(name="Source", domain="source.example.com")
+        self.articles = {
+            name: Article.objects.create(
+                source=source,
+                url=f"https://source.example.com/{name}",
+                title=name,
+                content=f"Κείμενο του άρθρου {name}. " * 20,
+                is_processed=True
+            )
+            for name in ('updated', 'created', 'invalid_json', 'empty_object', 'errored', 'expired')
+        }
+        AIAnalysis.objects.create(
+            article=self.articles['updated'],
+            analysis_type='jargon',
+            result={'old': True},
+            processing_time=1.0
+        )
+        self.stub.state.outcomes = {
+            make_custom_id(self.articles['invalid_json'].id, 'jargon'): INVALID_JSON,
+            make_custom_id(self.articles['empty_object'].id, 'jargon'): EMPTY_OBJECT,
+            make_custom_id(self.articles['errored'].id, 'jargon'): ERRORED,
+            make_custom_id(self.articles['expired'].id, 'jargon'): EXPIRED,
+        }
+
+        # Clients are built on first use, so build them against the stub
+        settings_override = override_settings(
+            ANTHROPIC_BASE_URL=self.stub.base_url, ANTHROPIC_API_KEY='stub-key'
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        for module, name in (
+            (batch_module, '_batch_client'),
+            (claude_client, '_claude_client'),
+            (coordinator, '_agent_coordinator'),
+        ):
+            patcher = mock.patch.object(module, name, None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_submit_poll_collect(self):
+        batch = submit_analysis_batch(['jargon'], force=True)
+        self.assertIsNotNone(batch)
+        self.assertEqual(batch.request_count, len(self.articles))
+        self.assertEqual(batch.analysis_types, ['jargon'])
+
+        batch = poll_analysis_batch(batch)
+        batch.refresh_from_db()
+        self.assertEqual(batch.status, 'collected')
+        self.assertEqual(batch.succeeded_count, 2)
+        # Invalid JSON and output failing validation count as errored
+        self.assertEqual(batch.errored_count, 3)
+        self.assertEqual(batch.expired_count, 1)
+
+        analyses = {
+            analysis.article_id: analysis
+            for analysis in AIAnalysis.objects.filter(analysis_type='jargon')
+        }
+        self.assertEqual(
+            set(analyses), {self.articles['updated'].id, self.articles['created'].id}
+        )
+        self.assertNotEqual(analyses[self.articles['updated'].id].result, {'old': True})
+        self.assertTrue(analyses[self.articles['created'].id].result)
+
+        enriched = dict(Article.objects.values_list('url', 'is_enriched'))
+        for name, article in self.articles.items():
+            self.assertEqual(enriched[article.url], name in ('updated', 'created'), name)
+
+    def test_open_batch_blocks_resubmission(self):
+        self.stub.state.processing_seconds = 3600
+        self.addCleanup(setattr, self.stub.state, 'processing_seconds', 0)
+
+        batch = poll_analysis_batch(submit_analysis_batch(['jargon'], force=True))
+        self.assertEqual(batch.status, 'in_progress')
+        self.assertIsNone(submit_analysis_batch(['jargon'], force=True))
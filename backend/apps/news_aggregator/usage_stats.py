@@ -0,0 +1,82 @@
+"""
+Prompt-cache usage counters for Claude requests
+
+Input token counts are accumulated per agent in the shared cache, so the hit ratio of
+the cached system-prompt prefix can be reported across all workers.
+"""
+from typing import Dict, Any, Iterable
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+USAGE_FIELDS = ['requests', 'input_tokens', 'cache_read_input_tokens', 'cache_creation_input_tokens']
+
+
+def _key(label: str, field: str) -> str:
+    return f"prompt_cache:{label}:{field}"
+
+
+def record_prompt_cache_usage(label: str, usage: Any):
+    """
+    Add a response's usage block to the counters for label
+
+    Args:
+        label: Agent name (or other request family)
+        usage: The `usage` object of a Messages API response
+    """
+    if usage is None:
+        return
+
+    values = {
+        'requests': 1,
+        'input_tokens': getattr(usage, 'input_tokens', 0) or 0,
+        'cache_read_input_tokens': getattr(usage, 'cache_read_input_tokens', 0) or 0,
+        'cache_creation_input_tokens': getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+    }
+
+    try:
+        for field, value in values.items():
+            if not value:
+                continue
+            key = _key(label, field)
+            cache.add(key, 0, None)
+            cache.incr(key, value)
+    except Exception as e:
+        # Statistics are best effort
+        logger.debug(f"Failed to record prompt cache usage for {label}: {e}")
+
+
+def get_prompt_cache_stats(labels: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Prompt-cache counters and hit ratio per label
+
+    The hit ratio is the share of prompt tokens read from the cache; Anthropic reports
+    uncached, cache-read and cache-write input tokens separately.
+    """
+    labels = list(labels)
+    try:
+        values = cache.get_many([_key(label, field) for label in labels for field in USAGE_FIELDS])
+    except Exception as e:
+        logger.warning(f"Failed to read prompt cache stats: {e}")
+        values = {}
+
+    stats = {}
+    for label in labels:
+        counters = {field: values.get(_key(label, field), 0) for field in USAGE_FIELDS}
+        if not counters['requests']:
+            continue
+
+        prompt_tokens = (
+            counters['input_tokens']
+            + counters['cache_read_input_tokens']
+            + counters['cache_creation_input_tokens']
+        )
+        counters['hit_ratio'] = (
+            round(counters['cache_read_input_tokens'] / prompt_tokens, 3) if prompt_tokens else 0.0
+        )
+        stats[label] = counters
+
+    return stats
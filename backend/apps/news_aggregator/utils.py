@@ -22,17 +22,15 @@ class MongoDBConnection:
     def get_client(self):
         """Get or create MongoDB client"""
         if self._client is None:
-            try:
-                self._client = MongoClient(
-                    settings.MONGO_CONFIG['connection_string'],
-                    serverSelectionTimeoutMS=5000
-                )
-                # Test connection
-                self._client.admin.command('ping')
-                logger.info("MongoDB connection established")
-            except Exception as e:
-                logger.error(f"Failed to connect to MongoDB: {e}")
-                raise
+            # Connects lazily in the background; the first operation waits for server selection
+            config = settings.MONGO_CONFIG
+            self._client = MongoClient(
+                config['connection_string'],
+                maxPoolSize=config.get('max_pool_size', 50),
+                minPoolSize=config.get('min_pool_size', 0),
+                serverSelectionTimeoutMS=5000
+            )
+            logger.info("MongoDB client created")
         
         return self._client
     
@@ -53,18 +51,49 @@ class MongoDBConnection:
 mongodb = MongoDBConnection()
 
 
+def get_redis_cache_client(key: str, alias: str = 'default'):
+    """
+    Raw redis-py client behind a Django RedisCache, for atomic operations the cache
+    API lacks (compare-and-set, hashes)
+
+    Args:
+        key: Cache key, before the backend's prefix and version are applied
+        alias: Cache alias
+
+    Returns:
+        (client, full key, serializer), or None when the cache is not Redis
+    """
+    from django.core.cache import caches
+    from django.core.cache.backends.redis import RedisCache
+
+    backend = caches[alias]
+    if not isinstance(backend, RedisCache):
+        return None
+    full_key = backend.make_and_validate_key(key)
+    return backend._cache.get_client(full_key, write=True), full_key, backend._cache._serializer
+
+
 def get_mongodb():
     """Get MongoDB database instance"""
     return mongodb.get_database()
 
 
 def store_document(collection_name: str, document: dict):
-    """Store a document in MongoDB"""
+    """
+    Store a document in MongoDB
+
+    The document is queued on the async document store of the worker runtime and
+    written with the next batched insert of its collection, so the id is assigned
+    here rather than by the insert.
+    """
+    from bson import ObjectId
+    from .document_store import get_document_store
+    from .runtime import run_async
+
     try:
-        db = get_mongodb()
-        collection = db[collection_name]
-        result = collection.insert_one(document)
-        return str(result.inserted_id)
+        document.setdefault('_id', ObjectId())
+        run_async(get_document_store().insert(collection_name, document))
+        return str(document['_id'])
     except Exception as e:
         logger.error(f"Error storing document in {collection_name}: {e}")
         raise
@@ -79,4 +108,4 @@ def get_document(collection_name: str, document_id: str):
         return collection.find_one({"_id": ObjectId(document_id)})
     except Exception as e:
         logger.error(f"Error retrieving document from {collection_name}: {e}")
-        return None
\ No newline at end of file
+        return None
@@ -1,6 +1,7 @@
 """
 ASGI config for News Copilot project.
 """
+import logging
 import os
 
 from django.core.asgi import get_asgi_application
@@ -16,8 +17,37 @@ django_asgi_app = get_asgi_application()
 # Import websocket routing after Django setup
 from apps.api.routing import websocket_urlpatterns
 
+logger = logging.getLogger(__name__)
+
+
+async def lifespan_app(scope, receive, send):
+    """Handle ASGI lifespan events so shared resources are released on shutdown"""
+    from apps.news_aggregator.http_pool import aclose_http_clients
+    from apps.news_aggregator.document_store import get_document_store
+    from apps.news_aggregator.extractors.parsing import get_parse_executor
+    from apps.news_aggregator.extractors.browser_pool import shutdown_browser_pool
+
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                await get_document_store().ensure_indexes()
+            except Exception as e:
+                # Mongo being down must not keep the API from starting
+                logger.warning(f"Could not ensure MongoDB indexes: {e}")
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await get_document_store().aclose()
+            await aclose_http_clients()
+            get_parse_executor().shutdown()
+            shutdown_browser_pool()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
+    "lifespan": lifespan_app,
     "websocket": AuthMiddlewareStack(
         URLRouter(websocket_urlpatterns)
     ),
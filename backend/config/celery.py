@@ -1,12 +1,16 @@
 """
 Celery configuration for News Copilot project.
 """
+import logging
 import os
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 # Set the default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
 
+logger = logging.getLogger(__name__)
+
 # Create Celery app
 app = Celery('news_copilot')
 
@@ -21,6 +25,32 @@ app.autodiscover_tasks()
 def debug_task(self):
     print(f'Request: {self.request!r}')
 
+
+@worker_process_init.connect
+def ensure_worker_document_indexes(**kwargs):
+    """Create MongoDB indexes once per worker process before tasks write documents"""
+    from apps.news_aggregator.runtime import run_async
+    from apps.news_aggregator.document_store import get_document_store
+    try:
+        run_async(get_document_store().ensure_indexes(), timeout=30)
+    except Exception as e:
+        logger.warning(f"Could not ensure MongoDB indexes: {e}")
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_async_runtime(**kwargs):
+    """Stop the worker event loop and release pooled connections, parse workers and browsers on exit"""
+    from apps.news_aggregator.runtime import get_async_runtime
+    from apps.news_aggregator.http_pool import close_http_clients
+    from apps.news_aggregator.document_store import close_document_store
+    from apps.news_aggregator.extractors.parsing import get_parse_executor
+    from apps.news_aggregator.extractors.browser_pool import shutdown_browser_pool
+    get_async_runtime().shutdown()
+    close_document_store()
+    close_http_clients()
+    get_parse_executor().shutdown()
+    shutdown_browser_pool()
+
 # Celery Beat Schedule
 from celery.schedules import crontab
 
@@ -29,4 +59,13 @@ app.conf.beat_schedule = {
         'task': 'apps.news_aggregator.tasks.cleanup_old_jobs',
         'schedule': crontab(hour=2, minute=0),  # Daily at 2 AM
     },
+    'poll-analysis-batches': {
+        'task': 'apps.news_aggregator.tasks.poll_analysis_batches_task',
+        'schedule': crontab(minute='*/5'),
+    },
+    # Each source has its own poll_interval; this only bounds how late a poll can be
+    'poll-news-feeds': {
+        'task': 'apps.news_aggregator.tasks.poll_feeds_task',
+        'schedule': crontab(minute='*'),
+    },
 }
\ No newline at end of file
@@ -42,9 +42,5 @@ DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='noreply@newscopilot.com'
 LOGGING['handlers']['file']['filename'] = '/var/log/newscopilot/django.log'
 
 # Cache
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-        'LOCATION': env('REDIS_URL'),
-    }
-}
\ No newline at end of file
+CACHES['default']['LOCATION'] = env('REDIS_URL')
+CACHES['analysis']['LOCATION'] = env('REDIS_ANALYSIS_CACHE_URL', default=env('REDIS_URL'))
\ No newline at end of file
@@ -62,22 +62,23 @@ def test_extractor():
     print("\nTesting article extractor...")
     
     try:
-        from apps.news_aggregator.extractors.article import ArticleExtractor
-        extractor = ArticleExtractor()
+        from apps.news_aggregator.extractors.parsing import extract_with_beautifulsoup
         
         # Test with simple HTML parsing (not actual web fetch)
         html = """
         <html>
         <head><title>Test Article</title></head>
         <body>
+        <article>
         <h1>Test Title</h1>
         <p>This is a test paragraph.</p>
         <p>Another paragraph with content.</p>
+        </article>
         </body>
         </html>
         """
         
-        result = extractor._extract_with_beautifulsoup(html, "http://test.com")
+        result = extract_with_beautifulsoup(html, "http://test.com")
         if result and result.get('title'):
             print("✓ Article extractor working")
             return True